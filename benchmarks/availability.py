@@ -0,0 +1,135 @@
+"""
+Lock contention of concurrent borrowers of one book.
+
+Compares decrementing `Book.copies` on the book row (the previous design)
+with the availability counter table using one or more shards. Every borrower
+keeps its transaction open for `--hold-ms` after taking the copy, like the
+borrowing endpoint does while it creates the payment session.
+
+Needs PostgreSQL: SQLite serializes all writers regardless of the design.
+
+Usage:
+    python -m benchmarks.availability --borrowers 200 --shards 1 4 16
+"""
+
+import argparse
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+from pathlib import Path
+
+from django.db import connection, transaction
+from django.db.models import F
+
+from benchmarks.environment import benchmark_database
+from benchmarks.report import (
+    build_report,
+    default_report_path,
+    percentile,
+    write_report,
+)
+from books.models import Book, BookAvailability, split_copies
+
+
+def take_from_book_row(book_id: int) -> bool:
+    return bool(
+        Book.objects.filter(pk=book_id, copies__gt=0).update(copies=F("copies") - 1)
+    )
+
+
+def take_from_shards(book_id: int) -> bool:
+    return BookAvailability.objects.take_one(book_id)
+
+
+def create_book(title: str, copies: int, shards: int) -> Book:
+    book = Book.objects.create(
+        title=title, author="Benchmark", cover="Hard", copies=copies, daily_fee=1
+    )
+    book.availability.all().delete()
+    BookAvailability.objects.bulk_create(
+        BookAvailability(book=book, shard=shard, available=available)
+        for shard, available in enumerate(split_copies(copies, shards))
+    )
+    return book
+
+
+def run_design(take, book_id: int, borrowers: int, workers: int, hold_ms: float):
+    start_line = threading.Barrier(min(workers, borrowers))
+
+    def borrow(_):
+        try:
+            start_line.wait(timeout=5)
+        except threading.BrokenBarrierError:
+            pass
+        try:
+            started = time.perf_counter()
+            with transaction.atomic():
+                taken = take(book_id)
+                time.sleep(hold_ms / 1000)
+            return taken, time.perf_counter() - started
+        finally:
+            connection.close()
+
+    started = time.perf_counter()
+    with ThreadPoolExecutor(max_workers=workers) as executor:
+        results = list(executor.map(borrow, range(borrowers)))
+    elapsed = time.perf_counter() - started
+
+    latencies = [latency for _, latency in results]
+    return {
+        "borrowed": sum(taken for taken, _ in results),
+        "p50_ms": round(percentile(latencies, 50) * 1000, 3),
+        "p95_ms": round(percentile(latencies, 95) * 1000, 3),
+        "p99_ms": round(percentile(latencies, 99) * 1000, 3),
+        "throughput_rps": round(borrowers / elapsed, 2),
+    }
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument("--borrowers", type=int, default=200)
+    parser.add_argument("--workers", type=int, default=200)
+    parser.add_argument(
+        "--copies",
+        type=int,
+        help="Copies of the book, defaults to one per borrower.",
+    )
+    parser.add_argument("--shards", type=int, nargs="+", default=[1, 4, 16])
+    parser.add_argument("--hold-ms", type=float, default=20.0)
+    parser.add_argument("--output", type=Path)
+    args = parser.parse_args()
+    copies = args.copies or args.borrowers
+
+    if connection.vendor != "postgresql":
+        parser.error("The contention benchmark needs PostgreSQL.")
+
+    with benchmark_database():
+        designs = {}
+        book = create_book("Book row", copies, 1)
+        designs["book_row"] = run_design(
+            take_from_book_row, book.id, args.borrowers, args.workers, args.hold_ms
+        )
+        for shards in args.shards:
+            book = create_book(f"{shards} shards", copies, shards)
+            designs[f"shards_{shards}"] = run_design(
+                take_from_shards, book.id, args.borrowers, args.workers, args.hold_ms
+            )
+
+    report = build_report(
+        {"designs": designs},
+        {"borrowers": args.borrowers, "copies": copies},
+        workers=args.workers,
+        hold_ms=args.hold_ms,
+    )
+    output = args.output or default_report_path("availability")
+    write_report(report, output)
+    for name, result in designs.items():
+        print(
+            f"{name:>10}: p95 {result['p95_ms']} ms, "
+            f"{result['throughput_rps']} borrows/s, {result['borrowed']} borrowed"
+        )
+    print(f"Report written to {output}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,223 @@
+"""
+Concurrent availability stream subscribers per ASGI worker, and polling load.
+
+Opens `--subscribers` Server-Sent Events connections to the ASGI application
+in this process, each watching `--books-per-client` books, and reports the
+memory per connection and how long one availability change takes to reach
+every subscriber. The same clients polling the book detail endpoint every
+`--poll-seconds` are compared with the stream by requests and queries per
+second, given `--changes-per-second` borrowings and returns.
+
+Usage:
+    python -m benchmarks.availability_stream --subscribers 1000 5000 --books 200
+"""
+
+import argparse
+import asyncio
+import random
+import resource
+import time
+from pathlib import Path
+
+from django.db import connection
+from django.test.utils import CaptureQueriesContext
+
+from benchmarks.environment import benchmark_database
+from benchmarks.report import (
+    build_report,
+    default_report_path,
+    percentile,
+    write_report,
+)
+
+
+class Subscriber:
+    """
+    One client connection, driving the ASGI application like a server does.
+    """
+
+    def __init__(self, app, book_ids: list[int]):
+        self.app = app
+        self.query = ",".join(map(str, book_ids)).encode()
+        self.events = 0
+        self.connected = asyncio.Event()
+        self.received = {}
+        self.left = asyncio.Event()
+        self.request_sent = False
+        self.status = None
+
+    async def receive(self) -> dict:
+        if not self.request_sent:
+            self.request_sent = True
+            return {"type": "http.request", "body": b"", "more_body": False}
+        await self.left.wait()
+        return {"type": "http.disconnect"}
+
+    async def send(self, message: dict) -> None:
+        if message["type"] == "http.response.start":
+            self.status = message["status"]
+            if self.status != 200:
+                self.connected.set()
+            return
+        for line in message.get("body", b"").splitlines():
+            if line.startswith(b"data: "):
+                self.events += 1
+                self.received[self.events] = time.perf_counter()
+                if self.events == 1:
+                    self.connected.set()
+
+    async def run(self) -> None:
+        scope = {
+            "type": "http",
+            "asgi": {"version": "3.0"},
+            "http_version": "1.1",
+            "method": "GET",
+            "scheme": "http",
+            "path": "/api/books/availability/stream/",
+            "raw_path": b"/api/books/availability/stream/",
+            "query_string": b"books=" + self.query,
+            "headers": [(b"host", b"testserver")],
+            "client": ("127.0.0.1", 0),
+            "server": ("testserver", 80),
+        }
+        await self.app(scope, self.receive, self.send)
+
+
+def max_rss_mb() -> float:
+    return resource.getrusage(resource.RUSAGE_SELF).ru_maxrss / 1024
+
+
+async def measure_subscribers(
+    app, subscribers: int, book_ids: list, books_per_client: int, changes: int
+) -> dict:
+    from books.models import AVAILABILITY_CHANNEL
+    from library_service.pubsub import get_pubsub
+
+    rng = random.Random(subscribers)
+    # Every client watches the first book, so every change reaches everyone
+    clients = [
+        Subscriber(app, [book_ids[0], *rng.sample(book_ids, books_per_client - 1)])
+        for _ in range(subscribers)
+    ]
+    rss_before = max_rss_mb()
+    started = time.perf_counter()
+    tasks = [asyncio.ensure_future(client.run()) for client in clients]
+    await asyncio.gather(*(client.connected.wait() for client in clients))
+    connect_seconds = time.perf_counter() - started
+    assert {client.status for client in clients} == {200}
+    await asyncio.sleep(0.1)
+    rss_after = max_rss_mb()
+
+    latencies = []
+    pubsub = get_pubsub(AVAILABILITY_CHANNEL)
+    for change in range(changes):
+        baseline = [client.events for client in clients]
+        published = time.perf_counter()
+        pubsub.publish({str(book_ids[0]): change})
+        while any(client.events == before for client, before in zip(clients, baseline)):
+            await asyncio.sleep(0.001)
+        latencies.append(
+            max(client.received[client.events] for client in clients) - published
+        )
+
+    for client in clients:
+        client.left.set()
+    await asyncio.gather(*tasks, return_exceptions=True)
+    return {
+        "connect_seconds": round(connect_seconds, 2),
+        "rss_mb": round(rss_after, 1),
+        "kb_per_subscriber": round((rss_after - rss_before) * 1024 / subscribers, 1),
+        "fanout_p50_ms": round(percentile(latencies, 50) * 1000, 2),
+        "fanout_max_ms": round(max(latencies) * 1000, 2),
+    }
+
+
+def measure_polling(book_ids: list, requests: int) -> dict:
+    from rest_framework.test import APIClient
+
+    client = APIClient()
+    timings = []
+    for index in range(requests):
+        started = time.perf_counter()
+        res = client.get(f"/api/books/{book_ids[index % len(book_ids)]}/")
+        timings.append(time.perf_counter() - started)
+        assert res.status_code == 200, res.status_code
+    with CaptureQueriesContext(connection) as queries:
+        client.get(f"/api/books/{book_ids[0]}/")
+    return {"request_ms": sum(timings) / len(timings) * 1000, "queries": len(queries)}
+
+
+def main() -> None:
+    from django.core.asgi import get_asgi_application
+
+    from books.models import Book
+
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument("--subscribers", type=int, nargs="+", default=[1000, 5000])
+    parser.add_argument("--books", type=int, default=200)
+    parser.add_argument("--books-per-client", type=int, default=5)
+    parser.add_argument("--changes", type=int, default=20)
+    parser.add_argument("--poll-seconds", type=float, default=10)
+    parser.add_argument("--changes-per-second", type=float, default=5)
+    parser.add_argument("--output", type=Path)
+    args = parser.parse_args()
+
+    app = get_asgi_application()
+    results = {"stream": {}, "load": {}}
+    with benchmark_database():
+        book_ids = [
+            Book.objects.create(
+                title=f"Book {index}",
+                author="Benchmark",
+                cover="Hard",
+                copies=5,
+                daily_fee=1,
+            ).id
+            for index in range(args.books)
+        ]
+        polling = measure_polling(book_ids, requests=200)
+
+        # One event loop for all runs, like a worker process
+        async def measure_all():
+            for subscribers in args.subscribers:
+                results["stream"][subscribers] = await measure_subscribers(
+                    app, subscribers, book_ids, args.books_per_client, args.changes
+                )
+
+        asyncio.run(measure_all())
+
+    for subscribers in args.subscribers:
+        polls = subscribers * args.books_per_client / args.poll_seconds
+        results["load"][subscribers] = {
+            "polling_requests_per_second": round(polls, 1),
+            "polling_queries_per_second": round(polls * polling["queries"], 1),
+            "polling_cpu_seconds_per_second": round(
+                polls * polling["request_ms"] / 1000, 2
+            ),
+            # One count query per change, events are fanned out in memory
+            "stream_queries_per_second": args.changes_per_second,
+        }
+
+    report = build_report(
+        results,
+        {"books": args.books},
+        books_per_client=args.books_per_client,
+        poll_seconds=args.poll_seconds,
+        changes_per_second=args.changes_per_second,
+    )
+    output = args.output or default_report_path("availability_stream")
+    write_report(report, output)
+    for subscribers in args.subscribers:
+        stream, load = results["stream"][subscribers], results["load"][subscribers]
+        print(
+            f"{subscribers:>6} subscribers: {stream['kb_per_subscriber']} kB each, "
+            f"fan-out p50 {stream['fanout_p50_ms']} ms; polling would be "
+            f"{load['polling_requests_per_second']} req/s "
+            f"({load['polling_queries_per_second']} queries/s), "
+            f"the stream {load['stream_queries_per_second']} queries/s"
+        )
+    print(f"Report written to {output}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,118 @@
+"""
+Mobile startup latency with sequential requests and with one /api/batch/ call.
+
+Seeds a dataset and, as a customer with borrowings, requests the screens the
+mobile app loads on startup: the profile, active borrowings, payments and
+`--books` book details. Server time is measured, the network is modelled as
+one `--rtt-ms` round trip per HTTP request.
+
+Usage:
+    python -m benchmarks.batch --borrowings 20000 --rtt-ms 150
+"""
+
+import argparse
+import time
+from pathlib import Path
+
+from benchmarks.environment import benchmark_database
+from benchmarks.report import (
+    build_report,
+    default_report_path,
+    percentile,
+    write_report,
+)
+from borrowings.helpers.seeding import seed_database
+
+
+def startup_paths(user, books: int) -> list[str]:
+    from books.models import Book
+
+    book_ids = Book.objects.order_by("id").values_list("id", flat=True)[:books]
+    return [
+        "/api/users/me/",
+        "/api/borrowings/?is_active=true",
+        "/api/payments/",
+        *(f"/api/books/{book_id}/" for book_id in book_ids),
+    ]
+
+
+def measure(send, round_trips: int, rtt: float, requests: int) -> dict:
+    timings = []
+    for _ in range(requests):
+        started = time.perf_counter()
+        send()
+        timings.append(time.perf_counter() - started)
+    server = percentile(timings, 50)
+    return {
+        "round_trips": round_trips,
+        "server_p50_ms": round(server * 1000, 2),
+        "server_p95_ms": round(percentile(timings, 95) * 1000, 2),
+        "total_p50_ms": round((server + round_trips * rtt) * 1000, 2),
+    }
+
+
+def main() -> None:
+    from rest_framework.test import APIClient
+    from rest_framework_simplejwt.tokens import RefreshToken
+
+    from borrowings.models import Borrowing
+
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument("--users", type=int, default=1_000)
+    parser.add_argument("--books", type=int, default=5_000)
+    parser.add_argument("--borrowings", type=int, default=20_000)
+    parser.add_argument("--book-details", type=int, default=5)
+    parser.add_argument("--rtt-ms", type=float, default=150)
+    parser.add_argument("--requests", type=int, default=30)
+    parser.add_argument("--output", type=Path)
+    args = parser.parse_args()
+
+    rtt = args.rtt_ms / 1000
+    with benchmark_database():
+        dataset = seed_database(
+            users=args.users, books=args.books, borrowings=args.borrowings
+        )
+        user = Borrowing.objects.filter(is_active=True).first().user
+        client = APIClient()
+        client.credentials(
+            HTTP_AUTHORIZE=f"Bearer {RefreshToken.for_user(user).access_token}"
+        )
+        paths = startup_paths(user, args.book_details)
+
+        def sequential():
+            for path in paths:
+                assert client.get(path).status_code == 200
+
+        def batch():
+            res = client.post(
+                "/api/batch/",
+                {"requests": [{"path": path} for path in paths]},
+                format="json",
+            )
+            assert {sub["status"] for sub in res.json()["responses"]} == {200}
+
+        results = {
+            "sequential": measure(sequential, len(paths), rtt, args.requests),
+            "batch": measure(batch, 1, rtt, args.requests),
+        }
+
+    report = build_report(
+        {"startup": results},
+        dataset,
+        paths=paths,
+        rtt_ms=args.rtt_ms,
+        requests=args.requests,
+    )
+    output = args.output or default_report_path("batch")
+    write_report(report, output)
+    for name, result in results.items():
+        print(
+            f"{name:>10}: {result['round_trips']} round trips, "
+            f"server p50 {result['server_p50_ms']} ms, "
+            f"total p50 {result['total_p50_ms']} ms"
+        )
+    print(f"Report written to {output}")
+
+
+if __name__ == "__main__":
+    main()
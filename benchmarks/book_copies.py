@@ -0,0 +1,107 @@
+"""
+Lock contention of concurrent borrowers claiming physical copies of one book.
+
+Compares the shelf counter alone (no copy tracking) with claiming the first
+free copy row with `SELECT ... FOR UPDATE` and with `FOR UPDATE SKIP LOCKED`.
+With a plain row lock every borrower queues on the same copy, and once it is
+taken the re-checked query can come back empty although other copies are
+free. SKIP LOCKED moves each borrower on to the next unlocked copy. Every
+borrower keeps its transaction open for `--hold-ms`, like the borrowing
+endpoint does while it creates the payment session.
+
+Needs PostgreSQL: SQLite serializes all writers regardless of the design.
+
+Usage:
+    python -m benchmarks.book_copies --borrowers 200 --shards 16
+"""
+
+import argparse
+from pathlib import Path
+
+from django.db import connection
+
+from benchmarks.availability import create_book, run_design
+from benchmarks.environment import benchmark_database
+from benchmarks.report import build_report, default_report_path, write_report
+from books.models import BookAvailability, BookCopy
+
+
+def take_from_counter(book_id: int) -> bool:
+    return BookAvailability.objects.take_one(book_id)
+
+
+def take_with_row_lock(book_id: int) -> bool:
+    if not BookAvailability.objects.take_one(book_id):
+        return False
+    copy = (
+        BookCopy.objects.select_for_update()
+        .filter(book_id=book_id, status=BookCopy.Status.AVAILABLE)
+        .order_by("id")
+        .first()
+    )
+    if copy is None:
+        return False
+    copy.status = BookCopy.Status.BORROWED
+    copy.save(update_fields=["status"])
+    return True
+
+
+def take_with_skip_locked(book_id: int) -> bool:
+    return BookCopy.objects.take_one(book_id) is not None
+
+
+DESIGNS = {
+    "counter_only": take_from_counter,
+    "for_update": take_with_row_lock,
+    "skip_locked": take_with_skip_locked,
+}
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument("--borrowers", type=int, default=200)
+    parser.add_argument("--workers", type=int, default=200)
+    parser.add_argument(
+        "--copies",
+        type=int,
+        help="Copies of the book, defaults to one per borrower.",
+    )
+    parser.add_argument("--shards", type=int, default=16)
+    parser.add_argument("--hold-ms", type=float, default=20.0)
+    parser.add_argument("--output", type=Path)
+    args = parser.parse_args()
+    copies = args.copies or args.borrowers
+
+    if connection.vendor != "postgresql":
+        parser.error("The contention benchmark needs PostgreSQL.")
+
+    with benchmark_database():
+        designs = {}
+        for name, take in DESIGNS.items():
+            book = create_book(name, copies, args.shards)
+            designs[name] = run_design(
+                take, book.id, args.borrowers, args.workers, args.hold_ms
+            )
+            designs[name]["copies_borrowed"] = book.book_copies.filter(
+                status=BookCopy.Status.BORROWED
+            ).count()
+
+    report = build_report(
+        {"designs": designs},
+        {"borrowers": args.borrowers, "copies": copies},
+        workers=args.workers,
+        shards=args.shards,
+        hold_ms=args.hold_ms,
+    )
+    output = args.output or default_report_path("book_copies")
+    write_report(report, output)
+    for name, result in designs.items():
+        print(
+            f"{name:>12}: p95 {result['p95_ms']} ms, "
+            f"{result['throughput_rps']} borrows/s, {result['borrowed']} borrowed"
+        )
+    print(f"Report written to {output}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,54 @@
+"""
+Compares two benchmark reports endpoint by endpoint.
+
+Usage:
+    python -m benchmarks.compare benchmarks/results/abc123.json benchmarks/results/def456.json
+"""
+
+import argparse
+from pathlib import Path
+
+from benchmarks.report import load_report
+
+METRICS = ("p50_ms", "p95_ms", "p99_ms", "queries_mean", "throughput_rps")
+
+
+def compare_reports(baseline: dict, candidate: dict) -> dict:
+    """
+    Returns relative change (candidate vs baseline) of each metric per endpoint.
+    """
+    changes = {}
+    for endpoint, before in baseline["endpoints"].items():
+        after = candidate["endpoints"].get(endpoint)
+        if after is None:
+            continue
+        changes[endpoint] = {
+            metric: (
+                round((after[metric] - before[metric]) / before[metric] * 100, 1)
+                if before[metric]
+                else None
+            )
+            for metric in METRICS
+        }
+    return changes
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument("baseline", type=Path)
+    parser.add_argument("candidate", type=Path)
+    args = parser.parse_args()
+
+    baseline = load_report(args.baseline)
+    candidate = load_report(args.candidate)
+    print(
+        f"{baseline['meta']['commit']} -> {candidate['meta']['commit']} "
+        f"(change in %)"
+    )
+    for endpoint, changes in compare_reports(baseline, candidate).items():
+        formatted = " ".join(f"{metric}={value}" for metric, value in changes.items())
+        print(f"{endpoint:<45} {formatted}")
+
+
+if __name__ == "__main__":
+    main()
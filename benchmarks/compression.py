@@ -0,0 +1,91 @@
+"""
+Bytes on the wire and CPU time per response for gzip levels and Brotli qualities.
+
+Renders `--rows` borrowings with BorrowingSerializer and PaymentDetailSerializer
+from unsaved model instances, like a large list page, and compresses the JSON
+with every gzip level and, when the brotli package is installed, every Brotli
+quality. Pick GZIP_LEVEL and BROTLI_QUALITY from the report.
+
+Usage:
+    python -m benchmarks.compression --rows 1000 --repeat 5
+"""
+
+import argparse
+import gzip
+from pathlib import Path
+
+import benchmarks.environment  # noqa: F401
+from benchmarks.json_rendering import best_of, build_instances
+from benchmarks.report import build_report, default_report_path, write_report
+
+GZIP_LEVELS = (1, 3, 6, 9)
+BROTLI_QUALITIES = (1, 4, 5, 6, 9, 11)
+
+
+def measure(body: bytes, compress, repeat: int) -> dict:
+    compressed = compress(body)
+    return {
+        "bytes": len(compressed),
+        "ratio": round(len(body) / len(compressed), 1),
+        "ms": round(best_of(repeat, lambda: compress(body)) * 1000, 2),
+    }
+
+
+def measure_payload(body: bytes, repeat: int) -> dict:
+    from library_service.compression import brotli
+
+    result = {"identity": {"bytes": len(body), "ratio": 1.0, "ms": 0.0}}
+    for level in GZIP_LEVELS:
+        result[f"gzip-{level}"] = measure(
+            body,
+            lambda content: gzip.compress(content, compresslevel=level, mtime=0),
+            repeat,
+        )
+    if brotli is not None:
+        for quality in BROTLI_QUALITIES:
+            result[f"br-{quality}"] = measure(
+                body,
+                lambda content: brotli.compress(content, quality=quality),
+                repeat,
+            )
+    return result
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument("--rows", type=int, default=1000)
+    parser.add_argument("--repeat", type=int, default=5)
+    parser.add_argument("--output", type=Path)
+    args = parser.parse_args()
+
+    from borrowings.serializers import BorrowingSerializer
+    from library_service.renderers import ORJSONRenderer
+    from payments.serializers import PaymentDetailSerializer
+
+    borrowings, payments = build_instances(args.rows)
+    results = {
+        name: measure_payload(
+            ORJSONRenderer().render(serializer_class(instances, many=True).data),
+            args.repeat,
+        )
+        for name, serializer_class, instances in (
+            ("BorrowingSerializer", BorrowingSerializer, borrowings),
+            ("PaymentDetailSerializer", PaymentDetailSerializer, payments),
+        )
+    }
+
+    report = build_report({"payloads": results}, {}, rows=args.rows, repeat=args.repeat)
+    output = args.output or default_report_path("compression")
+    write_report(report, output)
+    for name, result in results.items():
+        print(f"{name}:")
+        for encoding, row in result.items():
+            print(
+                f"  {encoding:>8}: {row['bytes']:>9} bytes "
+                f"({row['ratio']}x), {row['ms']} ms"
+            )
+    print(f"Report written to {output}")
+
+
+if __name__ == "__main__":
+    main()
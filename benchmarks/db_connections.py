@@ -0,0 +1,144 @@
+"""
+Per-request database connection overhead with and without connection reuse.
+
+Requests go through the WSGI handler, so connections are opened and closed
+exactly like behind a real server. Every mode is measured sequentially
+(per-request latency) and with `--concurrency` threads (throughput).
+
+Needs PostgreSQL, and psycopg-pool for the `pool` mode.
+
+Usage:
+    python -m benchmarks.db_connections --requests 2000 --concurrency 16
+"""
+
+import argparse
+import time
+from concurrent.futures import ThreadPoolExecutor
+from pathlib import Path
+
+from django.core.handlers.wsgi import WSGIHandler
+from django.db import connections
+from django.test import RequestFactory
+from django.urls import reverse
+
+from benchmarks.environment import benchmark_database
+from benchmarks.report import (
+    build_report,
+    default_report_path,
+    percentile,
+    write_report,
+)
+from borrowings.helpers.seeding import seed_database
+
+MODES = ("no_reuse", "persistent", "pool")
+
+
+def configure(mode: str, pool_size: int) -> None:
+    """
+    Switches the default connection to `mode`. Open connections are closed,
+    so the next request connects with the new settings.
+    """
+    connections.close_all()
+    connection = connections["default"]
+    settings_dict = connection.settings_dict
+    if settings_dict["OPTIONS"].get("pool"):
+        connection.close_pool()
+    settings_dict["OPTIONS"].pop("pool", None)
+    settings_dict["CONN_MAX_AGE"] = 60 if mode == "persistent" else 0
+    settings_dict["CONN_HEALTH_CHECKS"] = mode == "persistent"
+    if mode == "pool":
+        from psycopg_pool import ConnectionPool
+
+        settings_dict["OPTIONS"]["pool"] = {
+            "min_size": pool_size,
+            "max_size": pool_size,
+            "check": ConnectionPool.check_connection,
+        }
+
+
+def request_once(handler, environ: dict) -> float:
+    started = time.perf_counter()
+    response = handler(dict(environ), lambda status, headers: None)
+    for _ in response:
+        pass
+    # Fires request_finished, which closes non-persistent connections
+    response.close()
+    return time.perf_counter() - started
+
+
+def serve(handler, environ: dict, requests: int) -> None:
+    """
+    One server thread. Its connection is closed when the thread is done.
+    """
+    try:
+        for _ in range(requests):
+            request_once(handler, environ)
+    finally:
+        connections.close_all()
+
+
+def measure(mode: str, requests: int, concurrency: int, path: str) -> dict:
+    configure(mode, pool_size=concurrency)
+    handler = WSGIHandler()
+    environ = RequestFactory()._base_environ(PATH_INFO=path, REQUEST_METHOD="GET")
+    request_once(handler, environ)
+
+    latencies = [request_once(handler, environ) for _ in range(requests)]
+
+    per_thread = requests // concurrency
+    started = time.perf_counter()
+    with ThreadPoolExecutor(max_workers=concurrency) as executor:
+        list(
+            executor.map(
+                lambda _: serve(handler, environ, per_thread), range(concurrency)
+            )
+        )
+    elapsed = time.perf_counter() - started
+
+    return {
+        "p50_ms": round(percentile(latencies, 50) * 1000, 3),
+        "p95_ms": round(percentile(latencies, 95) * 1000, 3),
+        "mean_ms": round(sum(latencies) / len(latencies) * 1000, 3),
+        "sequential_rps": round(len(latencies) / sum(latencies), 2),
+        "concurrent_rps": round(per_thread * concurrency / elapsed, 2),
+    }
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument("--requests", type=int, default=2000)
+    parser.add_argument("--concurrency", type=int, default=16)
+    parser.add_argument("--modes", nargs="+", choices=MODES, default=list(MODES))
+    parser.add_argument("--output", type=Path)
+    args = parser.parse_args()
+
+    if connections["default"].vendor != "postgresql":
+        parser.error("The connection benchmark needs PostgreSQL.")
+
+    with benchmark_database():
+        dataset = seed_database(users=100, books=100, borrowings=0)
+        path = reverse("book:book-list")
+        results = {
+            mode: measure(mode, args.requests, args.concurrency, path)
+            for mode in args.modes
+        }
+        configure("no_reuse", pool_size=0)
+
+    report = build_report(
+        {"modes": results},
+        dataset,
+        requests=args.requests,
+        concurrency=args.concurrency,
+    )
+    output = args.output or default_report_path("db_connections")
+    write_report(report, output)
+    for mode, result in results.items():
+        print(
+            f"{mode:>10}: {result['mean_ms']} ms per request, "
+            f"{result['concurrent_rps']} requests/s with {args.concurrency} threads"
+        )
+    print(f"Report written to {output}")
+
+
+if __name__ == "__main__":
+    main()
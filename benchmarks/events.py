@@ -0,0 +1,134 @@
+"""
+Measures what the change-data-capture log costs on the borrow path and how fast it is read.
+
+The borrow path runs with events recorded and with recording patched out,
+each borrowing writes a borrowing and a payment event. The consumer then
+reads a log of bulk-written events in batches, the way `export_events` does.
+
+Usage:
+    python -m benchmarks.events --borrowings 300 --events 100000 --batch-size 1000
+"""
+
+import argparse
+from contextlib import ExitStack
+from datetime import timedelta
+from pathlib import Path
+from time import perf_counter
+from unittest import mock
+
+from django.urls import reverse
+from django.utils import timezone
+from rest_framework.test import APIClient
+
+from benchmarks.environment import benchmark_database
+from benchmarks.fakes import fake_integrations
+from benchmarks.report import Recorder, build_report, default_report_path, write_report
+from books.models import Book
+from events.log import read_events
+from events.models import Event
+from users.models import User
+
+BORROWING_URL = reverse("borrowing:borrowing-list")
+RECORDING_CALL_SITES = ("borrowings.views", "borrowings.helpers.payment")
+
+
+def run_borrows(name: str, borrowings: int, record: bool) -> dict:
+    book = Book.objects.create(
+        title=name, author="Benchmark", cover="Hard", copies=borrowings, daily_fee=1
+    )
+    recorder = Recorder()
+    with ExitStack() as stack:
+        if not record:
+            for module in RECORDING_CALL_SITES:
+                stack.enter_context(mock.patch(f"{module}.record_event"))
+        for index in range(borrowings):
+            client = APIClient()
+            client.force_authenticate(
+                User.objects.create_user(f"{name}-{index}@mail.com", "pw")
+            )
+            recorder.post(
+                client,
+                BORROWING_URL,
+                data={
+                    "book": book.id,
+                    "expected_return_date": timezone.localdate() + timedelta(days=7),
+                },
+            )
+    return recorder.summary()["POST borrowing:borrowing-list"]
+
+
+def run_consumer(events: int, batch_size: int) -> dict:
+    Event.objects.all().delete()
+    Event.objects.bulk_create(
+        (
+            Event(
+                type=Event.Type.BORROWING_RETURNED,
+                object_id=index,
+                payload={"id": index, "is_active": False},
+            )
+            for index in range(events)
+        ),
+        batch_size=5000,
+    )
+
+    cursor, read, batches = "", 0, 0
+    start = perf_counter()
+    while True:
+        page, cursor = read_events(cursor, batch_size)
+        if not page:
+            break
+        read += len(page)
+        batches += 1
+    elapsed = perf_counter() - start
+
+    return {
+        "events": read,
+        "batches": batches,
+        "seconds": round(elapsed, 3),
+        "events_per_second": round(read / elapsed),
+    }
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument("--borrowings", type=int, default=300)
+    parser.add_argument("--events", type=int, default=100_000)
+    parser.add_argument("--batch-size", type=int, default=1000)
+    parser.add_argument("--output", type=Path)
+    args = parser.parse_args()
+
+    with benchmark_database(), fake_integrations():
+        without = run_borrows("without-events", args.borrowings, record=False)
+        with_events = run_borrows("with-events", args.borrowings, record=True)
+        consumer = run_consumer(args.events, args.batch_size)
+
+    result = {
+        "borrow": {
+            "without_events": without,
+            "with_events": with_events,
+            "p50_overhead_ms": round(with_events["p50_ms"] - without["p50_ms"], 3),
+        },
+        "consumer": consumer,
+    }
+    report = build_report(
+        result,
+        {"borrowings": args.borrowings, "events": args.events},
+        batch_size=args.batch_size,
+    )
+
+    output = args.output or default_report_path("events")
+    write_report(report, output)
+    print(
+        f"Borrow p50: {without['p50_ms']}ms without events, "
+        f"{with_events['p50_ms']}ms with events "
+        f"({without['queries_mean']} vs {with_events['queries_mean']} queries)"
+    )
+    print(
+        f"Consumer: {consumer['events']} events in {consumer['batches']} batches, "
+        f"{consumer['events_per_second']} events/s"
+    )
+    print(f"Report written to {output}")
+
+
+if __name__ == "__main__":
+    main()
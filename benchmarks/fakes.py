@@ -0,0 +1,82 @@
+import uuid
+from contextlib import contextmanager
+from unittest import mock
+
+
+class FakeCheckoutSession(dict):
+    """
+    Stands in for `stripe.checkout.Session`: supports both item and attribute access.
+    """
+
+    def __getattr__(self, name):
+        try:
+            return self[name]
+        except KeyError as exc:
+            raise AttributeError(name) from exc
+
+
+class FakeStripe:
+    """
+    In-memory replacement for the Stripe checkout sessions used by the app.
+    Every created session can later be retrieved as paid.
+    """
+
+    def __init__(self):
+        self.sessions = {}
+
+    def create(self, **kwargs) -> FakeCheckoutSession:
+        session_id = f"cs_test_{uuid.uuid4().hex}"
+        session = FakeCheckoutSession(
+            id=session_id,
+            url=f"https://checkout.stripe.com/c/pay/{session_id}",
+            status="open",
+            payment_status="unpaid",
+        )
+        self.sessions[session_id] = session
+        return session
+
+    def retrieve(self, session_id, **kwargs) -> FakeCheckoutSession:
+        session = self.sessions.setdefault(
+            session_id, FakeCheckoutSession(id=session_id, url="")
+        )
+        session.update(status="complete", payment_status="paid")
+        return session
+
+
+class FakeTelegramResponse:
+    status_code = 200
+    text = "OK"
+
+
+class FakeTelegram:
+    """
+    Swallows Telegram `sendMessage` calls and keeps the payloads for inspection.
+    """
+
+    def __init__(self):
+        self.messages = []
+
+    def post(self, url, data=None, **kwargs) -> FakeTelegramResponse:
+        self.messages.append(data)
+        return FakeTelegramResponse()
+
+
+@contextmanager
+def fake_integrations():
+    """
+    Patches Stripe and Telegram so scenarios run against the real Django app
+    without leaving the process.
+    """
+    fake_stripe = FakeStripe()
+    fake_telegram = FakeTelegram()
+
+    with mock.patch(
+        "stripe.checkout.Session.create", side_effect=fake_stripe.create
+    ), mock.patch(
+        "stripe.checkout.Session.retrieve", side_effect=fake_stripe.retrieve
+    ), mock.patch(
+        "requests.post", side_effect=fake_telegram.post
+    ), mock.patch(
+        "requests.Session.post", side_effect=fake_telegram.post
+    ):
+        yield fake_stripe, fake_telegram
@@ -0,0 +1,67 @@
+"""
+Times the daily overdue fee accrual UPDATE.
+
+Usage:
+    python -m benchmarks.fee_accrual --borrowings 1000000
+"""
+
+import argparse
+import time
+from pathlib import Path
+
+from benchmarks.environment import benchmark_database
+from benchmarks.report import build_report, default_report_path, write_report
+from borrowings.helpers.fee_accrual import accrue_overdue_fees
+from borrowings.helpers.seeding import seed_database
+from borrowings.models import Borrowing
+from django.utils import timezone
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument("--borrowings", type=int, default=1_000_000)
+    parser.add_argument("--users", type=int, default=100_000)
+    parser.add_argument("--output", type=Path)
+    args = parser.parse_args()
+
+    with benchmark_database():
+        dataset = seed_database(
+            users=args.users,
+            books=1_000,
+            borrowings=args.borrowings,
+            batch_size=50_000,
+        )
+        today = timezone.localdate()
+        Borrowing.objects.update(
+            is_active=True,
+            actual_return_date=None,
+            expected_return_date=today - timezone.timedelta(days=7),
+        )
+
+        started = time.perf_counter()
+        first_run = accrue_overdue_fees(today)
+        first_s = time.perf_counter() - started
+
+        started = time.perf_counter()
+        accrue_overdue_fees(today + timezone.timedelta(days=1))
+        next_day_s = time.perf_counter() - started
+
+        result = {
+            "borrowings": first_run,
+            "first_run_s": round(first_s, 3),
+            "next_day_s": round(next_day_s, 3),
+            "rows_per_s": round(first_run / first_s, 1),
+        }
+        report = build_report({"accrual": result}, dataset)
+
+    output = args.output or default_report_path("fee_accrual")
+    write_report(report, output)
+    print(
+        f"{result['borrowings']} overdue borrowings accrued in "
+        f"{result['first_run_s']:.1f}s ({result['rows_per_s']} rows/s)"
+    )
+    print(f"Report written to {output}")
+
+
+if __name__ == "__main__":
+    main()
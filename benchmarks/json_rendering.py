@@ -0,0 +1,137 @@
+"""
+JSON rendering and parsing time for list payloads, DRF's classes vs orjson.
+
+Builds `--rows` BorrowingSerializer and PaymentDetailSerializer payloads from
+unsaved model instances, then renders the serialized data with JSONRenderer
+and ORJSONRenderer and parses it back with JSONParser and ORJSONParser. The
+serializers' own time is reported too, it is not changed by the renderer.
+
+Usage:
+    python -m benchmarks.json_rendering --rows 10000 --repeat 5
+"""
+
+import argparse
+import io
+import time
+from datetime import date, timedelta
+from decimal import Decimal
+from pathlib import Path
+
+import benchmarks.environment  # noqa: F401
+from benchmarks.report import build_report, default_report_path, write_report
+
+
+def build_instances(rows: int) -> tuple[list, list]:
+    from books.models import Book
+    from borrowings.models import Borrowing
+    from payments.models import Payment
+    from users.models import User
+
+    borrowings, payments = [], []
+    for index in range(rows):
+        book = Book(
+            id=index % 500 + 1,
+            title=f"Book {index % 500}",
+            author="Author",
+            cover=Book.CoverChoices.HARD,
+            copies=3,
+            daily_fee=Decimal("0.99"),
+        )
+        borrowing = Borrowing(
+            id=index + 1,
+            user=User(id=index % 1000 + 1, email=f"user{index}@mail.com"),
+            book=book,
+            borrow_date=date(2024, 11, 1),
+            expected_return_date=date(2024, 11, 1) + timedelta(days=index % 30),
+            actual_return_date=None if index % 3 else date(2024, 11, 20),
+            is_active=bool(index % 3),
+            accrued_overdue_fee=Decimal(index % 7) * Decimal("0.99"),
+        )
+        borrowings.append(borrowing)
+        payments.append(
+            Payment(
+                id=index + 1,
+                borrowing=borrowing,
+                session_url=f"https://checkout.stripe.com/c/pay/cs_test_{index}",
+                session_id=f"cs_test_{index}",
+                amount_to_pay=Decimal("9.90"),
+            )
+        )
+    return borrowings, payments
+
+
+def best_of(repeat: int, func) -> float:
+    timings = []
+    for _ in range(repeat):
+        started = time.perf_counter()
+        func()
+        timings.append(time.perf_counter() - started)
+    return min(timings)
+
+
+def measure(serializer_class, instances: list, repeat: int) -> dict:
+    from rest_framework.parsers import JSONParser
+    from rest_framework.renderers import JSONRenderer
+
+    from library_service.parsers import ORJSONParser
+    from library_service.renderers import ORJSONRenderer
+
+    data = serializer_class(instances, many=True).data
+    body = JSONRenderer().render(data)
+    assert ORJSONRenderer().render(data) == body
+
+    timings = {
+        "serialize": lambda: serializer_class(instances, many=True).data,
+        "render_json": lambda: JSONRenderer().render(data),
+        "render_orjson": lambda: ORJSONRenderer().render(data),
+        "parse_json": lambda: JSONParser().parse(io.BytesIO(body)),
+        "parse_orjson": lambda: ORJSONParser().parse(io.BytesIO(body)),
+    }
+    result = {
+        f"{name}_ms": round(best_of(repeat, func) * 1000, 2)
+        for name, func in timings.items()
+    }
+    result["bytes"] = len(body)
+    result["render_speedup"] = round(
+        result["render_json_ms"] / result["render_orjson_ms"], 1
+    )
+    result["parse_speedup"] = round(
+        result["parse_json_ms"] / result["parse_orjson_ms"], 1
+    )
+    return result
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument("--rows", type=int, default=10_000)
+    parser.add_argument("--repeat", type=int, default=5)
+    parser.add_argument("--output", type=Path)
+    args = parser.parse_args()
+
+    from borrowings.serializers import BorrowingSerializer
+    from payments.serializers import PaymentDetailSerializer
+
+    borrowings, payments = build_instances(args.rows)
+    results = {
+        "BorrowingSerializer": measure(BorrowingSerializer, borrowings, args.repeat),
+        "PaymentDetailSerializer": measure(
+            PaymentDetailSerializer, payments, args.repeat
+        ),
+    }
+
+    report = build_report({"payloads": results}, {}, rows=args.rows, repeat=args.repeat)
+    output = args.output or default_report_path("json_rendering")
+    write_report(report, output)
+    for name, result in results.items():
+        print(
+            f"{name}: serialize {result['serialize_ms']} ms, "
+            f"render {result['render_json_ms']} -> {result['render_orjson_ms']} ms "
+            f"({result['render_speedup']}x), "
+            f"parse {result['parse_json_ms']} -> {result['parse_orjson_ms']} ms "
+            f"({result['parse_speedup']}x)"
+        )
+    print(f"Report written to {output}")
+
+
+if __name__ == "__main__":
+    main()
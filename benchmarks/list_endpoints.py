@@ -0,0 +1,106 @@
+"""
+List endpoint throughput with the serializers and with the values() read path.
+
+Seeds a dataset, then requests the book, borrowing and payment lists as a
+staff user at every `--page-sizes` limit, first through the list
+serializers and then straight from values() queries, and checks that both
+return the same bytes.
+
+Usage:
+    python -m benchmarks.list_endpoints --borrowings 20000 --page-sizes 10 100 1000
+"""
+
+import argparse
+import time
+from pathlib import Path
+from unittest import mock
+
+from benchmarks.environment import benchmark_database
+from benchmarks.report import (
+    build_report,
+    default_report_path,
+    percentile,
+    write_report,
+)
+from books.views import BookViewSet
+from borrowings.helpers.seeding import seed_database
+from borrowings.views import BorrowingViewSet
+from payments.views import PaymentViewSet
+
+ENDPOINTS = {
+    "books": ("/api/books/", BookViewSet),
+    "borrowings": ("/api/borrowings/", BorrowingViewSet),
+    "payments": ("/api/payments/", PaymentViewSet),
+}
+
+
+def measure(client, url: str, limit: int, requests: int) -> tuple[dict, bytes]:
+    latencies = []
+    for index in range(requests):
+        started = time.perf_counter()
+        res = client.get(url, {"limit": limit, "offset": index % 5 * limit})
+        latencies.append(time.perf_counter() - started)
+        assert res.status_code == 200, res.status_code
+
+    return {
+        "p50_ms": round(percentile(latencies, 50) * 1000, 2),
+        "p95_ms": round(percentile(latencies, 95) * 1000, 2),
+        "rps": round(requests / sum(latencies), 1),
+    }, client.get(url, {"limit": limit}).content
+
+
+def main() -> None:
+    from django.contrib.auth import get_user_model
+    from rest_framework.test import APIClient
+
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument("--users", type=int, default=1_000)
+    parser.add_argument("--books", type=int, default=5_000)
+    parser.add_argument("--borrowings", type=int, default=20_000)
+    parser.add_argument("--page-sizes", type=int, nargs="+", default=[10, 100, 1000])
+    parser.add_argument("--requests", type=int, default=30)
+    parser.add_argument("--output", type=Path)
+    args = parser.parse_args()
+
+    results = {}
+    with benchmark_database():
+        dataset = seed_database(
+            users=args.users, books=args.books, borrowings=args.borrowings
+        )
+        client = APIClient()
+        client.force_authenticate(
+            get_user_model().objects.create_user(
+                email="staff@benchmark.com", password="benchmark", is_staff=True
+            )
+        )
+
+        for name, (url, viewset) in ENDPOINTS.items():
+            for limit in args.page_sizes:
+                with mock.patch.object(viewset, "list_from_values", False):
+                    serialized, expected = measure(client, url, limit, args.requests)
+                values, content = measure(client, url, limit, args.requests)
+                assert content == expected, f"{name} responses differ"
+                results[f"{name}_{limit}"] = {
+                    "serializer": serialized,
+                    "values": values,
+                    "speedup": round(values["rps"] / serialized["rps"], 2),
+                }
+
+    report = build_report(
+        {"endpoints": results},
+        dataset,
+        page_sizes=args.page_sizes,
+        requests=args.requests,
+    )
+    output = args.output or default_report_path("list_endpoints")
+    write_report(report, output)
+    for name, result in results.items():
+        print(
+            f"{name:>16}: {result['serializer']['rps']} -> "
+            f"{result['values']['rps']} requests/s ({result['speedup']}x)"
+        )
+    print(f"Report written to {output}")
+
+
+if __name__ == "__main__":
+    main()
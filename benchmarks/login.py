@@ -0,0 +1,104 @@
+"""
+Login throughput for each password hasher.
+
+For every hasher it measures the time to hash and check one password, and
+how many password checks per second `--threads` threads of one process get
+through. Checks release the GIL in the hashing libraries, so threads only
+help until the cores or the memory bandwidth run out.
+
+Usage:
+    python -m benchmarks.login --checks 40 --threads 4
+"""
+
+import argparse
+import time
+from concurrent.futures import ThreadPoolExecutor
+from pathlib import Path
+
+import benchmarks.environment  # noqa: F401
+from benchmarks.report import (
+    build_report,
+    default_report_path,
+    percentile,
+    write_report,
+)
+
+PASSWORD = "correct horse battery staple"
+
+
+def measure(hasher, checks: int, threads: int) -> dict:
+    started = time.perf_counter()
+    encoded = hasher.encode(PASSWORD, hasher.salt())
+    hash_seconds = time.perf_counter() - started
+
+    def check(_) -> float:
+        started = time.perf_counter()
+        assert hasher.verify(PASSWORD, encoded)
+        return time.perf_counter() - started
+
+    latencies = [check(index) for index in range(checks)]
+
+    started = time.perf_counter()
+    with ThreadPoolExecutor(max_workers=threads) as executor:
+        list(executor.map(check, range(checks)))
+    threaded_seconds = time.perf_counter() - started
+
+    return {
+        "hash_ms": round(hash_seconds * 1000, 1),
+        "check_p50_ms": round(percentile(latencies, 50) * 1000, 1),
+        "check_p95_ms": round(percentile(latencies, 95) * 1000, 1),
+        "checks_per_second": round(checks / sum(latencies), 1),
+        "threaded_checks_per_second": round(checks / threaded_seconds, 1),
+    }
+
+
+def main() -> None:
+    from django.conf import settings
+    from django.utils.module_loading import import_string
+
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument("--checks", type=int, default=40)
+    parser.add_argument("--threads", type=int, default=settings.LOGIN_CONCURRENCY)
+    parser.add_argument(
+        "--hasher",
+        action="append",
+        choices=settings.PASSWORD_HASHER_CHOICES,
+        help="May be repeated, all hashers by default",
+    )
+    parser.add_argument("--output", type=Path)
+    args = parser.parse_args()
+
+    results = {
+        name: measure(
+            import_string(settings.PASSWORD_HASHER_CHOICES[name])(),
+            args.checks,
+            args.threads,
+        )
+        for name in args.hasher or settings.PASSWORD_HASHER_CHOICES
+    }
+
+    report = build_report(
+        {"hashers": results},
+        {},
+        checks=args.checks,
+        threads=args.threads,
+        argon2={
+            "time_cost": settings.ARGON2_TIME_COST,
+            "memory_cost": settings.ARGON2_MEMORY_COST,
+            "parallelism": settings.ARGON2_PARALLELISM,
+        },
+        scrypt_work_factor=settings.SCRYPT_WORK_FACTOR,
+    )
+    output = args.output or default_report_path("login")
+    write_report(report, output)
+    for name, result in results.items():
+        print(
+            f"{name:>6}: check p50 {result['check_p50_ms']} ms, "
+            f"{result['checks_per_second']} checks/s on one thread, "
+            f"{result['threaded_checks_per_second']} on {args.threads}"
+        )
+    print(f"Report written to {output}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,81 @@
+"""
+Measures reminder digest generation throughput (users per second).
+
+Usage:
+    python -m benchmarks.notifications --users 1000000
+"""
+
+import argparse
+import time
+from pathlib import Path
+
+from benchmarks.environment import benchmark_database
+from benchmarks.report import build_report, default_report_path, write_report
+from borrowings.helpers.overdue_alert import (
+    enqueue_reminders_for_range,
+    plan_reminder_chunks,
+)
+from borrowings.helpers.seeding import seed_database
+from borrowings.models import Borrowing
+from django.utils import timezone
+from notifications.models import Notification
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument("--users", type=int, default=1_000_000)
+    parser.add_argument(
+        "--borrowings-per-user",
+        type=float,
+        default=2.0,
+        help="Average number of due borrowings per user.",
+    )
+    parser.add_argument("--chunk-size", type=int, default=500)
+    parser.add_argument("--output", type=Path)
+    args = parser.parse_args()
+
+    with benchmark_database():
+        dataset = seed_database(
+            users=args.users,
+            books=1_000,
+            borrowings=int(args.users * args.borrowings_per_user),
+            batch_size=50_000,
+        )
+        Borrowing.objects.update(
+            is_active=True,
+            actual_return_date=None,
+            expected_return_date=timezone.localdate(),
+        )
+
+        today = timezone.localdate()
+        started = time.perf_counter()
+        chunks = plan_reminder_chunks(today, args.chunk_size)
+        planned = time.perf_counter()
+        users = sum(
+            enqueue_reminders_for_range(first, last, today) for first, last in chunks
+        )
+        finished = time.perf_counter()
+
+        result = {
+            "chunks": len(chunks),
+            "users": users,
+            "notifications": Notification.objects.count(),
+            "plan_s": round(planned - started, 3),
+            "generate_s": round(finished - planned, 3),
+            "users_per_s": round(users / (finished - started), 1),
+        }
+        report = build_report(
+            {"generation": result}, dataset, chunk_size=args.chunk_size
+        )
+
+    output = args.output or default_report_path("notifications")
+    write_report(report, output)
+    print(
+        f"{result['users']} digests in {result['plan_s'] + result['generate_s']:.1f}s "
+        f"({result['users_per_s']} users/s, {result['chunks']} chunks)"
+    )
+    print(f"Report written to {output}")
+
+
+if __name__ == "__main__":
+    main()
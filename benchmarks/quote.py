@@ -0,0 +1,124 @@
+"""
+Measures the borrowing quote endpoint on large requests and the staff overdue projection.
+
+Every request quotes `--items` (book, expected return date) pairs. It is
+compared with pricing the same items one by one, a book lookup and
+`calculate_borrowing_price` each, which is what a per-item endpoint costs.
+
+Usage:
+    python -m benchmarks.quote --items 10000 --requests 10 --books 1000
+"""
+
+import argparse
+import random
+from datetime import timedelta
+from pathlib import Path
+from time import perf_counter
+
+from django.urls import reverse
+from django.utils import timezone
+from rest_framework.test import APIClient
+
+from benchmarks.environment import benchmark_database
+from benchmarks.report import Recorder, build_report, default_report_path, write_report
+from books.models import Book
+from borrowings.helpers.borrowing_calculations import calculate_borrowing_price
+from borrowings.helpers.seeding import seed_database
+from borrowings.models import Borrowing
+from users.models import User
+
+QUOTE_URL = reverse("borrowing:borrowing-quote")
+PROJECTION_URL = reverse("borrowing:borrowing-overdue-projection")
+
+
+def quote_items(count: int, book_ids: list, seed: int = 0) -> list[dict]:
+    rng = random.Random(seed)
+    today = timezone.localdate()
+    return [
+        {
+            "book": rng.choice(book_ids),
+            "expected_return_date": str(today + timedelta(days=rng.randint(1, 30))),
+        }
+        for _ in range(count)
+    ]
+
+
+def price_one_by_one(items: list[dict]) -> float:
+    today = timezone.localdate()
+    start = perf_counter()
+    for item in items:
+        calculate_borrowing_price(
+            Borrowing(
+                book=Book.objects.get(pk=item["book"]),
+                borrow_date=today,
+                expected_return_date=timezone.datetime.fromisoformat(
+                    item["expected_return_date"]
+                ).date(),
+            )
+        )
+    return perf_counter() - start
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument("--items", type=int, default=10_000)
+    parser.add_argument("--requests", type=int, default=10)
+    parser.add_argument("--books", type=int, default=1_000)
+    parser.add_argument("--borrowings", type=int, default=100_000)
+    parser.add_argument("--output", type=Path)
+    args = parser.parse_args()
+
+    with benchmark_database():
+        dataset = seed_database(
+            users=1_000, books=args.books, borrowings=args.borrowings
+        )
+        Borrowing.objects.filter(is_active=True).update(
+            expected_return_date=timezone.localdate() - timedelta(days=3)
+        )
+        book_ids = list(Book.objects.values_list("id", flat=True))
+        staff = User.objects.create_superuser("quote-staff@mail.com", "pw")
+        client = APIClient()
+        client.force_authenticate(staff)
+
+        recorder = Recorder()
+        for index in range(args.requests):
+            items = quote_items(args.items, book_ids, seed=index)
+            recorder.post(client, QUOTE_URL, data={"items": items}, format="json")
+        for _ in range(args.requests):
+            recorder.get(client, PROJECTION_URL)
+
+        one_by_one = price_one_by_one(quote_items(args.items, book_ids))
+        projected = client.get(PROJECTION_URL).data["overdue_borrowings"]
+
+    endpoints = recorder.summary()
+    quote = endpoints["POST borrowing:borrowing-quote"]
+    result = {
+        "endpoints": endpoints,
+        "one_by_one_ms": round(one_by_one * 1000, 3),
+        "projected_borrowings": projected,
+        "items_per_second": round(args.items / (quote["p50_ms"] / 1000)),
+    }
+    report = build_report(
+        result,
+        dataset,
+        items=args.items,
+        requests=args.requests,
+    )
+
+    output = args.output or default_report_path("quote")
+    write_report(report, output)
+    projection = endpoints["GET borrowing:borrowing-overdue-projection"]
+    print(
+        f"Quote of {args.items} items: p50 {quote['p50_ms']}ms, "
+        f"{quote['queries_max']} queries ({result['items_per_second']} items/s); "
+        f"one by one {result['one_by_one_ms']}ms"
+    )
+    print(
+        f"Overdue projection of {projected} borrowings: "
+        f"p50 {projection['p50_ms']}ms, {projection['queries_max']} queries"
+    )
+    print(f"Report written to {output}")
+
+
+if __name__ == "__main__":
+    main()
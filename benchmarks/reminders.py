@@ -0,0 +1,116 @@
+"""
+Measures end-to-end time of the reminder fan-out with different worker counts.
+
+Chunk tasks (queue digests, then deliver) are executed by a thread pool standing
+in for Celery workers; every Telegram call sleeps for --latency-ms to model
+the HTTP round trip. Multi-worker runs need PostgreSQL: SQLite serialises writers.
+
+Usage:
+    python -m benchmarks.reminders --borrowings 200000 --workers 1 8
+"""
+
+import argparse
+import time
+from concurrent.futures import ThreadPoolExecutor
+from pathlib import Path
+from unittest import mock
+
+from benchmarks.environment import benchmark_database
+from benchmarks.report import build_report, default_report_path, write_report
+from borrowings.helpers.overdue_alert import (
+    enqueue_reminders_for_range,
+    plan_reminder_chunks,
+)
+from borrowings.helpers.seeding import seed_database
+from borrowings.models import Borrowing
+from django.contrib.auth import get_user_model
+from django.db import connection
+from django.utils import timezone
+from notifications.helpers.delivery import deliver_pending_notifications
+from notifications.models import Notification
+
+
+def run_chunk(first_user_id: int, last_user_id: int, today) -> int:
+    """
+    Same work as `send_reminders_chunk_task` followed by its delivery task.
+    """
+    try:
+        enqueue_reminders_for_range(first_user_id, last_user_id, today)
+        return deliver_pending_notifications()
+    finally:
+        connection.close()
+
+
+def fan_out(workers: int, chunk_size: int, latency: float) -> dict:
+    today = timezone.localdate()
+    Borrowing.objects.update(reminded_on=None)
+    Notification.objects.all().delete()
+
+    def fake_send(message, **kwargs):
+        time.sleep(latency)
+
+    with mock.patch(
+        "notifications.helpers.delivery.send_message", side_effect=fake_send
+    ):
+        started = time.perf_counter()
+        chunks = plan_reminder_chunks(today, chunk_size)
+        planned = time.perf_counter()
+        with ThreadPoolExecutor(max_workers=workers) as executor:
+            sent = sum(executor.map(lambda chunk: run_chunk(*chunk, today), chunks))
+        finished = time.perf_counter()
+
+    return {
+        "workers": workers,
+        "chunks": len(chunks),
+        "notifications": sent,
+        "plan_s": round(planned - started, 3),
+        "total_s": round(finished - started, 3),
+        "notifications_per_s": round(sent / (finished - started), 1),
+    }
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument("--borrowings", type=int, default=200_000)
+    parser.add_argument("--workers", type=int, nargs="+", default=[1, 8])
+    parser.add_argument("--chunk-size", type=int, default=500)
+    parser.add_argument("--latency-ms", type=float, default=5.0)
+    parser.add_argument("--output", type=Path)
+    args = parser.parse_args()
+
+    with benchmark_database():
+        dataset = seed_database(
+            users=args.borrowings, books=1_000, borrowings=args.borrowings
+        )
+        # Make every borrowing due, and notify everybody over Telegram
+        Borrowing.objects.update(
+            is_active=True,
+            actual_return_date=None,
+            expected_return_date=timezone.localdate(),
+        )
+        get_user_model().objects.update(
+            notification_channel="telegram", telegram_chat_id="0"
+        )
+        runs = [
+            fan_out(workers, args.chunk_size, args.latency_ms / 1000)
+            for workers in args.workers
+        ]
+        report = build_report(
+            {"reminders": runs},
+            dataset,
+            chunk_size=args.chunk_size,
+            latency_ms=args.latency_ms,
+        )
+
+    output = args.output or default_report_path("reminders")
+    write_report(report, output)
+    for run in runs:
+        print(
+            f"workers={run['workers']:<3} chunks={run['chunks']:<5} "
+            f"total={run['total_s']}s rate={run['notifications_per_s']}/s"
+        )
+    print(f"Report written to {output}")
+
+
+if __name__ == "__main__":
+    main()
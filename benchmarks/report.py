@@ -0,0 +1,111 @@
+import json
+import math
+import platform
+import subprocess
+from collections import defaultdict
+from datetime import datetime, timezone
+from pathlib import Path
+from time import perf_counter
+
+import django
+from django.db import connection
+from django.test.utils import CaptureQueriesContext
+
+RESULTS_DIR = Path(__file__).resolve().parent / "results"
+
+
+def percentile(values: list, pct: float) -> float:
+    """
+    Nearest-rank percentile, stable for the small sample sizes of quick runs.
+    """
+    ordered = sorted(values)
+    rank = max(math.ceil(pct / 100 * len(ordered)), 1)
+    return ordered[rank - 1]
+
+
+def git_commit() -> str | None:
+    try:
+        return subprocess.run(
+            ["git", "rev-parse", "--short", "HEAD"],
+            capture_output=True,
+            text=True,
+            check=True,
+        ).stdout.strip()
+    except (OSError, subprocess.CalledProcessError):
+        return None
+
+
+class Recorder:
+    """
+    Sends requests through a test client and records latency and SQL query count
+    per endpoint (HTTP method + URL name).
+    """
+
+    def __init__(self):
+        self.samples = defaultdict(list)
+
+    def request(self, client, method: str, path: str, **kwargs):
+        with CaptureQueriesContext(connection) as queries:
+            start = perf_counter()
+            response = getattr(client, method.lower())(path, **kwargs)
+            elapsed = perf_counter() - start
+
+        endpoint = f"{method.upper()} {response.resolver_match.view_name}"
+        self.samples[endpoint].append((elapsed, len(queries)))
+        return response
+
+    def get(self, client, path: str, **kwargs):
+        return self.request(client, "GET", path, **kwargs)
+
+    def post(self, client, path: str, **kwargs):
+        return self.request(client, "POST", path, **kwargs)
+
+    def summary(self) -> dict:
+        endpoints = {}
+        for endpoint, samples in sorted(self.samples.items()):
+            latencies = [elapsed for elapsed, _ in samples]
+            queries = [count for _, count in samples]
+            endpoints[endpoint] = {
+                "requests": len(samples),
+                "p50_ms": round(percentile(latencies, 50) * 1000, 3),
+                "p95_ms": round(percentile(latencies, 95) * 1000, 3),
+                "p99_ms": round(percentile(latencies, 99) * 1000, 3),
+                "mean_ms": round(sum(latencies) / len(latencies) * 1000, 3),
+                "queries_mean": round(sum(queries) / len(queries), 2),
+                "queries_max": max(queries),
+                "throughput_rps": round(len(latencies) / sum(latencies), 2),
+            }
+        return endpoints
+
+
+def build_report(results: dict, dataset: dict, **options) -> dict:
+    return {
+        "meta": {
+            "commit": git_commit(),
+            "created_at": datetime.now(timezone.utc).isoformat(),
+            "python": platform.python_version(),
+            "django": django.get_version(),
+            "database": connection.vendor,
+            **options,
+        },
+        "dataset": dataset,
+        **results,
+    }
+
+
+def default_report_path(name: str = None) -> Path:
+    """
+    `results/<commit>.json` for the API benchmark, `results/<name>-<commit>.json`
+    for the focused ones.
+    """
+    commit = git_commit() or "local"
+    return RESULTS_DIR / (f"{name}-{commit}.json" if name else f"{commit}.json")
+
+
+def write_report(report: dict, path: Path) -> None:
+    path.parent.mkdir(parents=True, exist_ok=True)
+    path.write_text(json.dumps(report, indent=2, sort_keys=True))
+
+
+def load_report(path: Path) -> dict:
+    return json.loads(Path(path).read_text())
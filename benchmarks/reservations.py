@@ -0,0 +1,173 @@
+"""
+Compares read traffic on a popular out-of-stock title with and without the hold queue.
+
+Without the queue every waiting user polls the book detail endpoint each tick
+and races to borrow as soon as a copy shows up. With the queue every user
+reserves once and reads only after being notified that a copy is held.
+
+Usage:
+    python -m benchmarks.reservations --waiters 200 --copies 20
+"""
+
+import argparse
+from datetime import timedelta
+from pathlib import Path
+from unittest import mock
+
+from django.urls import reverse
+from django.utils import timezone
+from rest_framework.test import APIClient
+
+from benchmarks.environment import benchmark_database
+from benchmarks.fakes import fake_integrations
+from benchmarks.report import Recorder, build_report, default_report_path, write_report
+from books.models import Book
+from borrowings.models import Borrowing
+from notifications.models import Notification
+from users.models import User
+
+BORROWING_URL = reverse("borrowing:borrowing-list")
+RESERVATION_URL = reverse("borrowing:reservation-list")
+
+
+def client_for(user) -> APIClient:
+    client = APIClient()
+    client.force_authenticate(user)
+    return client
+
+
+def setup_title(name: str, waiters: int, copies: int) -> tuple:
+    """
+    A book with every copy borrowed, its borrowings and the waiting users.
+    """
+    book = Book.objects.create(
+        title=name, author="Benchmark", cover="Hard", copies=copies, daily_fee=1
+    )
+    book.availability.update(available=0)
+    borrowings = [
+        Borrowing.objects.create(
+            user=User.objects.create_user(f"{name}-borrower-{index}@mail.com", "pw"),
+            book=book,
+            expected_return_date=timezone.localdate() + timedelta(days=7),
+        )
+        for index in range(copies)
+    ]
+    users = [
+        User.objects.create_user(f"{name}-waiter-{index}@mail.com", "pw")
+        for index in range(waiters)
+    ]
+    return book, borrowings, users
+
+
+def borrow(recorder, client, book):
+    return recorder.post(
+        client,
+        BORROWING_URL,
+        data={
+            "book": book.id,
+            "expected_return_date": timezone.localdate() + timedelta(days=7),
+        },
+    )
+
+
+def run_polling(waiters: int, copies: int, return_every: int) -> dict:
+    book, borrowings, users = setup_title("polling", waiters, copies)
+    staff = client_for(User.objects.create_superuser("polling-staff@mail.com", "pw"))
+    recorder = Recorder()
+    waiting = [client_for(user) for user in users]
+    detail_url = reverse("book:book-detail", args=(book.id,))
+
+    tick = 0
+    while waiting and (borrowings or book.available_copies):
+        if tick % return_every == 0 and borrowings:
+            borrowing = borrowings.pop()
+            staff.post(reverse("borrowing:borrowing-return-book", args=(borrowing.id,)))
+        for client in list(waiting):
+            if recorder.get(client, detail_url).data["available_copies"] > 0:
+                if borrow(recorder, client, book).status_code == 201:
+                    waiting.remove(client)
+        tick += 1
+
+    return {"ticks": tick, "endpoints": recorder.summary()}
+
+
+def run_queue(waiters: int, copies: int, return_every: int) -> dict:
+    book, borrowings, users = setup_title("queue", waiters, copies)
+    staff = client_for(User.objects.create_superuser("queue-staff@mail.com", "pw"))
+    recorder = Recorder()
+    clients = {user.id: client_for(user) for user in users}
+    for client in clients.values():
+        recorder.post(client, RESERVATION_URL, data={"book": book.id})
+
+    tick = 0
+    while borrowings:
+        if tick % return_every == 0:
+            borrowing = borrowings.pop()
+            staff.post(reverse("borrowing:borrowing-return-book", args=(borrowing.id,)))
+        # Only notified users come back: one read of the hold, then the borrow
+        for notification in Notification.objects.filter(
+            status=Notification.Status.PENDING, user_id__in=clients
+        ):
+            client = clients.pop(notification.user_id)
+            notification.status = Notification.Status.SENT
+            notification.save(update_fields=["status"])
+            recorder.get(client, RESERVATION_URL)
+            borrow(recorder, client, book)
+        tick += 1
+
+    return {"ticks": tick, "endpoints": recorder.summary()}
+
+
+def total(run: dict, method: str) -> int:
+    return sum(
+        stats["requests"]
+        for endpoint, stats in run["endpoints"].items()
+        if endpoint.startswith(method)
+    )
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument("--waiters", type=int, default=200)
+    parser.add_argument("--copies", type=int, default=20)
+    parser.add_argument(
+        "--return-every",
+        type=int,
+        default=3,
+        help="Ticks between two returned copies.",
+    )
+    parser.add_argument("--output", type=Path)
+    args = parser.parse_args()
+
+    with (
+        benchmark_database(),
+        fake_integrations(),
+        mock.patch("borrowings.helpers.reservations.deliver_notifications_task"),
+    ):
+        polling = run_polling(args.waiters, args.copies, args.return_every)
+        queue = run_queue(args.waiters, args.copies, args.return_every)
+
+    reads = {"polling": total(polling, "GET"), "queue": total(queue, "GET")}
+    result = {
+        "polling": polling,
+        "queue": queue,
+        "reads": reads,
+        "read_reduction_pct": round(100 * (1 - reads["queue"] / reads["polling"]), 1),
+    }
+    report = build_report(
+        result,
+        {"waiters": args.waiters, "copies": args.copies},
+        return_every=args.return_every,
+    )
+
+    output = args.output or default_report_path("reservations")
+    write_report(report, output)
+    print(
+        f"Reads: {reads['polling']} polling vs {reads['queue']} with the queue "
+        f"({result['read_reduction_pct']}% fewer)"
+    )
+    print(f"Report written to {output}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,113 @@
+"""
+Runs the end-to-end API benchmark against a throwaway test database.
+
+Usage:
+    python -m benchmarks.run --scale small --iterations 50
+    python -m benchmarks.run --borrowings 100000 --scenarios borrow staff_reports
+"""
+
+import argparse
+from pathlib import Path
+
+from django.conf import settings
+from django.test import override_settings
+
+from benchmarks.environment import benchmark_database
+from benchmarks.fakes import fake_integrations
+from benchmarks.report import (
+    Recorder,
+    build_report,
+    default_report_path,
+    write_report,
+)
+from benchmarks.scenarios import SCENARIOS, run_scenarios
+from borrowings.helpers.seeding import seed_database
+
+SCALES = {
+    "tiny": {"users": 5, "books": 10, "borrowings": 20},
+    "small": {"users": 100, "books": 200, "borrowings": 1_000},
+    "medium": {"users": 1_000, "books": 2_000, "borrowings": 20_000},
+    "large": {"users": 10_000, "books": 20_000, "borrowings": 200_000},
+}
+
+
+def run_benchmark(
+    users: int,
+    books: int,
+    borrowings: int,
+    scenarios: list,
+    iterations: int,
+    seed: int = 0,
+) -> dict:
+    """
+    Seeds the current database, runs the scenarios and returns the report.
+    """
+    dataset = seed_database(users=users, books=books, borrowings=borrowings, seed=seed)
+    recorder = Recorder()
+
+    # A handful of customers replays the traffic of many users and would trip
+    # the per-user rate limits
+    with fake_integrations(), override_settings(
+        REST_FRAMEWORK={**settings.REST_FRAMEWORK, "DEFAULT_THROTTLE_RATES": {}}
+    ):
+        run_scenarios(recorder, scenarios, iterations, seed=seed)
+
+    return build_report(
+        {"endpoints": recorder.summary()},
+        dataset,
+        scenarios=scenarios,
+        iterations=iterations,
+        seed=seed,
+    )
+
+
+def parse_args():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument("--scale", choices=SCALES, default="small")
+    parser.add_argument("--users", type=int)
+    parser.add_argument("--books", type=int)
+    parser.add_argument("--borrowings", type=int)
+    parser.add_argument("--iterations", type=int, default=20)
+    parser.add_argument("--seed", type=int, default=0)
+    parser.add_argument(
+        "--scenarios", nargs="+", choices=SCENARIOS, default=list(SCENARIOS)
+    )
+    parser.add_argument(
+        "--output",
+        type=Path,
+        help="Report path (default: benchmarks/results/<commit>.json)",
+    )
+    parser.add_argument(
+        "--keepdb", action="store_true", help="Reuse the test database."
+    )
+    return parser.parse_args()
+
+
+def main() -> None:
+    args = parse_args()
+    scale = {
+        key: getattr(args, key) or value for key, value in SCALES[args.scale].items()
+    }
+
+    with benchmark_database(keepdb=args.keepdb):
+        report = run_benchmark(
+            scenarios=args.scenarios,
+            iterations=args.iterations,
+            seed=args.seed,
+            **scale,
+        )
+
+    output = args.output or default_report_path()
+    write_report(report, output)
+
+    for endpoint, stats in report["endpoints"].items():
+        print(
+            f"{endpoint:<45} p50={stats['p50_ms']:>8}ms p95={stats['p95_ms']:>8}ms "
+            f"p99={stats['p99_ms']:>8}ms queries={stats['queries_mean']:>6} "
+            f"rps={stats['throughput_rps']}"
+        )
+    print(f"Report written to {output}")
+
+
+if __name__ == "__main__":
+    main()
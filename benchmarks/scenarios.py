@@ -0,0 +1,153 @@
+import random
+from datetime import timedelta
+
+from django.contrib.auth import get_user_model
+from django.urls import reverse
+from django.utils import timezone
+from rest_framework.test import APIClient
+from rest_framework_simplejwt.tokens import RefreshToken
+
+from books.models import Book, BookAvailability
+from borrowings.models import Borrowing
+from payments.models import Payment
+
+BOOK_LIST_URL = reverse("books:book-list")
+BORROWING_LIST_URL = reverse("borrowing:borrowing-list")
+PAYMENT_LIST_URL = reverse("payment:payment-list")
+PAYMENT_SUCCESS_URL = reverse("payment:checkout-success")
+
+
+def authenticated_client(user) -> APIClient:
+    """
+    Authenticates with a real JWT so the authentication cost is part of the measurement.
+    """
+    client = APIClient()
+    client.credentials(
+        HTTP_AUTHORIZE=f"Bearer {RefreshToken.for_user(user).access_token}"
+    )
+    return client
+
+
+class ScenarioContext:
+    """
+    Clients and reference data shared by all scenarios of a benchmark run.
+    """
+
+    def __init__(self, recorder, rng: random.Random, customers: int = 5):
+        self.recorder = recorder
+        self.rng = rng
+        self.anonymous = APIClient()
+
+        staff = get_user_model().objects.create_user(
+            email="bench_staff@example.com", password="bench", is_staff=True
+        )
+        self.staff = authenticated_client(staff)
+
+        self.customers = {}
+        for index in range(customers):
+            user = get_user_model().objects.create_user(
+                email=f"bench_customer_{index}@example.com", password="bench"
+            )
+            self.customers[user.id] = (user, authenticated_client(user))
+
+        self.book_ids = list(Book.objects.values_list("id", flat=True))
+        self.user_ids = list(get_user_model().objects.values_list("id", flat=True))
+
+    def customer(self):
+        return self.customers[self.rng.choice(list(self.customers))]
+
+    def pay(self, user) -> None:
+        """
+        Completes every pending checkout session of the user through the success view.
+        """
+        session_ids = Payment.objects.filter(
+            borrowing__user=user, payment_status=Payment.PaymentStatus.PENDING
+        ).values_list("session_id", flat=True)
+
+        for session_id in list(session_ids):
+            self.recorder.get(
+                self.anonymous, PAYMENT_SUCCESS_URL, data={"session_id": session_id}
+            )
+
+
+def browse_catalogue(ctx: ScenarioContext) -> None:
+    count = len(ctx.book_ids)
+    ctx.recorder.get(
+        ctx.anonymous,
+        BOOK_LIST_URL,
+        data={"limit": 10, "offset": ctx.rng.randrange(max(count - 10, 1))},
+    )
+    ctx.recorder.get(
+        ctx.anonymous,
+        reverse("books:book-detail", args=(ctx.rng.choice(ctx.book_ids),)),
+    )
+
+
+def borrow(ctx: ScenarioContext) -> None:
+    user, client = ctx.customer()
+    book_id = (
+        BookAvailability.objects.filter(available__gt=0)
+        .order_by("?")
+        .values_list("book_id", flat=True)[0]
+    )
+
+    ctx.recorder.post(
+        client,
+        BORROWING_LIST_URL,
+        data={
+            "book": book_id,
+            "expected_return_date": timezone.localdate() + timedelta(days=7),
+        },
+    )
+    ctx.pay(user)
+    ctx.recorder.get(client, BORROWING_LIST_URL, data={"is_active": "true"})
+
+
+def return_with_overdue(ctx: ScenarioContext) -> None:
+    borrowing = Borrowing.objects.filter(
+        user_id__in=ctx.customers, is_active=True
+    ).first()
+    if borrowing is None:
+        return
+    user, client = ctx.customers[borrowing.user_id]
+
+    # Move the due date into the past so the return produces an overdue fee
+    Borrowing.objects.filter(pk=borrowing.pk).update(
+        expected_return_date=timezone.localdate() - timedelta(days=3)
+    )
+
+    ctx.recorder.post(
+        client, reverse("borrowing:borrowing-return-book", args=(borrowing.id,))
+    )
+    ctx.pay(user)
+
+
+def staff_reports(ctx: ScenarioContext) -> None:
+    ctx.recorder.get(ctx.staff, BORROWING_LIST_URL, data={"is_active": "true"})
+    ctx.recorder.get(
+        ctx.staff, BORROWING_LIST_URL, data={"user_id": ctx.rng.choice(ctx.user_ids)}
+    )
+    ctx.recorder.get(ctx.staff, PAYMENT_LIST_URL)
+
+    payment_id = Payment.objects.order_by("?").values_list("id", flat=True).first()
+    if payment_id:
+        ctx.recorder.get(
+            ctx.staff, reverse("payment:payment-detail", args=(payment_id,))
+        )
+
+
+SCENARIOS = {
+    "browse_catalogue": browse_catalogue,
+    "borrow": borrow,
+    "return_with_overdue": return_with_overdue,
+    "staff_reports": staff_reports,
+}
+
+
+def run_scenarios(
+    recorder, names: list, iterations: int, seed: int = 0, customers: int = 5
+) -> None:
+    ctx = ScenarioContext(recorder, random.Random(seed), customers=customers)
+    for _ in range(iterations):
+        for name in names:
+            SCENARIOS[name](ctx)
@@ -0,0 +1,90 @@
+"""
+Latency of the OpenAPI schema endpoint: introspected per request vs pregenerated.
+
+`introspected` is drf-spectacular's SpectacularAPIView, which the endpoint used
+before. `cached` serves the pregenerated schema, `revalidated` is a client
+sending back the ETag it already has and getting 304.
+
+Usage:
+    python -m benchmarks.schema --requests 50
+"""
+
+import argparse
+import time
+from pathlib import Path
+
+from django.test import RequestFactory
+from django.test.utils import setup_test_environment
+from django.urls import reverse
+
+import benchmarks.environment  # noqa: F401
+from benchmarks.report import (
+    build_report,
+    default_report_path,
+    percentile,
+    write_report,
+)
+from library_service.schema import rendered_schema, schema_view
+
+
+def measure(view, request, requests: int) -> dict:
+    latencies = []
+    for _ in range(requests):
+        started = time.perf_counter()
+        response = view(request)
+        if hasattr(response, "render"):
+            response.render()
+        latencies.append(time.perf_counter() - started)
+
+    return {
+        "status": response.status_code,
+        "bytes": len(response.content),
+        "p50_ms": round(percentile(latencies, 50) * 1000, 3),
+        "p95_ms": round(percentile(latencies, 95) * 1000, 3),
+        "mean_ms": round(sum(latencies) / len(latencies) * 1000, 3),
+    }
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument("--requests", type=int, default=50)
+    parser.add_argument("--output", type=Path)
+    args = parser.parse_args()
+
+    # Needs the app registry, which benchmarks.environment sets up
+    from drf_spectacular.views import SpectacularAPIView
+
+    setup_test_environment(debug=False)
+    factory = RequestFactory()
+    url = reverse("schema")
+
+    started = time.perf_counter()
+    rendered_schema()
+    first_load = time.perf_counter() - started
+    etag = schema_view(factory.get(url))["ETag"]
+
+    results = {
+        "introspected": measure(
+            SpectacularAPIView.as_view(), factory.get(url), args.requests
+        ),
+        "cached": measure(schema_view, factory.get(url), args.requests),
+        "revalidated": measure(
+            schema_view, factory.get(url, HTTP_IF_NONE_MATCH=etag), args.requests
+        ),
+    }
+
+    report = build_report(
+        {"first_load_ms": round(first_load * 1000, 3), "endpoints": results},
+        {},
+        requests=args.requests,
+    )
+    output = args.output or default_report_path("schema")
+    write_report(report, output)
+    print(f"First load of the schema: {first_load * 1000:.1f} ms")
+    for name, result in results.items():
+        print(f"{name:>12}: {result['mean_ms']} ms, {result['bytes']} bytes")
+    print(f"Report written to {output}")
+
+
+if __name__ == "__main__":
+    main()
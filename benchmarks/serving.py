@@ -0,0 +1,169 @@
+"""
+Startup time and throughput of the development server against gunicorn.
+
+Each server is started as a subprocess on the benchmark database. The report
+records the time until the first successful response and the throughput of
+`--concurrency` clients requesting the book list over HTTP.
+
+Needs PostgreSQL, so the server processes can share the benchmark database.
+
+Usage:
+    python -m benchmarks.serving --requests 2000 --concurrency 16
+"""
+
+import argparse
+import os
+import signal
+import subprocess
+import sys
+import time
+from concurrent.futures import ThreadPoolExecutor
+from pathlib import Path
+
+import requests
+from django.conf import settings
+from django.db import connection
+from django.urls import reverse
+
+from benchmarks.environment import benchmark_database
+from benchmarks.report import (
+    build_report,
+    default_report_path,
+    percentile,
+    write_report,
+)
+from borrowings.helpers.seeding import seed_database
+
+SERVERS = ("runserver", "gunicorn")
+
+
+def server_command(server: str, port: int) -> list[str]:
+    if server == "runserver":
+        return [
+            sys.executable,
+            "manage.py",
+            "runserver",
+            f"127.0.0.1:{port}",
+            "--noreload",
+            "--skip-checks",
+        ]
+    return [
+        sys.executable,
+        "-m",
+        "gunicorn",
+        "-c",
+        "gunicorn.conf.py",
+        "--bind",
+        f"127.0.0.1:{port}",
+        "--access-logfile",
+        os.devnull,
+        "library_service.wsgi",
+    ]
+
+
+def wait_until_ready(process, url: str, timeout: float) -> float:
+    started = time.perf_counter()
+    while time.perf_counter() - started < timeout:
+        if process.poll() is not None:
+            raise RuntimeError(f"The server exited with code {process.returncode}")
+        try:
+            if requests.get(url, timeout=1).status_code == 200:
+                return time.perf_counter() - started
+        except requests.ConnectionError:
+            pass
+        time.sleep(0.01)
+    raise TimeoutError(f"{url} did not respond within {timeout} seconds")
+
+
+def load(url: str, requests_count: int, concurrency: int) -> dict:
+    per_client = requests_count // concurrency
+
+    def client(_) -> list[float]:
+        latencies = []
+        with requests.Session() as session:
+            for _ in range(per_client):
+                started = time.perf_counter()
+                session.get(url).raise_for_status()
+                latencies.append(time.perf_counter() - started)
+        return latencies
+
+    started = time.perf_counter()
+    with ThreadPoolExecutor(max_workers=concurrency) as executor:
+        latencies = [
+            latency
+            for latencies in executor.map(client, range(concurrency))
+            for latency in latencies
+        ]
+    elapsed = time.perf_counter() - started
+
+    return {
+        "p50_ms": round(percentile(latencies, 50) * 1000, 3),
+        "p95_ms": round(percentile(latencies, 95) * 1000, 3),
+        "p99_ms": round(percentile(latencies, 99) * 1000, 3),
+        "throughput_rps": round(len(latencies) / elapsed, 2),
+    }
+
+
+def measure(server: str, port: int, args) -> dict:
+    env = {
+        **os.environ,
+        "POSTGRES_DB": connection.settings_dict["NAME"],
+        "DEBUG": "False",
+    }
+    process = subprocess.Popen(
+        server_command(server, port),
+        cwd=settings.BASE_DIR,
+        env=env,
+        stdout=subprocess.DEVNULL,
+        stderr=subprocess.DEVNULL,
+    )
+    url = f"http://127.0.0.1:{port}{reverse('book:book-list')}"
+    try:
+        startup = wait_until_ready(process, url, timeout=args.startup_timeout)
+        return {
+            "startup_s": round(startup, 3),
+            **load(url, args.requests, args.concurrency),
+        }
+    finally:
+        # gunicorn drains its workers on SIGTERM, runserver just exits
+        process.send_signal(signal.SIGTERM)
+        process.wait(timeout=60)
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument("--requests", type=int, default=2000)
+    parser.add_argument("--concurrency", type=int, default=16)
+    parser.add_argument("--servers", nargs="+", choices=SERVERS, default=SERVERS)
+    parser.add_argument("--port", type=int, default=8765)
+    parser.add_argument("--startup-timeout", type=float, default=60)
+    parser.add_argument("--output", type=Path)
+    args = parser.parse_args()
+
+    if connection.vendor != "postgresql":
+        parser.error("The serving benchmark needs PostgreSQL.")
+
+    with benchmark_database():
+        dataset = seed_database(users=100, books=100, borrowings=0)
+        # The servers open their own connections to the benchmark database
+        connection.close()
+        results = {server: measure(server, args.port, args) for server in args.servers}
+
+    report = build_report(
+        {"servers": results},
+        dataset,
+        requests=args.requests,
+        concurrency=args.concurrency,
+    )
+    output = args.output or default_report_path("serving")
+    write_report(report, output)
+    for server, result in results.items():
+        print(
+            f"{server:>10}: ready in {result['startup_s']} s, "
+            f"{result['throughput_rps']} requests/s, p95 {result['p95_ms']} ms"
+        )
+    print(f"Report written to {output}")
+
+
+if __name__ == "__main__":
+    main()
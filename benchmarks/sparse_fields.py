@@ -0,0 +1,122 @@
+"""
+Payload size, queries and latency of sparse fieldsets and expansion.
+
+Seeds a dataset and requests list and detail endpoints as a staff user with
+the full representation and with the `fields`/`expand` selections a mobile
+client would use.
+
+Usage:
+    python -m benchmarks.sparse_fields --borrowings 20000 --limit 100
+"""
+
+import argparse
+import time
+from pathlib import Path
+
+from django.db import connection
+from django.test.utils import CaptureQueriesContext
+
+from benchmarks.environment import benchmark_database
+from benchmarks.report import (
+    build_report,
+    default_report_path,
+    percentile,
+    write_report,
+)
+from borrowings.helpers.seeding import seed_database
+
+# (name, url, query parameters)
+CASES = (
+    ("books_full", "/api/books/", {}),
+    ("books_titles", "/api/books/", {"fields": "id,title"}),
+    ("borrowings_full", "/api/borrowings/", {}),
+    ("borrowings_titles", "/api/borrowings/", {"fields": "id,book"}),
+    ("borrowings_expanded", "/api/borrowings/", {"expand": "book"}),
+    ("payments_full", "/api/payments/", {}),
+    ("payments_status", "/api/payments/", {"fields": "id,payment_status"}),
+    ("payments_expanded", "/api/payments/", {"expand": "borrowing"}),
+    ("borrowing_detail_full", "/api/borrowings/{borrowing}/", {}),
+    (
+        "borrowing_detail_collapsed",
+        "/api/borrowings/{borrowing}/",
+        {"fields": "id,book,expected_return_date", "expand": ""},
+    ),
+    ("payment_detail_full", "/api/payments/{payment}/", {}),
+    (
+        "payment_detail_collapsed",
+        "/api/payments/{payment}/",
+        {"fields": "id,payment_status,borrowing", "expand": ""},
+    ),
+)
+
+
+def measure(client, url: str, params: dict, requests: int) -> dict:
+    latencies = []
+    for _ in range(requests):
+        started = time.perf_counter()
+        res = client.get(url, params)
+        latencies.append(time.perf_counter() - started)
+        assert res.status_code == 200, res.status_code
+
+    with CaptureQueriesContext(connection) as queries:
+        res = client.get(url, params)
+    return {
+        "bytes": len(res.content),
+        "queries": len(queries),
+        "p50_ms": round(percentile(latencies, 50) * 1000, 2),
+        "p95_ms": round(percentile(latencies, 95) * 1000, 2),
+    }
+
+
+def main() -> None:
+    from django.contrib.auth import get_user_model
+    from rest_framework.test import APIClient
+
+    from borrowings.models import Borrowing
+    from payments.models import Payment
+
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument("--users", type=int, default=1_000)
+    parser.add_argument("--books", type=int, default=5_000)
+    parser.add_argument("--borrowings", type=int, default=20_000)
+    parser.add_argument("--limit", type=int, default=100)
+    parser.add_argument("--requests", type=int, default=30)
+    parser.add_argument("--output", type=Path)
+    args = parser.parse_args()
+
+    results = {}
+    with benchmark_database():
+        dataset = seed_database(
+            users=args.users, books=args.books, borrowings=args.borrowings
+        )
+        client = APIClient()
+        client.force_authenticate(
+            get_user_model().objects.create_user(
+                email="staff@benchmark.com", password="benchmark", is_staff=True
+            )
+        )
+        ids = {
+            "borrowing": Borrowing.objects.values_list("id", flat=True).first(),
+            "payment": Payment.objects.values_list("id", flat=True).first(),
+        }
+
+        for name, url, params in CASES:
+            if "{" not in url:
+                params = {**params, "limit": args.limit}
+            results[name] = measure(client, url.format(**ids), params, args.requests)
+
+    report = build_report(
+        {"cases": results}, dataset, limit=args.limit, requests=args.requests
+    )
+    output = args.output or default_report_path("sparse_fields")
+    write_report(report, output)
+    for name, result in results.items():
+        print(
+            f"{name:>26}: {result['bytes']:>7} bytes, {result['queries']} queries, "
+            f"p50 {result['p50_ms']} ms"
+        )
+    print(f"Report written to {output}")
+
+
+if __name__ == "__main__":
+    main()
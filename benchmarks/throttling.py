@@ -0,0 +1,94 @@
+"""
+Per-request overhead of the rate limit check for each backend.
+
+Every check runs ScopedRateLimitThrottle.allow_request for a borrowing create
+request, spread over `--users` users so most checks are allowed, like in
+production. The Redis backend is measured when `--redis-url` is given.
+
+Usage:
+    python -m benchmarks.throttling --checks 20000 --redis-url redis://localhost:6379/1
+"""
+
+import argparse
+import time
+from pathlib import Path
+from types import SimpleNamespace
+from unittest import mock
+
+import benchmarks.environment  # noqa: F401
+from benchmarks.report import (
+    build_report,
+    default_report_path,
+    percentile,
+    write_report,
+)
+from library_service.throttling import (
+    LocMemRateLimitBackend,
+    RedisRateLimitBackend,
+    ScopedRateLimitThrottle,
+)
+
+
+def measure(backend, checks: int, users: int) -> dict:
+    view = SimpleNamespace(action="create", throttle_scopes={"create": "bench"})
+    requests = [
+        SimpleNamespace(user=SimpleNamespace(pk=pk, is_authenticated=True))
+        for pk in range(users)
+    ]
+    rates = {"bench": "10/min"}
+
+    latencies, throttled = [], 0
+    with mock.patch(
+        "library_service.throttling.get_backend", return_value=backend
+    ), mock.patch(
+        "library_service.throttling.api_settings",
+        SimpleNamespace(DEFAULT_THROTTLE_RATES=rates),
+    ):
+        for index in range(checks):
+            throttle = ScopedRateLimitThrottle()
+            started = time.perf_counter()
+            allowed = throttle.allow_request(requests[index % users], view)
+            latencies.append(time.perf_counter() - started)
+            throttled += not allowed
+
+    return {
+        "p50_us": round(percentile(latencies, 50) * 1_000_000, 1),
+        "p95_us": round(percentile(latencies, 95) * 1_000_000, 1),
+        "p99_us": round(percentile(latencies, 99) * 1_000_000, 1),
+        "mean_us": round(sum(latencies) / len(latencies) * 1_000_000, 1),
+        "throttled": throttled,
+    }
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument("--checks", type=int, default=20_000)
+    parser.add_argument("--users", type=int, default=5_000)
+    parser.add_argument("--redis-url")
+    parser.add_argument("--output", type=Path)
+    args = parser.parse_args()
+
+    backends = {"locmem": LocMemRateLimitBackend()}
+    if args.redis_url:
+        backends["redis"] = RedisRateLimitBackend(args.redis_url)
+
+    results = {
+        name: measure(backend, args.checks, args.users)
+        for name, backend in backends.items()
+    }
+
+    report = build_report(
+        {"backends": results}, {}, checks=args.checks, users=args.users
+    )
+    output = args.output or default_report_path("throttling")
+    write_report(report, output)
+    for name, result in results.items():
+        print(
+            f"{name:>7}: {result['mean_us']} us per check, p99 {result['p99_us']} us, "
+            f"{result['throttled']} throttled"
+        )
+    print(f"Report written to {output}")
+
+
+if __name__ == "__main__":
+    main()
@@ -1,6 +1,46 @@
 from django.contrib import admin
 
-from books.models import Book
+from books.models import Book, BookAvailability, BookCopy
+from library_service.admin import LargeTableAdmin
 
 
-admin.site.register(Book)
+@admin.register(Book)
+class BookAdmin(LargeTableAdmin):
+    list_display = ("id", "title", "author", "cover", "copies", "available_copies")
+    list_filter = ("cover",)
+    search_fields = ("title", "author")
+
+    def get_queryset(self, request):
+        return super().get_queryset(request).with_available_copies()
+
+    @admin.display(description="Available", ordering="available_copies_sum")
+    def available_copies(self, book: Book) -> int:
+        return book.available_copies
+
+
+@admin.register(BookAvailability)
+class BookAvailabilityAdmin(admin.ModelAdmin):
+    list_display = ("book", "shard", "available")
+    list_select_related = ("book",)
+    raw_id_fields = ("book",)
+
+
+@admin.register(BookCopy)
+class BookCopyAdmin(LargeTableAdmin):
+    list_display = ("barcode", "book", "status")
+    list_select_related = ("book",)
+    list_filter = ("status",)
+    search_fields = ("=barcode",)
+    raw_id_fields = ("book",)
+    readonly_fields = ("status",)
+    actions = ("mark_lost", "mark_damaged")
+
+    @admin.action(description="Mark selected copies on the shelf as lost")
+    def mark_lost(self, request, queryset) -> None:
+        written_off = queryset.write_off(BookCopy.Status.LOST)
+        self.message_user(request, f"{written_off} copies marked as lost.")
+
+    @admin.action(description="Mark selected copies on the shelf as damaged")
+    def mark_damaged(self, request, queryset) -> None:
+        written_off = queryset.write_off(BookCopy.Status.DAMAGED)
+        self.message_user(request, f"{written_off} copies marked as damaged.")
@@ -0,0 +1,96 @@
+# Generated by Django 5.1.1 on 2026-10-19 15:37
+
+import django.db.models.deletion
+from django.conf import settings
+from django.db import migrations, models
+
+# Until now `copies` counted the copies on the shelf. They move to the counter
+# shards, spread like `books.models.split_copies`, in a single INSERT ... SELECT
+SPLIT_COPIES = """
+WITH RECURSIVE shards (shard) AS (
+    SELECT 0
+    UNION ALL
+    SELECT shard + 1 FROM shards WHERE shard < %s - 1
+)
+INSERT INTO books_bookavailability (book_id, shard, available)
+SELECT
+    books_book.id,
+    shards.shard,
+    books_book.copies / %s
+    + CASE WHEN shards.shard < books_book.copies %% %s THEN 1 ELSE 0 END
+FROM books_book
+CROSS JOIN shards
+"""
+# `copies` becomes the total stock including the borrowed copies
+ADD_BORROWED_COPIES = """
+UPDATE books_book
+SET copies = copies + (
+    SELECT COUNT(*) FROM borrowings_borrowing
+    WHERE borrowings_borrowing.book_id = books_book.id
+    AND borrowings_borrowing.is_active
+)
+"""
+MERGE_SHARDS = """
+UPDATE books_book
+SET copies = COALESCE(
+    (
+        SELECT SUM(available) FROM books_bookavailability
+        WHERE books_bookavailability.book_id = books_book.id
+    ),
+    0
+)
+"""
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ("books", "0004_book_unique_title_and_author"),
+        ("borrowings", "0001_initial"),
+    ]
+
+    operations = [
+        migrations.AlterModelOptions(
+            name="book",
+            options={"ordering": ("id",)},
+        ),
+        migrations.CreateModel(
+            name="BookAvailability",
+            fields=[
+                (
+                    "id",
+                    models.BigAutoField(
+                        auto_created=True,
+                        primary_key=True,
+                        serialize=False,
+                        verbose_name="ID",
+                    ),
+                ),
+                ("shard", models.PositiveSmallIntegerField()),
+                ("available", models.PositiveIntegerField()),
+                (
+                    "book",
+                    models.ForeignKey(
+                        on_delete=django.db.models.deletion.CASCADE,
+                        related_name="availability",
+                        to="books.book",
+                    ),
+                ),
+            ],
+            options={
+                "verbose_name_plural": "book availability",
+                "constraints": [
+                    models.UniqueConstraint(
+                        fields=("book", "shard"), name="unique_book_availability_shard"
+                    )
+                ],
+            },
+        ),
+        migrations.RunSQL(
+            [
+                (SPLIT_COPIES, [settings.BOOK_AVAILABILITY_SHARDS] * 3),
+                ADD_BORROWED_COPIES,
+            ],
+            MERGE_SHARDS,
+        ),
+    ]
@@ -0,0 +1,77 @@
+# Generated by Django 5.1.1 on 2026-10-19 17:00
+
+import django.db.models.deletion
+from django.db import migrations, models
+
+# One row per copy in a single INSERT ... SELECT, numbered 1..copies per
+# book with the barcodes of `books.models.make_barcode`
+EXPAND_COPIES = """
+WITH RECURSIVE numbers (number) AS (
+    SELECT 1
+    UNION ALL
+    SELECT number + 1 FROM numbers
+    WHERE number < (SELECT MAX(copies) FROM books_book)
+)
+INSERT INTO books_bookcopy (book_id, barcode, status)
+SELECT books_book.id, 'LP' || books_book.id || '-' || numbers.number, 'available'
+FROM books_book
+JOIN numbers ON numbers.number <= books_book.copies
+"""
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ("books", "0006_book_updated_at"),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name="BookCopy",
+            fields=[
+                (
+                    "id",
+                    models.BigAutoField(
+                        auto_created=True,
+                        primary_key=True,
+                        serialize=False,
+                        verbose_name="ID",
+                    ),
+                ),
+                ("barcode", models.CharField(max_length=32, unique=True)),
+                (
+                    "status",
+                    models.CharField(
+                        choices=[
+                            ("available", "Available"),
+                            ("borrowed", "Borrowed"),
+                            ("held", "Held"),
+                            ("lost", "Lost"),
+                            ("damaged", "Damaged"),
+                            ("withdrawn", "Withdrawn"),
+                        ],
+                        default="available",
+                        max_length=20,
+                    ),
+                ),
+                (
+                    "book",
+                    models.ForeignKey(
+                        on_delete=django.db.models.deletion.CASCADE,
+                        related_name="book_copies",
+                        to="books.book",
+                    ),
+                ),
+            ],
+            options={
+                "verbose_name_plural": "book copies",
+                "ordering": ("id",),
+                "indexes": [
+                    models.Index(
+                        fields=["book", "status"], name="bookcopy_book_status_idx"
+                    )
+                ],
+            },
+        ),
+        migrations.RunSQL(EXPAND_COPIES, migrations.RunSQL.noop),
+    ]
@@ -1,5 +1,65 @@
-from django.db import models
-from django.db.models import UniqueConstraint
+import random
+from collections import Counter
+
+from django.conf import settings
+from django.db import models, transaction
+from django.db.models import (
+    Case,
+    F,
+    IntegerField,
+    Max,
+    Sum,
+    UniqueConstraint,
+    Value,
+    When,
+)
+from django.db.models.functions import Cast, Coalesce, Now, Substr
+
+from library_service.pubsub import get_pubsub
+
+# Pub/sub channel of the shelf counts, keyed by book id
+AVAILABILITY_CHANNEL = "book-availability"
+
+
+def split_copies(copies: int, shards: int) -> list:
+    """
+    Spreads `copies` over `shards` counters as evenly as possible.
+    """
+    return [copies // shards + (shard < copies % shards) for shard in range(shards)]
+
+
+def barcode_prefix(book_id: int) -> str:
+    return f"LP{book_id}-"
+
+
+def make_barcode(book_id: int, number: int) -> str:
+    """
+    Barcode printed on the `number`-th copy of a book.
+    """
+    return f"{barcode_prefix(book_id)}{number}"
+
+
+def publish_availability(book_ids) -> None:
+    """
+    Sends the new shelf counts of `book_ids` to the availability streams
+    once the transaction commits.
+    """
+    book_ids = set(book_ids)
+    transaction.on_commit(
+        lambda: get_pubsub(AVAILABILITY_CHANNEL).publish(
+            {
+                str(book_id): available
+                for book_id, available in BookAvailability.objects.counts(book_ids)
+            }
+        )
+    )
+
+
+class BookQuerySet(models.QuerySet):
+    def with_available_copies(self):
+        return self.annotate(
+            available_copies_sum=Coalesce(Sum("availability__available"), 0)
+        )
 
 
 class Book(models.Model):
@@ -11,8 +71,15 @@ class Book(models.Model):
     title = models.CharField(max_length=255)
     author = models.CharField(max_length=255)
     cover = models.CharField(max_length=50, choices=CoverChoices.choices)
+    # Total stock of the library, one BookCopy per copy. Copies on the shelf
+    # are also counted in BookAvailability for the catalogue
     copies = models.PositiveIntegerField()
     daily_fee = models.DecimalField(max_digits=10, decimal_places=2)
+    # Validator for conditional GETs of borrowings and payments showing the
+    # book. The database default covers rows written with COPY.
+    updated_at = models.DateTimeField(auto_now=True, db_default=Now())
+
+    objects = BookQuerySet.as_manager()
 
     class Meta:
         constraints = [
@@ -23,11 +90,313 @@ class Book(models.Model):
         ]
         ordering = ("id",)
 
-    def borrow_one_copy(self) -> None:
-        self.copies -= 1
+    @property
+    def available_copies(self) -> int:
+        """
+        Copies on the shelf. Summed from the counter shards unless the queryset
+        was annotated with `with_available_copies()` or prefetched them.
+        """
+        if hasattr(self, "available_copies_sum"):
+            return self.available_copies_sum
+        if "availability" in getattr(self, "_prefetched_objects_cache", {}):
+            return sum(counter.available for counter in self.availability.all())
+        return self.availability.aggregate(total=Sum("available"))["total"] or 0
+
+    @transaction.atomic
+    def save(self, *args, **kwargs):
+        adding = self._state.adding
+        previous_copies = (
+            None
+            if adding
+            else Book.objects.filter(pk=self.pk)
+            .values_list("copies", flat=True)
+            .first()
+        )
+        super().save(*args, **kwargs)
 
-    def return_one_copy(self) -> None:
-        self.copies += 1
+        if adding:
+            BookAvailability.objects.bulk_create(
+                BookAvailability(book=self, shard=shard, available=available)
+                for shard, available in enumerate(
+                    split_copies(self.copies, settings.BOOK_AVAILABILITY_SHARDS)
+                )
+            )
+            BookCopy.objects.add(self.pk, self.copies)
+        elif previous_copies is not None and previous_copies != self.copies:
+            delta = self.copies - previous_copies
+            if delta > 0:
+                # Imported here, borrowings depends on this module
+                from borrowings.helpers.reservations import hand_over_copies
+
+                # New copies serve the reservation queue first, like returns
+                copy_ids = BookCopy.objects.add(self.pk, delta)
+                hand_over_copies([(self.pk, copy_id) for copy_id in copy_ids])
+            else:
+                BookAvailability.objects.adjust(self.pk, delta)
+                BookCopy.objects.withdraw(self.pk, -delta)
+
+    def borrow_one_copy(self) -> "BookCopy | None":
+        """
+        Takes a copy off the shelf. Returns None if none is available.
+        """
+        return BookCopy.objects.take_one(self.pk)
+
+    def return_one_copy(self, copy: "BookCopy | None" = None) -> None:
+        BookCopy.objects.put_back_one(self.pk, copy and copy.pk)
 
     def __str__(self):
         return f"Title: {self.title}, Author: {self.author}"
+
+
+class BookAvailabilityQuerySet(models.QuerySet):
+    def take_one(self, book_id: int) -> bool:
+        """
+        Decrements a random shard that still has copies. Every attempt is
+        a single conditional UPDATE, so concurrent borrowers of one book
+        spread over the shards instead of queueing on one row.
+        """
+        shards = list(
+            self.filter(book_id=book_id, available__gt=0).values_list(
+                "shard", flat=True
+            )
+        )
+        random.shuffle(shards)
+        for shard in shards:
+            if self.filter(book_id=book_id, shard=shard, available__gt=0).update(
+                available=F("available") - 1
+            ):
+                publish_availability([book_id])
+                return True
+        return False
+
+    def put_back_one(self, book_id: int) -> None:
+        shard = random.randrange(settings.BOOK_AVAILABILITY_SHARDS)
+        # Books created with fewer shards always have shard 0
+        if not self.filter(book_id=book_id, shard=shard).update(
+            available=F("available") + 1
+        ):
+            self.filter(book_id=book_id, shard=0).update(available=F("available") + 1)
+        publish_availability([book_id])
+
+    def put_back(self, counts: dict) -> None:
+        """
+        Puts back `counts[book_id]` copies of each book with a single UPDATE.
+        """
+        if not counts:
+            return
+        self.filter(book_id__in=counts, shard=0).update(
+            available=F("available")
+            + Case(
+                *(
+                    When(book_id=book_id, then=Value(count))
+                    for book_id, count in counts.items()
+                ),
+                output_field=models.PositiveIntegerField(),
+            )
+        )
+        publish_availability(counts)
+
+    def adjust(self, book_id: int, delta: int) -> None:
+        if delta > 0:
+            self.filter(book_id=book_id, shard=0).update(
+                available=F("available") + delta
+            )
+            publish_availability([book_id])
+            return
+
+        remaining = -delta
+        for counter in self.select_for_update().filter(
+            book_id=book_id, available__gt=0
+        ):
+            taken = min(counter.available, remaining)
+            counter.available -= taken
+            counter.save(update_fields=["available"])
+            remaining -= taken
+            if not remaining:
+                publish_availability([book_id])
+                return
+        raise ValueError("Not enough copies on the shelf to reduce the stock.")
+
+    def counts(self, book_ids) -> list[tuple[int, int]]:
+        """
+        (book id, copies on the shelf) of each of `book_ids` in one query.
+        """
+        return list(
+            self.filter(book_id__in=book_ids)
+            .values("book_id")
+            .annotate(total=Sum("available"))
+            .values_list("book_id", "total")
+            .order_by("book_id")
+        )
+
+
+class BookAvailability(models.Model):
+    """
+    Counter shard of the copies of a book that are on the shelf.
+
+    Borrowing and returning only touch these rows, so they don't contend
+    with catalogue reads and staff edits of the Book row. The available
+    count is the sum over all shards of a book.
+    """
+
+    book = models.ForeignKey(
+        Book, on_delete=models.CASCADE, related_name="availability"
+    )
+    shard = models.PositiveSmallIntegerField()
+    available = models.PositiveIntegerField()
+
+    objects = BookAvailabilityQuerySet.as_manager()
+
+    class Meta:
+        constraints = [
+            UniqueConstraint(
+                fields=["book", "shard"], name="unique_book_availability_shard"
+            ),
+        ]
+        verbose_name_plural = "book availability"
+
+    def __str__(self):
+        return f"{self.book} shard {self.shard}: {self.available} available"
+
+
+class BookCopyQuerySet(models.QuerySet):
+    def add(self, book_id: int, count: int) -> list[int]:
+        """
+        Adds `count` new copies of a book, numbered after the highest one.
+        Returns the ids of the new copies.
+
+        The book row is locked first, so concurrent stock increases of the
+        book number their copies one after the other.
+        """
+        prefix = barcode_prefix(book_id)
+        with transaction.atomic():
+            list(Book.objects.select_for_update().filter(pk=book_id).values("pk"))
+            last = self.filter(book_id=book_id).aggregate(
+                last=Max(
+                    Cast(
+                        Substr("barcode", len(prefix) + 1), output_field=IntegerField()
+                    )
+                )
+            )["last"]
+            first = (last or 0) + 1
+            copies = self.bulk_create(
+                BookCopy(book_id=book_id, barcode=make_barcode(book_id, number))
+                for number in range(first, first + count)
+            )
+        return [copy.pk for copy in copies]
+
+    def withdraw(self, book_id: int, count: int) -> None:
+        """
+        Takes `count` copies on the shelf out of the stock.
+        """
+        copy_ids = list(
+            self.select_for_update(skip_locked=True)
+            .filter(book_id=book_id, status=BookCopy.Status.AVAILABLE)
+            .values_list("id", flat=True)[:count]
+        )
+        if len(copy_ids) < count:
+            raise ValueError("Not enough copies on the shelf to reduce the stock.")
+        self.filter(pk__in=copy_ids).update(status=BookCopy.Status.WITHDRAWN)
+
+    def take_one(self, book_id: int) -> "BookCopy | None":
+        """
+        Takes a copy off the shelf and marks it borrowed.
+
+        The shelf count is decremented first, so borrowers of a book without
+        copies never touch its copy rows. The copy is then claimed with
+        SKIP LOCKED: concurrent borrowers each lock a different free copy
+        instead of waiting for the first one's transaction.
+        """
+        with transaction.atomic():
+            if not BookAvailability.objects.take_one(book_id):
+                return None
+            copy = (
+                self.select_for_update(skip_locked=True)
+                .filter(book_id=book_id, status=BookCopy.Status.AVAILABLE)
+                .order_by("id")
+                .first()
+            )
+            if copy is None:
+                # The shelf count is ahead of the copy rows, undo the decrement
+                transaction.set_rollback(True)
+                return None
+            copy.status = BookCopy.Status.BORROWED
+            copy.save(update_fields=["status"])
+            return copy
+
+    def put_back_one(self, book_id: int, copy_id: int | None) -> None:
+        """
+        Puts a copy back on the shelf. Borrowings from before copies were
+        tracked have no copy, only the shelf count goes up for them.
+        """
+        if copy_id is not None:
+            self.filter(pk=copy_id).update(status=BookCopy.Status.AVAILABLE)
+        BookAvailability.objects.put_back_one(book_id)
+
+    def put_back(self, copies: list[tuple[int, int | None]]) -> None:
+        """
+        `put_back_one` for many (book id, copy id) pairs with two UPDATEs.
+        """
+        if not copies:
+            return
+        self.filter(
+            pk__in=[copy_id for _, copy_id in copies if copy_id is not None]
+        ).update(status=BookCopy.Status.AVAILABLE)
+        BookAvailability.objects.put_back(Counter(book_id for book_id, _ in copies))
+
+    def write_off(self, status: str) -> int:
+        """
+        Marks the copies on the shelf among these as lost or damaged and
+        takes them out of the stock and the shelf count. Returns the number
+        of written off copies.
+        """
+        with transaction.atomic():
+            copies = list(
+                self.select_for_update(of=("self",))
+                .filter(status=BookCopy.Status.AVAILABLE)
+                .values_list("id", "book_id")
+            )
+            BookCopy.objects.filter(pk__in=[pk for pk, _ in copies]).update(
+                status=status
+            )
+            for book_id, count in Counter(book_id for _, book_id in copies).items():
+                BookAvailability.objects.adjust(book_id, -count)
+                Book.objects.filter(pk=book_id).update(
+                    copies=F("copies") - count, updated_at=Now()
+                )
+        return len(copies)
+
+
+class BookCopy(models.Model):
+    """
+    A physical copy of a book, identified by the barcode on it.
+
+    Copies on the shelf are available. A borrowed copy is linked to its
+    borrowing, a copy held for a reservation to the reservation.
+    """
+
+    class Status(models.TextChoices):
+        AVAILABLE = "available"
+        BORROWED = "borrowed"
+        HELD = "held"
+        LOST = "lost"
+        DAMAGED = "damaged"
+        WITHDRAWN = "withdrawn"
+
+    book = models.ForeignKey(Book, on_delete=models.CASCADE, related_name="book_copies")
+    barcode = models.CharField(max_length=32, unique=True)
+    status = models.CharField(
+        max_length=20, choices=Status.choices, default=Status.AVAILABLE
+    )
+
+    objects = BookCopyQuerySet.as_manager()
+
+    class Meta:
+        ordering = ("id",)
+        indexes = [
+            models.Index(fields=["book", "status"], name="bookcopy_book_status_idx"),
+        ]
+        verbose_name_plural = "book copies"
+
+    def __str__(self):
+        return f"{self.barcode} ({self.status})"
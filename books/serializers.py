@@ -1,24 +1,54 @@
 from decimal import Decimal
 
+from django.db import transaction
 from rest_framework import serializers
 
 from books.models import Book
 
 
 class BookSerializer(serializers.ModelSerializer):
+    available_copies = serializers.IntegerField(read_only=True)
+
     class Meta:
         model = Book
-        fields = ("id", "title", "author", "cover", "copies", "daily_fee")
+        fields = (
+            "id",
+            "title",
+            "author",
+            "cover",
+            "copies",
+            "available_copies",
+            "daily_fee",
+        )
 
     def validate(self, attrs):
-        if attrs["daily_fee"] < Decimal("0.50"):
+        daily_fee = attrs.get("daily_fee")
+        if daily_fee is not None and daily_fee < Decimal("0.50"):
             raise serializers.ValidationError(
                 {"daily_fee": "Daily fee must be at least $0.50"}
             )
+        if self.instance and "copies" in attrs:
+            off_the_shelf = self.instance.copies - self.instance.available_copies
+            if attrs["copies"] < off_the_shelf:
+                raise serializers.ValidationError(
+                    {"copies": f"{off_the_shelf} copies are borrowed or on hold."}
+                )
         return attrs
 
+    def update(self, instance, validated_data):
+        # Copies can leave the shelf between the check above and the
+        # withdrawal, which then finds too few of them and undoes the edit
+        try:
+            with transaction.atomic():
+                return super().update(instance, validated_data)
+        except ValueError as error:
+            raise serializers.ValidationError({"copies": str(error)})
+
 
 class BookListSerializer(serializers.ModelSerializer):
+    # Copies on the shelf, summed from the availability counters
+    copies = serializers.IntegerField(source="available_copies", read_only=True)
+
     class Meta:
         model = Book
         fields = ("id", "title", "author", "copies")
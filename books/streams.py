@@ -0,0 +1,84 @@
+import json
+
+from asgiref.sync import sync_to_async
+from django.conf import settings
+from django.core.handlers.asgi import ASGIRequest
+from django.http import JsonResponse, StreamingHttpResponse
+from django.views.decorators.http import require_GET
+
+from books.models import AVAILABILITY_CHANNEL, BookAvailability
+from library_service.pubsub import get_pubsub
+
+
+def parse_book_ids(value: str) -> list[int]:
+    try:
+        book_ids = sorted({int(book_id) for book_id in value.split(",") if book_id})
+    except ValueError:
+        raise ValueError("books must be comma-separated book ids.")
+    if not book_ids:
+        raise ValueError("books is required.")
+    if len(book_ids) > settings.AVAILABILITY_STREAM_MAX_BOOKS:
+        raise ValueError(
+            f"At most {settings.AVAILABILITY_STREAM_MAX_BOOKS} books per stream."
+        )
+    return book_ids
+
+
+def availability_event(book_id, available: int) -> str:
+    data = json.dumps({"book": int(book_id), "available_copies": available})
+    return f"event: availability\ndata: {data}\n\n"
+
+
+async def availability_events(subscription, book_ids: list[int]):
+    try:
+        yield f"retry: {settings.AVAILABILITY_STREAM_RETRY_MS}\n\n"
+        # Read after subscribing, so no change between the two is lost
+        counts = await sync_to_async(BookAvailability.objects.counts)(book_ids)
+        for book_id, available in counts:
+            yield availability_event(book_id, available)
+
+        while True:
+            changes = await subscription.get(
+                timeout=settings.AVAILABILITY_STREAM_HEARTBEAT_SECONDS
+            )
+            if not changes:
+                # Keeps proxies from closing an idle connection
+                yield ": keep-alive\n\n"
+            for book_id, available in changes.items():
+                yield availability_event(book_id, available)
+    finally:
+        subscription.close()
+
+
+@require_GET
+async def availability_stream(request):
+    """
+    Server-Sent Events stream of the copies on the shelf of the books in
+    `?books=1,2,3`: the current counts first, then every change.
+
+    Each connection is held open, so it must be served by an ASGI server.
+    A WSGI worker would be tied up for as long as the client stays, so the
+    stream is refused there.
+    """
+    if not isinstance(request, ASGIRequest):
+        return JsonResponse(
+            {"detail": "Availability streams are only served over ASGI."},
+            status=501,
+        )
+
+    try:
+        book_ids = parse_book_ids(request.GET.get("books", ""))
+    except ValueError as error:
+        return JsonResponse({"books": [str(error)]}, status=400)
+
+    subscription = get_pubsub(AVAILABILITY_CHANNEL).subscribe(
+        {str(book_id) for book_id in book_ids}
+    )
+    response = StreamingHttpResponse(
+        availability_events(subscription, book_ids),
+        content_type="text/event-stream",
+    )
+    response["Cache-Control"] = "no-cache"
+    # Nginx must pass events on as they are written
+    response["X-Accel-Buffering"] = "no"
+    return response
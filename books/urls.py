@@ -1,4 +1,5 @@
 from django.urls import path, include
+from books.streams import availability_stream
 from books.views import BookViewSet
 from rest_framework import routers
 
@@ -9,5 +10,10 @@ router = routers.DefaultRouter()
 router.register("", BookViewSet)
 
 urlpatterns = [
+    path(
+        "availability/stream/",
+        availability_stream,
+        name="availability-stream",
+    ),
     path("", include(router.urls)),
 ]
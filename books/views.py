@@ -1,11 +1,28 @@
+from drf_spectacular.utils import extend_schema, extend_schema_view
 from rest_framework import viewsets
 
 from books.models import Book
+from library_service.db_routers import ReadReplicaMixin
+from library_service.fast_list import ValuesListMixin
+from library_service.sparse_fields import FIELDS_PARAMETER, SparseFieldsMixin
 from books.serializers import BookSerializer, BookListSerializer
 
 
-class BookViewSet(viewsets.ModelViewSet):
+@extend_schema_view(
+    list=extend_schema(parameters=[FIELDS_PARAMETER]),
+    retrieve=extend_schema(parameters=[FIELDS_PARAMETER]),
+)
+class BookViewSet(
+    ReadReplicaMixin, SparseFieldsMixin, ValuesListMixin, viewsets.ModelViewSet
+):
     queryset = Book.objects.all()
+    list_lookups = {"copies": "available_copies_sum"}
+
+    def get_queryset(self):
+        # The copies on the shelf are summed only when they are returned
+        if self.action == "list" and self.field_requested("copies"):
+            return Book.objects.with_available_copies()
+        return super().get_queryset()
 
     def get_serializer_class(self):
         if self.action == "list":
@@ -1,5 +1,38 @@
 from django.contrib import admin
 
-from borrowings.models import Borrowing
+from borrowings.helpers.returns import return_borrowings
+from borrowings.models import Borrowing, Reservation
+from library_service.admin import LargeTableAdmin
 
-admin.site.register(Borrowing)
+
+@admin.register(Borrowing)
+class BorrowingAdmin(LargeTableAdmin):
+    list_display = (
+        "id",
+        "user",
+        "book",
+        "copy",
+        "borrow_date",
+        "expected_return_date",
+        "actual_return_date",
+        "is_active",
+    )
+    list_select_related = ("user", "book", "copy")
+    list_filter = ("is_active", "borrow_date", "expected_return_date")
+    search_fields = ("=user__email", "=copy__barcode")
+    autocomplete_fields = ("user", "book")
+    actions = ("mark_returned",)
+
+    @admin.action(description="Mark selected borrowings as returned")
+    def mark_returned(self, request, queryset) -> None:
+        returned = return_borrowings(queryset)
+        self.message_user(request, f"{returned} borrowings marked as returned.")
+
+
+@admin.register(Reservation)
+class ReservationAdmin(LargeTableAdmin):
+    list_display = ("id", "user", "book", "status", "created_at", "hold_expires_at")
+    list_select_related = ("user", "book")
+    list_filter = ("status",)
+    search_fields = ("=user__email",)
+    autocomplete_fields = ("user", "book")
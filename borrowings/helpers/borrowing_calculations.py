@@ -3,10 +3,20 @@ from decimal import Decimal
 from django.utils import timezone
 
 
+def borrowing_price(daily_fee: Decimal, borrow_date, expected_return_date) -> Decimal:
+    return daily_fee * (expected_return_date - borrow_date).days
+
+
+def overdue_days(expected_return_date, today) -> int:
+    if expected_return_date < today:
+        return (today - expected_return_date).days
+
+    return 0
+
+
 def calculate_borrowing_price(borrowing) -> Decimal:
-    return (
-        borrowing.book.daily_fee
-        * (borrowing.expected_return_date - borrowing.borrow_date).days
+    return borrowing_price(
+        borrowing.book.daily_fee, borrowing.borrow_date, borrowing.expected_return_date
     )
 
 
@@ -15,10 +25,15 @@ def calculate_overdue_fee(borrowing) -> Decimal:
 
 
 def calculate_overdue_days(borrowing) -> int:
-    expected_return_date = borrowing.expected_return_date
-    today = timezone.localdate()
-
-    if expected_return_date < today:
-        return (today - expected_return_date).days
-
-    return 0
+    return overdue_days(borrowing.expected_return_date, timezone.localdate())
+
+
+def quote_borrowing_prices(items: list[dict], daily_fees: dict, today) -> list:
+    """
+    Prices of borrowings starting `today`, one per `{"book", "expected_return_date"}`
+    item, from the daily fees of the books keyed by book id.
+    """
+    return [
+        borrowing_price(daily_fees[item["book"]], today, item["expected_return_date"])
+        for item in items
+    ]
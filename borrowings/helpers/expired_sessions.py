@@ -1,11 +1,13 @@
-import stripe
+from django.db import transaction
 
-from library_service import settings
+from borrowings.helpers.payment import get_stripe
+from events.log import record_event
+from events.models import Event
 from payments.models import Payment
 
 
 def expired_sessions_check() -> None:
-    stripe.api_key = settings.STRIPE_SECRET_KEY
+    stripe = get_stripe()
 
     db_checkout_sessions = Payment.objects.filter(
         payment_status=Payment.PaymentStatus.PENDING
@@ -18,4 +20,6 @@ def expired_sessions_check() -> None:
 
         if stripe_checkout_session["status"] == Payment.PaymentStatus.EXPIRED:
             db_checkout_session.payment_status = Payment.PaymentStatus.EXPIRED
-            db_checkout_session.save()
+            with transaction.atomic():
+                db_checkout_session.save()
+                record_event(Event.Type.PAYMENT_EXPIRED, db_checkout_session)
@@ -0,0 +1,74 @@
+from django.db.models import (
+    DecimalField,
+    ExpressionWrapper,
+    F,
+    Func,
+    IntegerField,
+    OuterRef,
+    Subquery,
+    Value,
+)
+from django.utils import timezone
+
+from books.models import Book
+from ..models import Borrowing
+
+
+class DaysBetween(Func):
+    """
+    Whole days from the second date expression to the first one, computed in SQL.
+    """
+
+    arity = 2
+    output_field = IntegerField()
+
+    def as_sql(self, compiler, connection, **extra_context):
+        return super().as_sql(
+            compiler,
+            connection,
+            template="((%(expressions)s))",
+            arg_joiner=")::date - (",
+            **extra_context,
+        )
+
+    def as_sqlite(self, compiler, connection, **extra_context):
+        return super().as_sql(
+            compiler,
+            connection,
+            template="CAST(julianday(%(expressions)s) AS INTEGER)",
+            arg_joiner=") - julianday(",
+            **extra_context,
+        )
+
+    def as_mysql(self, compiler, connection, **extra_context):
+        return super().as_sql(
+            compiler, connection, template="DATEDIFF(%(expressions)s)", **extra_context
+        )
+
+
+def overdue_fee_expression(today):
+    """
+    `calculate_overdue_fee` as an SQL expression: daily fee times overdue days.
+    """
+    daily_fee = Subquery(
+        Book.objects.filter(pk=OuterRef("book_id")).values("daily_fee")[:1]
+    )
+    return ExpressionWrapper(
+        daily_fee * DaysBetween(Value(today), F("expected_return_date")),
+        output_field=DecimalField(max_digits=10, decimal_places=2),
+    )
+
+
+def accrue_overdue_fees(today=None) -> int:
+    """
+    Brings the accrued fee of every overdue active borrowing up to date
+    with a single UPDATE statement. Safe to run more than once a day.
+    """
+    today = today or timezone.localdate()
+    return Borrowing.objects.filter(
+        is_active=True, expected_return_date__lt=today
+    ).update(
+        accrued_overdue_fee=overdue_fee_expression(today),
+        fee_accrued_on=today,
+        updated_at=timezone.now(),
+    )
@@ -1,43 +1,134 @@
+from itertools import groupby
+
+from django.conf import settings
+from django.db import transaction
+from django.db.models import Q
 from django.utils import timezone
 
-from .borrowing_calculations import calculate_overdue_days, calculate_overdue_fee
+from notifications.helpers.queue import build_notification, enqueue_notifications
+from .borrowing_calculations import calculate_overdue_days
+from .fee_accrual import accrue_overdue_fees
 from .telegram import send_message
 from ..models import Borrowing
 
 
-def send_overdue_alert_message():
-    borrowings = Borrowing.objects.select_related("user", "book")
-    message = ""
+def due_borrowings(today):
+    """
+    Active borrowings that are due today, tomorrow or already overdue.
+    """
+    return Borrowing.objects.filter(
+        is_active=True,
+        expected_return_date__lte=today + timezone.timedelta(days=1),
+    )
+
+
+def build_reminder_line(borrowing, today) -> str:
+    if borrowing.expected_return_date == today:
+        return f"• <b>{borrowing.book.title}</b>: return <b>today</b>"
+    if borrowing.expected_return_date > today:
+        return f"• <b>{borrowing.book.title}</b>: return <b>tomorrow</b>"
+    return (
+        f"• <b>{borrowing.book.title}</b>: overdue since "
+        f"{borrowing.expected_return_date} "
+        f"({calculate_overdue_days(borrowing)} days, fee ${borrowing.accrued_overdue_fee})"
+    )
+
+
+def build_reminder_digest(borrowings: list, today) -> str:
+    """
+    One message listing every due book of a user.
+    """
+    overdue = any(borrowing.expected_return_date < today for borrowing in borrowings)
+    title = "⚠️ <b>Overdue Alert</b>" if overdue else "⚠️ <b>Return Reminder</b>"
+    lines = "\n".join(build_reminder_line(borrowing, today) for borrowing in borrowings)
+    return f"{title}\nPlease return the following books:\n{lines}"
+
+
+def plan_reminder_chunks(today, chunk_size: int = None) -> list:
+    """
+    Splits users with due borrowings into `(first_user_id, last_user_id)` ranges
+    holding at most `chunk_size` users each. Chunking by user keeps all due books
+    of a user in one digest.
+    """
+    chunk_size = chunk_size or settings.REMINDER_CHUNK_SIZE
+    user_ids = (
+        due_borrowings(today)
+        .order_by("user_id")
+        .values_list("user_id", flat=True)
+        .distinct()
+        .iterator(chunk_size=chunk_size)
+    )
+
+    chunks = []
+    first_id = last_id = None
     count = 0
+    for user_id in user_ids:
+        if count == 0:
+            first_id = user_id
+        last_id = user_id
+        count += 1
+        if count == chunk_size:
+            chunks.append((first_id, last_id))
+            count = 0
+    if count:
+        chunks.append((first_id, last_id))
+    return chunks
 
-    for borrowing in borrowings:
-        if borrowing.is_active:
-            if borrowing.expected_return_date == timezone.localdate():
-                message = (
-                    f"⚠️ <b>Return Reminder</b>\n"
-                    f"User <b>{borrowing.user}</b> should return the book "
-                    f"<b>{borrowing.book.title}</b> <b>today</b>."
-                )
-            elif (
-                borrowing.expected_return_date
-                == timezone.localdate() + timezone.timedelta(days=1)
-            ):
-                message = (
-                    f"⚠️ <b>Return Reminder️</b>\n"
-                    f"User <b>{borrowing.user}</b> should return the book "
-                    f"<b>{borrowing.book.title}</b> <b>tomorrow</b>."
-                )
-            elif borrowing.expected_return_date < timezone.localdate():
-                message = (
-                    f"⚠️ <b>Overdue Alert</b>\n"
-                    f"User <b>{borrowing.user}</b> should return the overdue book <b>{borrowing.book.title}</b> as soon as possible!\n\n"
-                    f"Due date: {borrowing.expected_return_date}\n"
-                    f"Overdue: {calculate_overdue_days(borrowing)} days\n"
-                    f"Fee: ${calculate_overdue_fee(borrowing)}\n"
+
+def enqueue_reminders_for_range(first_user_id: int, last_user_id: int, today) -> int:
+    """
+    Queues one reminder digest per user with ids in `[first_user_id, last_user_id]`.
+
+    Borrowings are marked as reminded in the same transaction, and digests are
+    deduplicated per user and day, so rerunning a chunk enqueues nothing new.
+    """
+    borrowings = (
+        due_borrowings(today)
+        .filter(user_id__gte=first_user_id, user_id__lte=last_user_id)
+        .filter(Q(reminded_on__isnull=True) | Q(reminded_on__lt=today))
+        .select_related("user", "book")
+        .order_by("user_id", "expected_return_date", "id")
+    )
+
+    with transaction.atomic():
+        notifications = []
+        borrowing_ids = []
+        for user, user_borrowings in groupby(
+            borrowings, key=lambda borrowing: borrowing.user
+        ):
+            user_borrowings = list(user_borrowings)
+            borrowing_ids.extend(borrowing.id for borrowing in user_borrowings)
+            notifications.append(
+                build_notification(
+                    user,
+                    subject="Library return reminder",
+                    message=build_reminder_digest(user_borrowings, today),
+                    dedup_key=f"return-reminder:{user.id}:{today.isoformat()}",
                 )
+            )
+
+        enqueue_notifications(notifications)
+        Borrowing.objects.filter(id__in=borrowing_ids).update(
+            reminded_on=today, updated_at=timezone.now()
+        )
+
+    return len(notifications)
+
+
+def send_no_overdue_message() -> None:
+    send_message("🎉 <b>No borrowings overdue today!</b>")
+
+
+def send_overdue_alert_message():
+    """
+    Queues all reminder digests in the current process, chunk by chunk.
+    """
+    today = timezone.localdate()
+    accrue_overdue_fees(today)
+    chunks = plan_reminder_chunks(today)
 
-            send_message(message)
-            count += 1
+    if not chunks:
+        send_no_overdue_message()
 
-    if count == 0:
-        send_message("🎉 <b>No borrowings overdue today!</b>")
+    for first_user_id, last_user_id in chunks:
+        enqueue_reminders_for_range(first_user_id, last_user_id, today)
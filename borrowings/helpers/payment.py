@@ -1,13 +1,27 @@
-import stripe
+from django.db import transaction
 from rest_framework.reverse import reverse
 
+from events.log import record_event
+from events.models import Event
+from library_service import settings
 from payments.models import Payment
 
 
+def get_stripe():
+    """
+    Imports the Stripe SDK on first use. It takes longer to import than the rest
+    of the app together, and most processes never talk to Stripe.
+    """
+    import stripe
+
+    stripe.api_key = settings.STRIPE_SECRET_KEY
+    return stripe
+
+
 def create_checkout_session(request, borrowing, amount_to_pay, payment_type):
 
     # Creates Stripe checkout session
-    stripe_checkout_session = stripe.checkout.Session.create(
+    stripe_checkout_session = get_stripe().checkout.Session.create(
         payment_method_types=["card"],
         line_items=[
             {
@@ -35,16 +49,18 @@ def create_checkout_session(request, borrowing, amount_to_pay, payment_type):
     )
 
     # Updates or creates checkout session (payment object) in db
-    Payment.objects.update_or_create(
-        borrowing=borrowing,
-        payment_status=Payment.PaymentStatus.EXPIRED,
-        defaults={
-            "payment_status": Payment.PaymentStatus.PENDING,
-            "payment_type": payment_type,
-            "session_url": stripe_checkout_session.url,
-            "session_id": stripe_checkout_session.id,
-            "amount_to_pay": amount_to_pay,
-        },
-    )
+    with transaction.atomic():
+        payment, _ = Payment.objects.update_or_create(
+            borrowing=borrowing,
+            payment_status=Payment.PaymentStatus.EXPIRED,
+            defaults={
+                "payment_status": Payment.PaymentStatus.PENDING,
+                "payment_type": payment_type,
+                "session_url": stripe_checkout_session.url,
+                "session_id": stripe_checkout_session.id,
+                "amount_to_pay": amount_to_pay,
+            },
+        )
+        record_event(Event.Type.PAYMENT_CREATED, payment)
 
     return stripe_checkout_session
@@ -0,0 +1,160 @@
+from django.conf import settings
+from django.db import transaction
+from django.utils import timezone
+
+from books.models import BookCopy
+from notifications.helpers.queue import build_notification, enqueue_notifications
+from notifications.tasks import deliver_notifications_task
+from ..models import Reservation
+
+
+def notify_hold_ready(reservation: Reservation) -> None:
+    """
+    Queues the "your book is waiting" notification and wakes up delivery
+    once the hold is committed.
+    """
+    enqueue_notifications(
+        [
+            build_notification(
+                reservation.user,
+                subject="Your reserved book is ready",
+                message=(
+                    f"📘 <b>{reservation.book.title}</b> is waiting for you.\n"
+                    f"Borrow it before {reservation.hold_expires_at:%Y-%m-%d %H:%M} "
+                    f"UTC, after that it goes to the next reader in the queue."
+                ),
+                dedup_key=f"reservation-ready:{reservation.id}",
+            )
+        ]
+    )
+    transaction.on_commit(deliver_notifications_task.delay)
+
+
+def hand_over_copy(book_id: int, copy_id: int | None = None) -> Reservation | None:
+    """
+    Gives a copy that became free to the head of the book's queue.
+
+    The head reservation is locked and skipped by concurrent returns of the
+    same title, so each copy is assigned to a different waiting user. Without
+    waiting users the copy goes back on the shelf. Returns the reservation
+    that got the copy.
+    """
+    with transaction.atomic():
+        reservation = (
+            Reservation.objects.select_for_update(skip_locked=True, of=("self",))
+            .select_related("user", "book")
+            .filter(book_id=book_id, status=Reservation.Status.WAITING)
+            .order_by("id")
+            .first()
+        )
+
+        if reservation is None:
+            BookCopy.objects.put_back_one(book_id, copy_id)
+            return None
+
+        reservation.status = Reservation.Status.READY
+        reservation.hold_expires_at = timezone.now() + timezone.timedelta(
+            hours=settings.RESERVATION_HOLD_HOURS
+        )
+        reservation.copy_id = copy_id
+        reservation.save(update_fields=["status", "hold_expires_at", "copy"])
+        if copy_id is not None:
+            BookCopy.objects.filter(pk=copy_id).update(status=BookCopy.Status.HELD)
+        notify_hold_ready(reservation)
+
+    return reservation
+
+
+def hand_over_copies(copies: list[tuple[int, int | None]]) -> None:
+    """
+    `hand_over_copy` for many (book id, copy id) pairs. Copies of books
+    nobody is waiting for go back on the shelf with two statements.
+    """
+    queued = set(
+        Reservation.objects.filter(
+            book_id__in={book_id for book_id, _ in copies},
+            status=Reservation.Status.WAITING,
+        ).values_list("book_id", flat=True)
+    )
+    for book_id, copy_id in copies:
+        if book_id in queued:
+            hand_over_copy(book_id, copy_id)
+    BookCopy.objects.put_back(
+        [(book_id, copy_id) for book_id, copy_id in copies if book_id not in queued]
+    )
+
+
+def has_ready_hold(user, book) -> bool:
+    return Reservation.objects.filter(
+        user=user,
+        book=book,
+        status=Reservation.Status.READY,
+        hold_expires_at__gt=timezone.now(),
+    ).exists()
+
+
+def claim_hold(user, book) -> Reservation | None:
+    """
+    Turns the user's ready hold into a borrowing and marks the held copy
+    borrowed. The lock makes sure a held copy is claimed at most once.
+    Returns the claimed reservation.
+    """
+    reservation = (
+        Reservation.objects.select_for_update(of=("self",))
+        .select_related("copy")
+        .filter(
+            user=user,
+            book=book,
+            status=Reservation.Status.READY,
+            hold_expires_at__gt=timezone.now(),
+        )
+        .first()
+    )
+    if reservation is None:
+        return None
+
+    reservation.status = Reservation.Status.FULFILLED
+    reservation.save(update_fields=["status"])
+    if reservation.copy is not None:
+        reservation.copy.status = BookCopy.Status.BORROWED
+        reservation.copy.save(update_fields=["status"])
+    return reservation
+
+
+def cancel_reservation(reservation: Reservation) -> None:
+    """
+    Leaves the queue. A copy already held for the user passes on.
+    """
+    with transaction.atomic():
+        was_ready = (
+            Reservation.objects.filter(
+                pk=reservation.pk, status=Reservation.Status.READY
+            ).update(status=Reservation.Status.CANCELLED)
+            == 1
+        )
+        if was_ready:
+            hand_over_copy(reservation.book_id, reservation.copy_id)
+        else:
+            Reservation.objects.filter(
+                pk=reservation.pk, status=Reservation.Status.WAITING
+            ).update(status=Reservation.Status.CANCELLED)
+
+
+def expire_holds(now=None) -> int:
+    """
+    Expires unclaimed holds and passes their copies down the queue.
+    """
+    now = now or timezone.now()
+    expired = 0
+    with transaction.atomic():
+        reservations = (
+            Reservation.objects.select_for_update(skip_locked=True)
+            .filter(status=Reservation.Status.READY, hold_expires_at__lte=now)
+            .order_by("id")
+        )
+        for reservation in reservations:
+            reservation.status = Reservation.Status.EXPIRED
+            reservation.save(update_fields=["status"])
+            hand_over_copy(reservation.book_id, reservation.copy_id)
+            expired += 1
+    return expired
@@ -0,0 +1,53 @@
+from decimal import Decimal
+
+from django.db import transaction
+from django.db.models import Case, DecimalField, Value, When
+from django.utils import timezone
+
+from events.log import record_events
+from events.models import Event
+from .fee_accrual import overdue_fee_expression
+from .reservations import hand_over_copies
+from ..models import Borrowing
+
+
+def return_borrowings(queryset, today=None) -> int:
+    """
+    Returns the active borrowings of `queryset` with set-based updates: the
+    final overdue fees are computed in SQL and the copies go to the
+    reservation queues or back on the shelf. Returns the number of returned
+    borrowings.
+
+    Unlike a return through the API, no checkout session is created for the
+    overdue fees.
+    """
+    today = today or timezone.localdate()
+    with transaction.atomic():
+        returned = list(
+            queryset.filter(is_active=True)
+            .select_for_update()
+            .values_list("id", "book_id", "copy_id")
+        )
+        if not returned:
+            return 0
+
+        returned_ids = [pk for pk, _, _ in returned]
+        Borrowing.objects.filter(pk__in=returned_ids).update(
+            is_active=False,
+            actual_return_date=today,
+            accrued_overdue_fee=Case(
+                When(
+                    expected_return_date__lt=today,
+                    then=overdue_fee_expression(today),
+                ),
+                default=Value(Decimal(0)),
+                output_field=DecimalField(max_digits=10, decimal_places=2),
+            ),
+            fee_accrued_on=today,
+            updated_at=timezone.now(),
+        )
+        record_events(
+            Event.Type.BORROWING_RETURNED, Borrowing.objects.filter(pk__in=returned_ids)
+        )
+        hand_over_copies([(book_id, copy_id) for _, book_id, copy_id in returned])
+    return len(returned)
@@ -0,0 +1,393 @@
+import random
+from collections import Counter
+from contextlib import contextmanager
+from datetime import timedelta
+from decimal import Decimal
+
+from django.contrib.auth import get_user_model
+from django.contrib.auth.hashers import make_password
+from django.core.management.color import no_style
+from django.conf import settings
+from django.db import connection, transaction
+from django.db.models import Max
+from django.utils import timezone
+
+from books.models import Book, BookAvailability, BookCopy, make_barcode, split_copies
+from borrowings.models import Borrowing
+from payments.models import Payment
+
+SEED_PASSWORD = "seed-password"
+
+USER_COLUMNS = (
+    "id",
+    "email",
+    "password",
+    "first_name",
+    "last_name",
+    "is_staff",
+    "is_superuser",
+    "is_active",
+    "date_joined",
+)
+BOOK_COLUMNS = ("id", "title", "author", "cover", "copies", "daily_fee")
+AVAILABILITY_COLUMNS = ("book_id", "shard", "available")
+COPY_COLUMNS = ("id", "book_id", "barcode", "status")
+BORROWING_COLUMNS = (
+    "id",
+    "user_id",
+    "book_id",
+    "copy_id",
+    "borrow_date",
+    "expected_return_date",
+    "actual_return_date",
+    "is_active",
+)
+PAYMENT_COLUMNS = (
+    "id",
+    "payment_status",
+    "payment_type",
+    "borrowing_id",
+    "session_url",
+    "session_id",
+    "amount_to_pay",
+)
+
+# Loans whose due date has passed are returned with this probability,
+# the rest stay active and overdue
+RETURNED_RATIO = 0.9
+# Share of returned loans that came back late
+LATE_RETURN_RATIO = 0.2
+# Share of active loans whose borrowing payment is still pending
+PENDING_PAYMENT_RATIO = 0.05
+
+
+@contextmanager
+def explicit_borrow_dates():
+    """
+    `Borrowing.borrow_date` uses `auto_now_add`, which would stamp every generated
+    row with today's date. Disable it while seeding so the history is realistic.
+    """
+    field = Borrowing._meta.get_field("borrow_date")
+    field.auto_now_add = False
+    try:
+        yield
+    finally:
+        field.auto_now_add = True
+
+
+class BulkCreateWriter:
+    """
+    Portable writer based on `bulk_create`.
+    """
+
+    def write(self, model, columns: tuple, rows: list) -> None:
+        with explicit_borrow_dates():
+            model.objects.bulk_create(
+                [model(**dict(zip(columns, row))) for row in rows],
+                batch_size=len(rows) or None,
+            )
+
+
+class CopyWriter:
+    """
+    PostgreSQL writer streaming rows with `COPY ... FROM STDIN`.
+    """
+
+    def write(self, model, columns: tuple, rows: list) -> None:
+        sql = "COPY {} ({}) FROM STDIN".format(
+            connection.ops.quote_name(model._meta.db_table),
+            ", ".join(connection.ops.quote_name(column) for column in columns),
+        )
+        with connection.cursor() as cursor:
+            with cursor.copy(sql) as copy:
+                for row in rows:
+                    copy.write_row(row)
+
+
+def get_writer(method: str = "auto"):
+    if method == "auto":
+        method = "copy" if connection.vendor == "postgresql" else "bulk"
+    if method == "copy" and connection.vendor != "postgresql":
+        raise ValueError("COPY is only available on PostgreSQL.")
+    return CopyWriter() if method == "copy" else BulkCreateWriter()
+
+
+def next_id(model) -> int:
+    return (model.objects.aggregate(max_id=Max("id"))["max_id"] or 0) + 1
+
+
+def reset_sequences(*models) -> None:
+    """
+    Rows are written with explicit ids, so move the id sequences past them.
+    """
+    statements = connection.ops.sequence_reset_sql(no_style(), models)
+    with connection.cursor() as cursor:
+        for statement in statements:
+            cursor.execute(statement)
+
+
+def iter_user_rows(count: int, first_id: int, rng: random.Random):
+    # Hashing is deliberately slow, so all generated users share one password hash
+    password = make_password(SEED_PASSWORD)
+    now = timezone.now()
+    for user_id in range(first_id, first_id + count):
+        yield (
+            user_id,
+            f"seed_user_{user_id}@example.com",
+            password,
+            f"First{user_id}",
+            f"Last{rng.randrange(1000)}",
+            False,
+            False,
+            True,
+            now - timedelta(days=rng.randrange(1000)),
+        )
+
+
+def iter_book_rows(count: int, first_id: int, rng: random.Random):
+    covers = Book.CoverChoices.values
+    for book_id in range(first_id, first_id + count):
+        yield (
+            book_id,
+            f"Seed book {book_id}",
+            f"Seed author {book_id % 5000}",
+            rng.choice(covers),
+            rng.randint(1, 20),
+            Decimal(rng.randint(50, 500)) / 100,
+        )
+
+
+def iter_availability_rows(book_rows: list, shards: int, on_loan: Counter):
+    for book_id, *_, copies, _ in book_rows:
+        shelf = copies - on_loan[book_id]
+        for shard, available in enumerate(split_copies(shelf, shards)):
+            yield book_id, shard, available
+
+
+def copy_id_ranges(book_rows: list, first_id: int) -> dict:
+    """
+    Ids of the copies of each book, numbered consecutively from `first_id`.
+    """
+    ranges = {}
+    for book_id, *_, copies, _ in book_rows:
+        ranges[book_id] = range(first_id, first_id + copies)
+        first_id += copies
+    return ranges
+
+
+def iter_copy_rows(copy_ids: dict):
+    for book_id, ids in copy_ids.items():
+        for number, copy_id in enumerate(ids, start=1):
+            yield (
+                copy_id,
+                book_id,
+                make_barcode(book_id, number),
+                BookCopy.Status.AVAILABLE,
+            )
+
+
+def iter_borrowing_rows(
+    count: int,
+    first_id: int,
+    user_ids: range,
+    books: list,
+    copy_ids: dict,
+    on_loan: Counter,
+    rng: random.Random,
+    history_days: int = 365,
+):
+    """
+    Yields `(borrowing_row, payment_rows)` pairs.
+    Payment ids are assigned by the caller.
+
+    Active loans hand out the copies of `copy_ids` in order and are counted
+    per book in `on_loan`. Once all copies of a book are out, further loans
+    of it are generated as returned.
+    """
+    today = timezone.localdate()
+    for borrowing_id in range(first_id, first_id + count):
+        book_id, daily_fee = rng.choice(books)
+        borrow_date = today - timedelta(days=rng.randrange(history_days))
+        loan_days = rng.randint(1, 30)
+        expected_return_date = borrow_date + timedelta(days=loan_days)
+        actual_return_date = None
+
+        if expected_return_date < today and rng.random() < RETURNED_RATIO:
+            late_days = (
+                min(int(rng.expovariate(1 / 5)) + 1, 60)
+                if rng.random() < LATE_RETURN_RATIO
+                else -rng.randrange(loan_days)
+            )
+            actual_return_date = min(
+                expected_return_date + timedelta(days=late_days), today
+            )
+
+        copy_id = None
+        if actual_return_date is None:
+            if on_loan[book_id] < len(copy_ids[book_id]):
+                copy_id = copy_ids[book_id][on_loan[book_id]]
+                on_loan[book_id] += 1
+            else:
+                actual_return_date = min(expected_return_date, today)
+
+        is_active = actual_return_date is None
+        borrowing_row = (
+            borrowing_id,
+            rng.choice(user_ids),
+            book_id,
+            copy_id,
+            borrow_date,
+            expected_return_date,
+            actual_return_date,
+            is_active,
+        )
+
+        payment_status = (
+            Payment.PaymentStatus.PENDING
+            if is_active and rng.random() < PENDING_PAYMENT_RATIO
+            else Payment.PaymentStatus.PAID
+        )
+        payment_rows = [
+            (
+                payment_status,
+                Payment.PaymentType.BORROWING_PAYMENT,
+                borrowing_id,
+                f"https://checkout.stripe.com/c/pay/seed_{borrowing_id}",
+                f"seed_{borrowing_id}",
+                daily_fee * loan_days,
+            )
+        ]
+
+        overdue_days = (
+            (actual_return_date - expected_return_date).days
+            if actual_return_date
+            else 0
+        )
+        if overdue_days > 0:
+            payment_rows.append(
+                (
+                    Payment.PaymentStatus.PAID,
+                    Payment.PaymentType.OVERDUE_FEE_PAYMENT,
+                    borrowing_id,
+                    f"https://checkout.stripe.com/c/pay/seed_fee_{borrowing_id}",
+                    f"seed_fee_{borrowing_id}",
+                    daily_fee * overdue_days,
+                )
+            )
+
+        yield borrowing_row, payment_rows
+
+
+def write_in_batches(writer, model, columns: tuple, rows, batch_size: int) -> int:
+    written = 0
+    batch = []
+    for row in rows:
+        batch.append(row)
+        if len(batch) == batch_size:
+            with transaction.atomic():
+                writer.write(model, columns, batch)
+            written += len(batch)
+            batch = []
+    if batch:
+        with transaction.atomic():
+            writer.write(model, columns, batch)
+        written += len(batch)
+    return written
+
+
+def seed_database(
+    users: int,
+    books: int,
+    borrowings: int,
+    seed: int = 0,
+    batch_size: int = 10_000,
+    method: str = "auto",
+    history_days: int = 365,
+    progress=None,
+) -> dict:
+    """
+    Appends a deterministic synthetic dataset to the database.
+
+    Borrowings reference the newly generated users and books. Every borrowing gets a
+    borrowing payment, and late returns additionally get an overdue fee payment.
+    Active borrowings hold a copy of their book, which is off the shelf.
+    """
+    rng = random.Random(seed)
+    writer = get_writer(method)
+    report = progress or (lambda message: None)
+
+    first_user_id = next_id(get_user_model())
+    written_users = write_in_batches(
+        writer,
+        get_user_model(),
+        USER_COLUMNS,
+        iter_user_rows(users, first_user_id, rng),
+        batch_size,
+    )
+    report(f"Users: {written_users}")
+
+    first_book_id = next_id(Book)
+    book_rows = list(iter_book_rows(books, first_book_id, rng))
+    written_books = write_in_batches(writer, Book, BOOK_COLUMNS, book_rows, batch_size)
+    # Copies go in before the borrowings referencing them, all on the shelf
+    copy_ids = copy_id_ranges(book_rows, next_id(BookCopy))
+    write_in_batches(
+        writer, BookCopy, COPY_COLUMNS, iter_copy_rows(copy_ids), batch_size
+    )
+    report(f"Books: {written_books}")
+
+    user_ids = range(first_user_id, first_user_id + users)
+    fees = [(row[0], row[-1]) for row in book_rows]
+    next_payment_id = next_id(Payment)
+    written_borrowings = written_payments = 0
+
+    on_loan = Counter()
+    rows = iter_borrowing_rows(
+        borrowings,
+        next_id(Borrowing),
+        user_ids,
+        fees,
+        copy_ids,
+        on_loan,
+        rng,
+        history_days,
+    )
+    while True:
+        borrowing_batch, payment_batch = [], []
+        for borrowing_row, payment_rows in rows:
+            borrowing_batch.append(borrowing_row)
+            for payment_row in payment_rows:
+                payment_batch.append((next_payment_id, *payment_row))
+                next_payment_id += 1
+            if len(borrowing_batch) == batch_size:
+                break
+        if not borrowing_batch:
+            break
+
+        with transaction.atomic():
+            writer.write(Borrowing, BORROWING_COLUMNS, borrowing_batch)
+            writer.write(Payment, PAYMENT_COLUMNS, payment_batch)
+        written_borrowings += len(borrowing_batch)
+        written_payments += len(payment_batch)
+        report(f"Borrowings: {written_borrowings}/{borrowings}")
+
+    # Shelf counts and copy statuses leave out the copies of active loans
+    write_in_batches(
+        writer,
+        BookAvailability,
+        AVAILABILITY_COLUMNS,
+        iter_availability_rows(book_rows, settings.BOOK_AVAILABILITY_SHARDS, on_loan),
+        batch_size,
+    )
+    BookCopy.objects.filter(
+        book_id__gte=first_book_id, borrowings__is_active=True
+    ).update(status=BookCopy.Status.BORROWED)
+
+    reset_sequences(get_user_model(), Book, BookCopy, Borrowing, Payment)
+
+    return {
+        "users": written_users,
+        "books": written_books,
+        "borrowings": written_borrowings,
+        "payments": written_payments,
+    }
@@ -1,20 +1,24 @@
 import os
 
-import requests
-from dotenv import load_dotenv
 
-load_dotenv()
-
-
-def send_message(message):
+def send_message(message, chat_id=None, session=None):
+    """
+    Sends a message to the staff chat, or to `chat_id` when given.
+    Pass a `requests.Session` to reuse one connection for many messages.
+    """
     url = f"https://api.telegram.org/bot{os.getenv('TELEGRAM_BOT_TOKEN')}/sendMessage"
     payload = {
-        "chat_id": os.getenv("TELEGRAM_CHAT_ID"),
+        "chat_id": chat_id or os.getenv("TELEGRAM_CHAT_ID"),
         "text": message,
         "parse_mode": "HTML",
     }
 
-    response = requests.post(url, data=payload)
+    if session is None:
+        import requests
+
+        session = requests
+
+    response = session.post(url, data=payload)
 
     if response.status_code != 200:
         raise Exception(f"Error sending message: {response.text}")
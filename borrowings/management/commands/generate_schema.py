@@ -0,0 +1,19 @@
+from pathlib import Path
+
+from django.conf import settings
+from django.core.management.base import BaseCommand
+
+from library_service.schema import write_schema
+
+
+class Command(BaseCommand):
+    """Django command to pregenerate the OpenAPI schema served by /api/schema/."""
+
+    help = "Writes the OpenAPI schema to API_SCHEMA_FILE."
+
+    def add_arguments(self, parser) -> None:
+        parser.add_argument("--file", type=Path, default=settings.API_SCHEMA_FILE)
+
+    def handle(self, *args, **options) -> None:
+        write_schema(options["file"])
+        self.stdout.write(self.style.SUCCESS(f"Schema written to {options['file']}"))
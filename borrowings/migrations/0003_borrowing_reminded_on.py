@@ -0,0 +1,22 @@
+# Generated by Django 5.1.1 on 2026-10-19 15:23
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ("borrowings", "0002_initial"),
+    ]
+
+    operations = [
+        migrations.AlterModelOptions(
+            name="borrowing",
+            options={"ordering": ("id",)},
+        ),
+        migrations.AddField(
+            model_name="borrowing",
+            name="reminded_on",
+            field=models.DateField(blank=True, editable=False, null=True),
+        ),
+    ]
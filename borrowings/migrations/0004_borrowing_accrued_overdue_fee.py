@@ -0,0 +1,25 @@
+# Generated by Django 5.1.1 on 2026-10-19 15:29
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ("borrowings", "0003_borrowing_reminded_on"),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name="borrowing",
+            name="accrued_overdue_fee",
+            field=models.DecimalField(
+                decimal_places=2, default=0, editable=False, max_digits=10
+            ),
+        ),
+        migrations.AddField(
+            model_name="borrowing",
+            name="fee_accrued_on",
+            field=models.DateField(blank=True, editable=False, null=True),
+        ),
+    ]
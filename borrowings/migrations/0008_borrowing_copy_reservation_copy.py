@@ -0,0 +1,97 @@
+# Generated by Django 5.1.1 on 2026-10-19 17:00
+
+import django.db.models.deletion
+from django.db import migrations, models
+
+# The n-th active borrowing of a book gets the copy numbered n, the ready
+# reservations the copies after them. Copies of `books.0007` are numbered
+# from 1 per book, the statuses follow in two set-based UPDATEs.
+LINK_BORROWED_COPIES = """
+UPDATE borrowings_borrowing
+SET copy_id = books_bookcopy.id, updated_at = CURRENT_TIMESTAMP
+FROM (
+    SELECT id, book_id, ROW_NUMBER() OVER (PARTITION BY book_id ORDER BY id) AS number
+    FROM borrowings_borrowing
+    WHERE is_active
+) AS ranked
+JOIN books_bookcopy
+    ON books_bookcopy.barcode = 'LP' || ranked.book_id || '-' || ranked.number
+WHERE borrowings_borrowing.id = ranked.id
+"""
+LINK_HELD_COPIES = """
+UPDATE borrowings_reservation
+SET copy_id = books_bookcopy.id
+FROM (
+    SELECT
+        reservation.id,
+        reservation.book_id,
+        ROW_NUMBER() OVER (PARTITION BY reservation.book_id ORDER BY reservation.id)
+        + (
+            SELECT COUNT(*) FROM borrowings_borrowing
+            WHERE borrowings_borrowing.book_id = reservation.book_id
+            AND borrowings_borrowing.is_active
+        ) AS number
+    FROM borrowings_reservation AS reservation
+    WHERE reservation.status = 'ready'
+) AS ranked
+JOIN books_bookcopy
+    ON books_bookcopy.barcode = 'LP' || ranked.book_id || '-' || ranked.number
+WHERE borrowings_reservation.id = ranked.id
+"""
+MARK_BORROWED_COPIES = """
+UPDATE books_bookcopy SET status = 'borrowed'
+WHERE id IN (
+    SELECT copy_id FROM borrowings_borrowing WHERE is_active AND copy_id IS NOT NULL
+)
+"""
+MARK_HELD_COPIES = """
+UPDATE books_bookcopy SET status = 'held'
+WHERE id IN (
+    SELECT copy_id FROM borrowings_reservation
+    WHERE status = 'ready' AND copy_id IS NOT NULL
+)
+"""
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ("books", "0007_bookcopy"),
+        ("borrowings", "0007_borrowing_updated_at"),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name="borrowing",
+            name="copy",
+            field=models.ForeignKey(
+                blank=True,
+                editable=False,
+                null=True,
+                on_delete=django.db.models.deletion.SET_NULL,
+                related_name="borrowings",
+                to="books.bookcopy",
+            ),
+        ),
+        migrations.AddField(
+            model_name="reservation",
+            name="copy",
+            field=models.ForeignKey(
+                blank=True,
+                editable=False,
+                null=True,
+                on_delete=django.db.models.deletion.SET_NULL,
+                related_name="holds",
+                to="books.bookcopy",
+            ),
+        ),
+        migrations.RunSQL(
+            [
+                LINK_BORROWED_COPIES,
+                LINK_HELD_COPIES,
+                MARK_BORROWED_COPIES,
+                MARK_HELD_COPIES,
+            ],
+            migrations.RunSQL.noop,
+        ),
+    ]
@@ -0,0 +1,20 @@
+# Generated by Django 5.1.1 on 2026-10-19 17:09
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ("borrowings", "0008_borrowing_copy_reservation_copy"),
+    ]
+
+    operations = [
+        migrations.AlterField(
+            model_name="borrowing",
+            name="accrued_overdue_fee",
+            field=models.DecimalField(
+                db_default=0, decimal_places=2, default=0, editable=False, max_digits=10
+            ),
+        ),
+    ]
@@ -1,22 +1,105 @@
 from django.db import models
+from django.db.models.functions import Now
 
-from books.models import Book
+from books.models import Book, BookCopy
 from users.models import User
 
 
 class Borrowing(models.Model):
     user = models.ForeignKey(User, on_delete=models.CASCADE, related_name="borrowings")
     book = models.ForeignKey(Book, on_delete=models.CASCADE, related_name="borrowings")
+    # The physical copy handed out. Empty for borrowings from before copies
+    # were tracked
+    copy = models.ForeignKey(
+        BookCopy,
+        on_delete=models.SET_NULL,
+        blank=True,
+        null=True,
+        editable=False,
+        related_name="borrowings",
+    )
     borrow_date = models.DateField(auto_now_add=True)
     expected_return_date = models.DateField()
     actual_return_date = models.DateField(blank=True, null=True)
     is_active = models.BooleanField(default=True)
+    reminded_on = models.DateField(blank=True, null=True, editable=False)
+    # The database default covers rows written with COPY
+    accrued_overdue_fee = models.DecimalField(
+        max_digits=10, decimal_places=2, default=0, db_default=0, editable=False
+    )
+    fee_accrued_on = models.DateField(blank=True, null=True, editable=False)
+    # Validator for conditional GETs, bulk updates must set it too. The
+    # database default covers rows written with COPY.
+    updated_at = models.DateTimeField(auto_now=True, db_default=Now())
 
     class Meta:
         ordering = ("id",)
+        indexes = [
+            models.Index(
+                fields=["is_active", "expected_return_date"],
+                name="borrowing_active_due_idx",
+            ),
+            models.Index(fields=["expected_return_date"], name="borrowing_due_idx"),
+            models.Index(fields=["borrow_date"], name="borrowing_borrow_date_idx"),
+        ]
 
     def __str__(self):
         return (
             f"On {self.borrow_date} {self.user} borrowed {self.book}. "
             f"Expected return date: {self.expected_return_date}."
         )
+
+
+class Reservation(models.Model):
+    """
+    A place in the hold queue of a book without available copies.
+
+    A returned copy is held for the head of the queue until `hold_expires_at`,
+    then it passes on to the next waiting user.
+    """
+
+    class Status(models.TextChoices):
+        WAITING = "waiting"
+        READY = "ready"
+        FULFILLED = "fulfilled"
+        EXPIRED = "expired"
+        CANCELLED = "cancelled"
+
+    OPEN_STATUSES = (Status.WAITING, Status.READY)
+
+    user = models.ForeignKey(
+        User, on_delete=models.CASCADE, related_name="reservations"
+    )
+    book = models.ForeignKey(
+        Book, on_delete=models.CASCADE, related_name="reservations"
+    )
+    status = models.CharField(
+        max_length=20, choices=Status.choices, default=Status.WAITING
+    )
+    created_at = models.DateTimeField(auto_now_add=True)
+    hold_expires_at = models.DateTimeField(blank=True, null=True)
+    # The returned copy kept aside while the reservation is ready
+    copy = models.ForeignKey(
+        BookCopy,
+        on_delete=models.SET_NULL,
+        blank=True,
+        null=True,
+        editable=False,
+        related_name="holds",
+    )
+
+    class Meta:
+        ordering = ("id",)
+        constraints = [
+            models.UniqueConstraint(
+                fields=["user", "book"],
+                condition=models.Q(status__in=("waiting", "ready")),
+                name="unique_open_reservation",
+            ),
+        ]
+        indexes = [
+            models.Index(fields=["book", "status", "id"], name="reservation_queue_idx"),
+        ]
+
+    def __str__(self):
+        return f"{self.user} reserved {self.book} ({self.status})."
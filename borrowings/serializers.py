@@ -1,13 +1,18 @@
+from django.conf import settings
 from rest_framework import serializers
 from rest_framework.exceptions import ValidationError
 
+from books.models import Book
 from books.serializers import BookSerializer
-from borrowings.models import Borrowing
+from borrowings.helpers.reservations import has_ready_hold
+from borrowings.models import Borrowing, Reservation
 from django.utils import timezone
 
 from borrowings.validators import (
     validate_book_not_already_returned,
     validate_book_availability,
+    validate_book_out_of_stock,
+    validate_no_open_reservation,
     validate_non_past_return_date,
 )
 
@@ -27,6 +32,8 @@ class ReturnBorrowingSerializer(serializers.ModelSerializer):
 
 class BorrowingSerializer(serializers.ModelSerializer):
     book = serializers.CharField(source="book.title", read_only=True)
+    # Barcode of the copy handed out
+    copy = serializers.CharField(source="copy.barcode", read_only=True, allow_null=True)
 
     class Meta:
         model = Borrowing
@@ -34,15 +41,18 @@ class BorrowingSerializer(serializers.ModelSerializer):
             "id",
             "user",
             "book",
+            "copy",
             "borrow_date",
             "expected_return_date",
             "actual_return_date",
             "is_active",
+            "accrued_overdue_fee",
         )
         read_only_fields = (
             "user",
             "actual_return_date",
             "is_active",
+            "accrued_overdue_fee",
         )
 
 
@@ -69,12 +79,90 @@ class BorrowingCreateSerializer(serializers.ModelSerializer):
         )
 
     def validate(self, attrs):
-        validate_book_availability(
-            copies=attrs["book"].copies, error_to_raise=ValidationError
-        )
+        # A copy held for the user's reservation is not on the shelf
+        if not has_ready_hold(self.context["request"].user, attrs["book"]):
+            validate_book_availability(
+                copies=attrs["book"].available_copies, error_to_raise=ValidationError
+            )
         validate_non_past_return_date(
             borrow_date=timezone.localdate(),
             expected_return_date=attrs["expected_return_date"],
             error_to_raise=ValidationError,
         )
         return attrs
+
+
+class ReservationSerializer(serializers.ModelSerializer):
+    book_title = serializers.CharField(source="book.title", read_only=True)
+    position = serializers.IntegerField(read_only=True, allow_null=True)
+
+    class Meta:
+        model = Reservation
+        fields = (
+            "id",
+            "book",
+            "book_title",
+            "status",
+            "position",
+            "created_at",
+            "hold_expires_at",
+        )
+        read_only_fields = ("status", "created_at", "hold_expires_at")
+
+    def validate(self, attrs):
+        validate_book_out_of_stock(
+            copies=attrs["book"].available_copies, error_to_raise=ValidationError
+        )
+        validate_no_open_reservation(
+            has_open_reservation=Reservation.objects.filter(
+                user=self.context["request"].user,
+                book=attrs["book"],
+                status__in=Reservation.OPEN_STATUSES,
+            ).exists(),
+            error_to_raise=ValidationError,
+        )
+        return attrs
+
+
+class QuoteItemSerializer(serializers.Serializer):
+    book = serializers.IntegerField(min_value=1)
+    expected_return_date = serializers.DateField()
+
+
+class QuoteSerializer(serializers.Serializer):
+    items = serializers.ListField(child=QuoteItemSerializer(), allow_empty=False)
+
+    def validate_items(self, value: list) -> list:
+        if len(value) > settings.QUOTE_MAX_ITEMS:
+            raise ValidationError(
+                f"At most {settings.QUOTE_MAX_ITEMS} items per quote."
+            )
+
+        # Borrowings start today, checked once for the whole quote
+        today = timezone.localdate()
+        errors = {}
+        for index, item in enumerate(value):
+            try:
+                validate_non_past_return_date(
+                    borrow_date=today,
+                    expected_return_date=item["expected_return_date"],
+                    error_to_raise=ValidationError,
+                )
+            except ValidationError as error:
+                errors[index] = error.detail
+        if errors:
+            raise ValidationError(errors)
+        return value
+
+    def validate(self, attrs):
+        # Daily fees of all quoted books in one query
+        book_ids = {item["book"] for item in attrs["items"]}
+        attrs["daily_fees"] = dict(
+            Book.objects.filter(id__in=book_ids).values_list("id", "daily_fee")
+        )
+        unknown = sorted(book_ids - attrs["daily_fees"].keys())
+        if unknown:
+            raise ValidationError(
+                {"items": f"Books {', '.join(map(str, unknown))} do not exist."}
+            )
+        return attrs
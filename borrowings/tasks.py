@@ -1,12 +1,65 @@
-from celery import shared_task
+from datetime import date
+
+from celery import group, shared_task
+from django.utils import timezone
 
 from borrowings.helpers.expired_sessions import expired_sessions_check
-from borrowings.helpers.overdue_alert import send_overdue_alert_message
+from borrowings.helpers.fee_accrual import accrue_overdue_fees
+from borrowings.helpers.overdue_alert import (
+    enqueue_reminders_for_range,
+    plan_reminder_chunks,
+    send_no_overdue_message,
+)
+from borrowings.helpers.reservations import expire_holds
+from notifications.tasks import deliver_notifications_task
+
+
+@shared_task
+def send_overdue_alert_message_task() -> int:
+    """
+    Planner: splits users with due borrowings into id ranges and fans out
+    one worker task per range.
+    """
+    today = timezone.localdate()
+    # Reminders quote the fee ledger, so bring it up to date first
+    accrue_overdue_fees(today)
+    chunks = plan_reminder_chunks(today)
+
+    if not chunks:
+        send_no_overdue_message()
+        return 0
+
+    group(
+        send_reminders_chunk_task.s(first_id, last_id, today.isoformat())
+        for first_id, last_id in chunks
+    ).apply_async()
+    return len(chunks)
+
+
+@shared_task(
+    autoretry_for=(Exception,),
+    retry_backoff=True,
+    retry_kwargs={"max_retries": 5},
+)
+def send_reminders_chunk_task(first_user_id: int, last_user_id: int, today: str) -> int:
+    """
+    Queues reminder digests for a range of users and hands them to delivery workers.
+    """
+    queued = enqueue_reminders_for_range(
+        first_user_id, last_user_id, date.fromisoformat(today)
+    )
+    deliver_notifications_task.delay()
+    return queued
+
+
+@shared_task
+def accrue_overdue_fees_task() -> int:
+    return accrue_overdue_fees()
 
 
 @shared_task
-def send_overdue_alert_message_task() -> None:
-    send_overdue_alert_message()
+def expire_reservation_holds_task() -> int:
+    return expire_holds()
 
 
 @shared_task
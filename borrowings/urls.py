@@ -1,11 +1,12 @@
 from django.urls import path, include
 from rest_framework import routers
 
-from borrowings.views import BorrowingViewSet
+from borrowings.views import BorrowingViewSet, ReservationViewSet
 
 app_name = "borrowing"
 
 router = routers.DefaultRouter()
+router.register("reservations", ReservationViewSet)
 router.register("", BorrowingViewSet)
 
 
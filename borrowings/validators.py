@@ -28,3 +28,21 @@ def validate_non_past_return_date(
                 "expected_return_date": "Expected return date cannot be today or in the past."
             }
         )
+
+
+def validate_book_out_of_stock(copies: int, error_to_raise) -> None:
+    """
+    Validates that a book can be reserved only when no copies are available.
+    """
+    if copies > 0:
+        raise error_to_raise(
+            {"book": "This book is available, you can borrow it right away."}
+        )
+
+
+def validate_no_open_reservation(has_open_reservation: bool, error_to_raise) -> None:
+    """
+    Validates that the user is not already in the queue for the book.
+    """
+    if has_open_reservation:
+        raise error_to_raise({"book": "You have already reserved this book."})
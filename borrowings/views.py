@@ -1,36 +1,68 @@
 from decimal import Decimal
 
-import stripe
 from django.db import transaction
-from django.db.models import Q
+from django.db.models import Case, Count, F, OuterRef, Q, Subquery, Sum, Value, When
 from django.utils import timezone
-from drf_spectacular.utils import extend_schema, OpenApiParameter
-from rest_framework import viewsets, status, mixins
+from drf_spectacular.utils import (
+    extend_schema,
+    extend_schema_view,
+    inline_serializer,
+    OpenApiParameter,
+    OpenApiTypes,
+)
+from rest_framework import serializers, viewsets, status, mixins
 from rest_framework.decorators import action as action_decorator
-from rest_framework.permissions import IsAuthenticated
+from rest_framework.exceptions import ValidationError
+from rest_framework.permissions import IsAdminUser, IsAuthenticated
 from rest_framework.response import Response
 
-from books.models import Book
+from books.serializers import BookSerializer
 from borrowings.helpers.borrowing_calculations import (
     calculate_borrowing_price,
     calculate_overdue_fee,
+    quote_borrowing_prices,
 )
+from borrowings.helpers.fee_accrual import DaysBetween, overdue_fee_expression
 from borrowings.helpers.payment import create_checkout_session
+from borrowings.helpers.reservations import (
+    cancel_reservation,
+    claim_hold,
+    hand_over_copy,
+)
 from borrowings.helpers.telegram import send_message
-from borrowings.models import Borrowing
+from borrowings.models import Borrowing, Reservation
 from borrowings.serializers import (
     ReturnBorrowingSerializer,
     BorrowingCreateSerializer,
     BorrowingSerializer,
     BorrowingDetailSerializer,
+    ReservationSerializer,
+    QuoteSerializer,
+)
+from borrowings.validators import validate_book_availability
+from events.log import record_event
+from events.models import Event
+from idempotency.decorators import idempotent
+from library_service.conditional import ConditionalRetrieveMixin
+from library_service.db_routers import ReadReplicaMixin
+from library_service.fast_list import ValuesListMixin
+from library_service.sparse_fields import (
+    EXPAND_PARAMETER,
+    FIELDS_PARAMETER,
+    SparseFieldsMixin,
 )
-from library_service import settings
+from library_service.throttling import ScopedRateLimitThrottle
 from payments.models import Payment
 
-stripe.api_key = settings.STRIPE_SECRET_KEY
-
 
+@extend_schema_view(
+    retrieve=extend_schema(parameters=[FIELDS_PARAMETER, EXPAND_PARAMETER])
+)
 class BorrowingViewSet(
+    ReadReplicaMixin,
+    ConditionalRetrieveMixin,
+    SparseFieldsMixin,
+    ValuesListMixin,
     viewsets.GenericViewSet,
     mixins.ListModelMixin,
     mixins.CreateModelMixin,
@@ -38,6 +70,17 @@ class BorrowingViewSet(
 ):
     queryset = Borrowing.objects.all()
     permission_classes = [IsAuthenticated]
+    replica_actions = ("list", "retrieve", "overdue_summary", "overdue_projection")
+    # Quotes are POSTed but write nothing
+    read_only_actions = ("quote",)
+    # Every new borrowing opens a Stripe checkout session
+    throttle_classes = (ScopedRateLimitThrottle,)
+    throttle_scopes = {"create": "borrowing_create"}
+    # Lists show the book title, details nest the book
+    expandable_fields = {"book": (BookSerializer, ("book__availability",))}
+    collapsed_serializer_class = BorrowingSerializer
+
+    ordering_fields = ("id", "expected_return_date", "accrued_overdue_fee")
 
     @staticmethod
     def param_to_bool(param: str) -> bool:
@@ -49,12 +92,13 @@ class BorrowingViewSet(
     def get_queryset(self):
         user_id = self.request.query_params.get("user_id")
         is_active = self.request.query_params.get("is_active")
+        ordering = self.request.query_params.get("ordering")
 
         # Staff can view all borrowings, while customers can only see their own.
         queryset = (
-            Borrowing.objects.all().select_related("book", "user")
+            Borrowing.objects.all().select_related("book", "user", "copy")
             if self.request.user.is_staff
-            else Borrowing.objects.select_related("book", "user").filter(
+            else Borrowing.objects.select_related("book", "user", "copy").filter(
                 user=self.request.user
             )
         )
@@ -67,6 +111,15 @@ class BorrowingViewSet(
         if user_id and self.request.user.is_staff:
             queryset = queryset.filter(user_id=user_id)
 
+        # All logged-in users can order borrowings, e.g. by accrued overdue fee
+        if ordering and ordering.lstrip("-") in self.ordering_fields:
+            queryset = queryset.order_by(ordering, "id")
+
+        # Concurrent returns of a borrowing wait for each other, so only the
+        # first one sees it active and hands over its copy
+        if self.action == "return_book":
+            queryset = queryset.select_for_update(of=("self",))
+
         return queryset
 
     @extend_schema(
@@ -82,11 +135,27 @@ class BorrowingViewSet(
                 description="Filter by user_id "
                 "(This functionality available only for Staff)",
             ),
+            OpenApiParameter(
+                "ordering",
+                type=str,
+                description="Order by id, expected_return_date or accrued_overdue_fee. "
+                "Prefix with '-' for descending order.",
+            ),
+            FIELDS_PARAMETER,
+            EXPAND_PARAMETER,
         ]
     )
     def list(self, request, *args, **kwargs):
         return super().list(request, *args, **kwargs)
 
+    def get_version_lookups(self) -> list:
+        lookups = ["updated_at", "book__updated_at"]
+        # Nested books show the copies on the shelf, which change without
+        # touching the book row
+        if isinstance(self.get_serializer().fields.get("book"), BookSerializer):
+            lookups.append(Sum("book__availability__available"))
+        return lookups
+
     def get_serializer_class(self):
         if self.action == "create":
             return BorrowingCreateSerializer
@@ -94,8 +163,11 @@ class BorrowingViewSet(
             return ReturnBorrowingSerializer
         if self.action == "retrieve":
             return BorrowingDetailSerializer
+        if self.action == "quote":
+            return QuoteSerializer
         return BorrowingSerializer
 
+    @idempotent
     @transaction.atomic()
     def create(self, request, *args, **kwargs):
         user = self.request.user
@@ -128,12 +200,17 @@ class BorrowingViewSet(
         serializer = self.get_serializer(data=request.data)
         serializer.is_valid(raise_exception=True)
 
-        borrowing = serializer.save(user=user)
+        # A copy held for the user's reservation is already off the shelf,
+        # otherwise take one copy off the shelf
+        book = serializer.validated_data["book"]
+        reservation = claim_hold(user, book)
+        copy = reservation.copy if reservation else book.borrow_one_copy()
+        if reservation is None and copy is None:
+            # Other borrowers took the last copies after validation
+            validate_book_availability(copies=0, error_to_raise=ValidationError)
 
-        # Decrease the number of books in the library by one
-        book = Book.objects.get(pk=serializer.data["book"])
-        book.borrow_one_copy()
-        book.save()
+        borrowing = serializer.save(user=user, copy=copy)
+        record_event(Event.Type.BORROWING_CREATED, borrowing)
 
         # Creates Stripe checkout session and payment object in db
         stripe_checkout_session = create_checkout_session(
@@ -158,6 +235,7 @@ class BorrowingViewSet(
             status=status.HTTP_201_CREATED,
         )
 
+    @idempotent
     @transaction.atomic
     @action_decorator(
         methods=["POST"],
@@ -170,17 +248,19 @@ class BorrowingViewSet(
         serializer = self.get_serializer(borrowing, data=request.data)
         serializer.is_valid(raise_exception=True)
 
-        # Increase the number of books in the library by one
-        borrowing.book.return_one_copy()
-        borrowing.book.save()
+        # The copy goes to the head of the reservation queue or back on the shelf
+        hand_over_copy(borrowing.book_id, borrowing.copy_id)
 
         borrowing.actual_return_date = timezone.localdate()
         borrowing.is_active = False
 
-        serializer.save()
-
-        # Calculates overdue fee
+        # Calculates the final overdue fee and closes the fee ledger
         overdue_fee = calculate_overdue_fee(borrowing)
+        borrowing.accrued_overdue_fee = overdue_fee
+        borrowing.fee_accrued_on = borrowing.actual_return_date
+
+        serializer.save()
+        record_event(Event.Type.BORROWING_RETURNED, borrowing)
 
         response = Response(serializer.data, status=status.HTTP_200_OK)
 
@@ -189,7 +269,7 @@ class BorrowingViewSet(
             stripe_checkout_session = create_checkout_session(
                 request=self.request,
                 borrowing=borrowing,
-                amount_to_pay=calculate_overdue_fee(borrowing),
+                amount_to_pay=overdue_fee,
                 payment_type=Payment.PaymentType.OVERDUE_FEE_PAYMENT,
             )
 
@@ -208,3 +288,211 @@ class BorrowingViewSet(
         )
 
         return response
+
+    @action_decorator(
+        methods=["GET"],
+        detail=False,
+        permission_classes=[IsAdminUser],
+        url_path="overdue-summary",
+    )
+    def overdue_summary(self, request):
+        """
+        Totals of the accrued overdue fee ledger (available only for Staff).
+        """
+        summary = Borrowing.objects.filter(
+            is_active=True, accrued_overdue_fee__gt=0
+        ).aggregate(
+            overdue_borrowings=Count("id"),
+            accrued_overdue_fees=Sum("accrued_overdue_fee"),
+        )
+        summary["accrued_overdue_fees"] = summary["accrued_overdue_fees"] or Decimal(0)
+        return Response(summary, status=status.HTTP_200_OK)
+
+    @extend_schema(
+        responses=inline_serializer(
+            "BorrowingQuote",
+            {
+                "items": serializers.ListField(
+                    child=inline_serializer(
+                        "BorrowingQuoteItem",
+                        {
+                            "book": serializers.IntegerField(),
+                            "expected_return_date": serializers.DateField(),
+                            "days": serializers.IntegerField(),
+                            "price": serializers.DecimalField(
+                                max_digits=12, decimal_places=2
+                            ),
+                        },
+                    )
+                ),
+                "total": serializers.DecimalField(max_digits=14, decimal_places=2),
+            },
+        )
+    )
+    @action_decorator(
+        methods=["POST"],
+        detail=False,
+        permission_classes=[IsAuthenticated],
+        url_path="quote",
+    )
+    def quote(self, request):
+        """
+        Prices of borrowings starting today, for up to QUOTE_MAX_ITEMS
+        books and expected return dates, without borrowing anything.
+        """
+        serializer = self.get_serializer(data=request.data)
+        serializer.is_valid(raise_exception=True)
+        items = serializer.validated_data["items"]
+
+        today = timezone.localdate()
+        prices = quote_borrowing_prices(
+            items, serializer.validated_data["daily_fees"], today
+        )
+        return Response(
+            {
+                "items": [
+                    {
+                        "book": item["book"],
+                        "expected_return_date": item["expected_return_date"],
+                        "days": (item["expected_return_date"] - today).days,
+                        "price": price,
+                    }
+                    for item, price in zip(items, prices)
+                ],
+                "total": sum(prices, Decimal(0)),
+            },
+            status=status.HTTP_200_OK,
+        )
+
+    @extend_schema(
+        parameters=[
+            OpenApiParameter(
+                "on",
+                type=OpenApiTypes.DATE,
+                description="Date to project the overdue fees to, today by default.",
+            )
+        ],
+        responses=inline_serializer(
+            "OverdueProjection",
+            {
+                "on": serializers.DateField(),
+                "overdue_borrowings": serializers.IntegerField(),
+                "projected_overdue_fees": serializers.DecimalField(
+                    max_digits=14, decimal_places=2
+                ),
+                "borrowings": serializers.ListField(
+                    child=inline_serializer(
+                        "OverdueProjectionItem",
+                        {
+                            "id": serializers.IntegerField(),
+                            "user_id": serializers.IntegerField(),
+                            "book_id": serializers.IntegerField(),
+                            "expected_return_date": serializers.DateField(),
+                            "overdue_days": serializers.IntegerField(),
+                            "projected_fee": serializers.DecimalField(
+                                max_digits=10, decimal_places=2
+                            ),
+                        },
+                    )
+                ),
+            },
+        ),
+    )
+    @action_decorator(
+        methods=["GET"],
+        detail=False,
+        permission_classes=[IsAdminUser],
+        url_path="overdue-projection",
+    )
+    def overdue_projection(self, request):
+        """
+        Overdue fees every active borrowing will owe on `?on=` if it is not
+        returned by then, computed in one query (available only for Staff).
+        """
+        today = timezone.localdate()
+        on = serializers.DateField().run_validation(
+            request.query_params.get("on") or today
+        )
+        if on < today:
+            raise ValidationError({"on": "The date cannot be in the past."})
+
+        borrowings = list(
+            Borrowing.objects.filter(is_active=True, expected_return_date__lt=on)
+            .annotate(
+                overdue_days=DaysBetween(Value(on), F("expected_return_date")),
+                projected_fee=overdue_fee_expression(on),
+            )
+            .values(
+                "id",
+                "user_id",
+                "book_id",
+                "expected_return_date",
+                "overdue_days",
+                "projected_fee",
+            )
+        )
+        return Response(
+            {
+                "on": on,
+                "overdue_borrowings": len(borrowings),
+                "projected_overdue_fees": sum(
+                    (borrowing["projected_fee"] for borrowing in borrowings),
+                    Decimal(0),
+                ),
+                "borrowings": borrowings,
+            },
+            status=status.HTTP_200_OK,
+        )
+
+
+class ReservationViewSet(
+    viewsets.GenericViewSet,
+    mixins.ListModelMixin,
+    mixins.CreateModelMixin,
+    mixins.RetrieveModelMixin,
+    mixins.DestroyModelMixin,
+):
+    """
+    Hold queue for books without available copies. Users are notified
+    when a returned copy is held for them, so there is no need to poll the book.
+    """
+
+    queryset = Reservation.objects.all()
+    serializer_class = ReservationSerializer
+    permission_classes = [IsAuthenticated]
+
+    def get_queryset(self):
+        # Staff can view all reservations, while customers can only see their own.
+        queryset = Reservation.objects.select_related("book")
+        if not self.request.user.is_staff:
+            queryset = queryset.filter(user=self.request.user)
+
+        # Place in the queue, counted only for waiting reservations
+        waiting_ahead = (
+            Reservation.objects.filter(
+                book=OuterRef("book"),
+                status=Reservation.Status.WAITING,
+                id__lte=OuterRef("id"),
+            )
+            .order_by()
+            .values("book")
+            .annotate(count=Count("id"))
+            .values("count")
+        )
+        return queryset.annotate(
+            position=Case(
+                When(status=Reservation.Status.WAITING, then=Subquery(waiting_ahead)),
+                default=None,
+            )
+        )
+
+    def perform_create(self, serializer):
+        reservation = serializer.save(user=self.request.user)
+        reservation.position = Reservation.objects.filter(
+            book=reservation.book,
+            status=Reservation.Status.WAITING,
+            id__lte=reservation.id,
+        ).count()
+
+    def perform_destroy(self, instance):
+        cancel_reservation(instance)
@@ -0,0 +1,17 @@
+from django.contrib import admin
+
+from events.models import Event
+from library_service.admin import LargeTableAdmin
+
+
+@admin.register(Event)
+class EventAdmin(LargeTableAdmin):
+    list_display = ("id", "transaction_id", "type", "object_id", "created_at")
+    list_filter = ("type",)
+    search_fields = ("=object_id",)
+
+    def has_add_permission(self, request) -> bool:
+        return False
+
+    def has_change_permission(self, request, obj=None) -> bool:
+        return False
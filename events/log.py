@@ -0,0 +1,113 @@
+from decimal import Decimal
+
+from django.db import connection
+from django.db.models import DecimalField, Q
+from django.db.models.expressions import RawSQL
+
+from events.models import Event
+
+# Fields of the changed object in the event payload, besides the id
+PAYLOAD_FIELDS = {
+    "borrowing": (
+        "user_id",
+        "book_id",
+        "copy_id",
+        "borrow_date",
+        "expected_return_date",
+        "actual_return_date",
+        "is_active",
+        "accrued_overdue_fee",
+    ),
+    "payment": ("borrowing_id", "payment_status", "payment_type", "amount_to_pay"),
+}
+
+# Oldest transaction still running, events of younger ones may not be visible yet
+SNAPSHOT_XMIN = "pg_snapshot_xmin(pg_current_snapshot())::text::bigint"
+
+
+def payload_value(instance, name: str):
+    value = getattr(instance, name)
+    field = instance._meta.get_field(name)
+    if isinstance(field, DecimalField) and value is not None:
+        # Unsaved defaults like 0 are written the way the database returns them
+        value = Decimal(value).quantize(Decimal(1).scaleb(-field.decimal_places))
+    return value
+
+
+def payload_of(instance) -> dict:
+    fields = PAYLOAD_FIELDS[instance._meta.model_name]
+    return {
+        "id": instance.pk,
+        **{field: payload_value(instance, field) for field in fields},
+    }
+
+
+def record_event(event_type: str, instance) -> None:
+    """
+    Appends an event for `instance` in the current transaction.
+    """
+    Event.objects.create(
+        type=event_type, object_id=instance.pk, payload=payload_of(instance)
+    )
+
+
+def record_events(event_type: str, queryset) -> None:
+    """
+    Appends an event for every object of `queryset` with two queries.
+    """
+    fields = PAYLOAD_FIELDS[queryset.model._meta.model_name]
+    Event.objects.bulk_create(
+        Event(type=event_type, object_id=payload["id"], payload=payload)
+        for payload in queryset.order_by("id").values("id", *fields)
+    )
+
+
+def format_cursor(transaction_id: int, event_id: int) -> str:
+    return f"{transaction_id}:{event_id}"
+
+
+def parse_cursor(cursor: str | None) -> tuple[int, int]:
+    """
+    An empty cursor starts at the first event.
+    """
+    if not cursor:
+        return 0, 0
+    try:
+        transaction_id, event_id = map(int, cursor.split(":"))
+    except ValueError:
+        raise ValueError(f"Invalid cursor {cursor!r}.")
+    return transaction_id, event_id
+
+
+def read_events(cursor: str | None, limit: int) -> tuple[list[dict], str]:
+    """
+    Up to `limit` events after `cursor` and the cursor to continue from.
+
+    On PostgreSQL only events of transactions older than every running one
+    are returned, so an event committed later never lands behind a cursor
+    that was already handed out.
+    """
+    transaction_id, event_id = parse_cursor(cursor)
+    queryset = Event.objects.filter(transaction_id__gte=transaction_id).filter(
+        Q(transaction_id__gt=transaction_id) | Q(id__gt=event_id)
+    )
+    if connection.vendor == "postgresql":
+        queryset = queryset.filter(transaction_id__lt=RawSQL(SNAPSHOT_XMIN, ()))
+
+    rows = queryset.values_list(
+        "transaction_id", "id", "type", "object_id", "payload", "created_at"
+    )[:limit]
+    events = [
+        {
+            "cursor": format_cursor(row[0], row[1]),
+            "id": row[1],
+            "type": row[2],
+            "object_id": row[3],
+            "payload": row[4],
+            "created_at": row[5],
+        }
+        for row in rows
+    ]
+    if not events:
+        return events, format_cursor(transaction_id, event_id)
+    return events, events[-1]["cursor"]
@@ -0,0 +1,55 @@
+import json
+import time
+
+from django.conf import settings
+from django.core.management.base import BaseCommand, CommandError
+from django.core.serializers.json import DjangoJSONEncoder
+
+from events.log import read_events
+
+
+class Command(BaseCommand):
+    """Django command to stream the event log to stdout as JSON lines."""
+
+    help = (
+        "Writes the events after --cursor to stdout, one JSON object per line, "
+        "and the cursor to resume from to stderr."
+    )
+
+    def add_arguments(self, parser) -> None:
+        parser.add_argument("--cursor", default="")
+        parser.add_argument(
+            "--batch-size", type=int, default=settings.EVENTS_MAX_PAGE_SIZE
+        )
+        parser.add_argument(
+            "--follow",
+            action="store_true",
+            help="Keep waiting for new events instead of exiting at the end.",
+        )
+        parser.add_argument(
+            "--poll-interval",
+            type=float,
+            default=1.0,
+            help="Seconds between reads when --follow has caught up.",
+        )
+
+    def handle(self, *args, **options) -> None:
+        if options["batch_size"] <= 0:
+            raise CommandError("--batch-size must be positive.")
+
+        cursor = options["cursor"]
+        try:
+            while True:
+                events, cursor = read_events(cursor, options["batch_size"])
+                for event in events:
+                    self.stdout.write(json.dumps(event, cls=DjangoJSONEncoder))
+                if len(events) < options["batch_size"]:
+                    if not options["follow"]:
+                        break
+                    time.sleep(options["poll_interval"])
+        except ValueError as error:
+            raise CommandError(error)
+        except KeyboardInterrupt:
+            pass
+        finally:
+            self.stderr.write(f"Next cursor: {cursor}")
@@ -0,0 +1,62 @@
+# Generated by Django 5.1.1 on 2026-10-19 16:50
+
+import django.core.serializers.json
+import django.db.models.functions.datetime
+import events.models
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    initial = True
+
+    dependencies = []
+
+    operations = [
+        migrations.CreateModel(
+            name="Event",
+            fields=[
+                ("id", models.BigAutoField(primary_key=True, serialize=False)),
+                (
+                    "transaction_id",
+                    models.PositiveBigIntegerField(
+                        db_default=events.models.CurrentTransactionId()
+                    ),
+                ),
+                (
+                    "type",
+                    models.CharField(
+                        choices=[
+                            ("borrowing.created", "Borrowing Created"),
+                            ("borrowing.returned", "Borrowing Returned"),
+                            ("payment.created", "Payment Created"),
+                            ("payment.paid", "Payment Paid"),
+                            ("payment.expired", "Payment Expired"),
+                        ],
+                        max_length=30,
+                    ),
+                ),
+                ("object_id", models.PositiveBigIntegerField()),
+                (
+                    "payload",
+                    models.JSONField(
+                        encoder=django.core.serializers.json.DjangoJSONEncoder
+                    ),
+                ),
+                (
+                    "created_at",
+                    models.DateTimeField(
+                        db_default=django.db.models.functions.datetime.Now()
+                    ),
+                ),
+            ],
+            options={
+                "ordering": ("transaction_id", "id"),
+                "indexes": [
+                    models.Index(
+                        fields=["transaction_id", "id"], name="event_position_idx"
+                    )
+                ],
+            },
+        ),
+    ]
@@ -0,0 +1,52 @@
+from django.core.serializers.json import DjangoJSONEncoder
+from django.db import models
+from django.db.models.functions import Now
+
+
+class CurrentTransactionId(models.Func):
+    """
+    Id of the writing transaction on PostgreSQL. SQLite runs one writer at a
+    time, so commit order is insertion order and the id is always 0.
+    """
+
+    output_field = models.PositiveBigIntegerField()
+
+    def as_sql(self, compiler, connection, **extra_context):
+        return "0", []
+
+    def as_postgresql(self, compiler, connection, **extra_context):
+        return "(pg_current_xact_id()::text::bigint)", []
+
+
+class Event(models.Model):
+    """
+    Append-only log of borrowing and payment changes, written in the
+    transaction of the change.
+
+    Events are read in (transaction_id, id) order: ids are handed out before
+    commit, so a later id can commit first, while a transaction's events only
+    become readable once every older transaction has finished.
+    """
+
+    class Type(models.TextChoices):
+        BORROWING_CREATED = "borrowing.created"
+        BORROWING_RETURNED = "borrowing.returned"
+        PAYMENT_CREATED = "payment.created"
+        PAYMENT_PAID = "payment.paid"
+        PAYMENT_EXPIRED = "payment.expired"
+
+    id = models.BigAutoField(primary_key=True)
+    transaction_id = models.PositiveBigIntegerField(db_default=CurrentTransactionId())
+    type = models.CharField(max_length=30, choices=Type.choices)
+    object_id = models.PositiveBigIntegerField()
+    payload = models.JSONField(encoder=DjangoJSONEncoder)
+    created_at = models.DateTimeField(db_default=Now())
+
+    class Meta:
+        indexes = [
+            models.Index(fields=["transaction_id", "id"], name="event_position_idx"),
+        ]
+        ordering = ("transaction_id", "id")
+
+    def __str__(self):
+        return f"{self.type} {self.object_id}"
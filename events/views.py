@@ -0,0 +1,56 @@
+from django.conf import settings
+from drf_spectacular.utils import OpenApiParameter, extend_schema, inline_serializer
+from rest_framework import serializers
+from rest_framework.exceptions import ValidationError
+from rest_framework.permissions import IsAdminUser
+from rest_framework.response import Response
+from rest_framework.views import APIView
+
+from events.log import read_events
+
+
+class EventListView(APIView):
+    """
+    Borrowing and payment changes after `?cursor=`, oldest first. Consumers
+    store `next_cursor` and pass it to the next request.
+    """
+
+    permission_classes = (IsAdminUser,)
+
+    @extend_schema(
+        parameters=[
+            OpenApiParameter(
+                "cursor",
+                type=str,
+                description="next_cursor of the previous page, empty for the "
+                "first event.",
+            ),
+            OpenApiParameter(
+                "limit",
+                type=int,
+                description=f"Events per page, at most {settings.EVENTS_MAX_PAGE_SIZE}.",
+            ),
+        ],
+        responses=inline_serializer(
+            "EventPage",
+            {
+                "events": serializers.ListField(child=serializers.JSONField()),
+                "next_cursor": serializers.CharField(),
+            },
+        ),
+    )
+    def get(self, request):
+        try:
+            limit = int(request.query_params.get("limit", settings.EVENTS_PAGE_SIZE))
+        except ValueError:
+            raise ValidationError({"limit": "Must be an integer."})
+        if not 0 < limit <= settings.EVENTS_MAX_PAGE_SIZE:
+            raise ValidationError(
+                {"limit": f"Must be between 1 and {settings.EVENTS_MAX_PAGE_SIZE}."}
+            )
+
+        try:
+            events, next_cursor = read_events(request.query_params.get("cursor"), limit)
+        except ValueError as error:
+            raise ValidationError({"cursor": str(error)})
+        return Response({"events": events, "next_cursor": next_cursor})
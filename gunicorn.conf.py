@@ -0,0 +1,42 @@
+"""
+Gunicorn settings of the production server:
+
+    gunicorn -c gunicorn.conf.py library_service.wsgi
+
+Every value can be overridden with the GUNICORN_* environment variables.
+"""
+
+import multiprocessing
+import os
+
+bind = os.getenv("GUNICORN_BIND", "0.0.0.0:8000")
+
+# Requests mostly wait on the database, Stripe and Telegram, so every worker
+# process serves several of them at once with threads
+worker_class = "gthread"
+workers = int(os.getenv("GUNICORN_WORKERS", multiprocessing.cpu_count() * 2 + 1))
+threads = int(os.getenv("GUNICORN_THREADS", 4))
+
+# One pooled database connection per thread
+os.environ.setdefault("DB_POOL_MAX_SIZE", str(threads))
+
+# The production server never runs in debug mode unless asked to
+os.environ.setdefault("DEBUG", "False")
+
+# Django is imported once in the master process and the workers share its
+# memory copy-on-write. Connections are opened lazily, so none are inherited.
+preload_app = True
+
+# On HUP or TERM workers finish their in-flight requests before exiting
+graceful_timeout = int(os.getenv("GUNICORN_GRACEFUL_TIMEOUT", 30))
+timeout = int(os.getenv("GUNICORN_TIMEOUT", 60))
+
+# Restart workers now and then to cap memory growth, not all at the same time
+max_requests = int(os.getenv("GUNICORN_MAX_REQUESTS", 1000))
+max_requests_jitter = max_requests // 10
+
+# Heartbeat files in memory: a slow disk must not make workers look dead
+if os.path.isdir("/dev/shm"):
+    worker_tmp_dir = "/dev/shm"
+
+accesslog = "-"
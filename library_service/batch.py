@@ -0,0 +1,118 @@
+from urllib.parse import urlsplit
+
+from django.conf import settings
+from django.http import HttpRequest, QueryDict
+from django.urls import Resolver404, resolve
+from drf_spectacular.utils import extend_schema, inline_serializer
+from rest_framework import serializers, status
+from rest_framework.response import Response
+from rest_framework.views import APIView
+
+# Headers of the batch request that don't apply to its sub-requests
+SKIPPED_HEADERS = ("CONTENT_LENGTH", "CONTENT_TYPE", "HTTP_IDEMPOTENCY_KEY")
+
+
+class BatchRequestSerializer(serializers.Serializer):
+    method = serializers.ChoiceField(choices=("GET",), default="GET")
+    path = serializers.CharField()
+
+    def validate_path(self, value: str) -> str:
+        url = urlsplit(value)
+        if url.scheme or url.netloc or not url.path.startswith("/api/"):
+            raise serializers.ValidationError("Only /api/ paths can be batched.")
+        if url.path == self.context["batch_path"]:
+            raise serializers.ValidationError("Batches can't be nested.")
+        return value
+
+
+class BatchSerializer(serializers.Serializer):
+    requests = serializers.ListField(child=BatchRequestSerializer(), allow_empty=False)
+
+    def validate_requests(self, value: list) -> list:
+        if len(value) > settings.BATCH_MAX_REQUESTS:
+            raise serializers.ValidationError(
+                f"At most {settings.BATCH_MAX_REQUESTS} requests per batch."
+            )
+        return value
+
+
+def sub_request(request, path: str) -> HttpRequest:
+    """
+    A GET request for `path` with the batch request's headers and user.
+    An authenticated user is passed on as it is, so sub-requests don't check
+    the token and load the user again.
+    """
+    url = urlsplit(path)
+    sub = HttpRequest()
+    sub.method = "GET"
+    sub.path = sub.path_info = url.path
+    sub.META = {
+        key: value
+        for key, value in request.META.items()
+        if key not in SKIPPED_HEADERS and not key.startswith("HTTP_IF_")
+    }
+    sub.META.update(REQUEST_METHOD="GET", PATH_INFO=url.path, QUERY_STRING=url.query)
+    sub.GET = QueryDict(url.query)
+    sub.user = request.user
+    if request.user.is_authenticated:
+        sub._force_auth_user = request.user
+        sub._force_auth_token = request.auth
+    return sub
+
+
+def run_sub_request(request, path: str) -> tuple[int, object]:
+    try:
+        match = resolve(urlsplit(path).path)
+    except Resolver404:
+        return status.HTTP_404_NOT_FOUND, {"detail": "Not found."}
+    if not issubclass(getattr(match.func, "cls", object), APIView):
+        return status.HTTP_400_BAD_REQUEST, {"detail": "Not an API endpoint."}
+
+    sub = sub_request(request, path)
+    sub.resolver_match = match
+    response = match.func(sub, *match.args, **match.kwargs)
+    return response.status_code, response.data
+
+
+class BatchView(APIView):
+    """
+    Runs up to BATCH_MAX_REQUESTS GET requests to other API endpoints in one
+    round trip. Each sub-request goes through its view's permissions and
+    throttling as the batch request's user. Identical paths run once.
+    """
+
+    permission_classes = ()
+
+    @extend_schema(
+        request=BatchSerializer,
+        responses=inline_serializer(
+            "BatchResponse",
+            {
+                "responses": serializers.ListField(
+                    child=inline_serializer(
+                        "BatchSubResponse",
+                        {
+                            "path": serializers.CharField(),
+                            "status": serializers.IntegerField(),
+                            "body": serializers.JSONField(),
+                        },
+                    )
+                )
+            },
+        ),
+    )
+    def post(self, request, *args, **kwargs):
+        serializer = BatchSerializer(
+            data=request.data, context={"batch_path": request.path}
+        )
+        serializer.is_valid(raise_exception=True)
+
+        results = {}
+        responses = []
+        for sub in serializer.validated_data["requests"]:
+            path = sub["path"]
+            if path not in results:
+                results[path] = run_sub_request(request, path)
+            code, body = results[path]
+            responses.append({"path": path, "status": code, "body": body})
+        return Response({"responses": responses})
@@ -0,0 +1,146 @@
+import gzip
+import re
+import secrets
+import zlib
+
+from django.conf import settings
+from django.utils.cache import patch_vary_headers
+from django.utils.deprecation import MiddlewareMixin
+
+try:
+    import brotli
+except ImportError:  # Brotli is optional, gzip is always available
+    brotli = None
+
+COMPRESSIBLE_TYPES = re.compile(
+    r"^(application/(json|javascript|xml|vnd\.oai\.openapi.*|.*\+json)|text/.*)"
+)
+
+# Compressed bodies get up to this many random bytes of padding, like in
+# GZipMiddleware, so their length does not leak secrets next to reflected
+# input (BREACH)
+MAX_RANDOM_BYTES = 100
+
+
+def accepts(request, encoding: str) -> bool:
+    """
+    Whether Accept-Encoding lists `encoding` without `q=0`.
+    """
+    for part in request.headers.get("Accept-Encoding", "").split(","):
+        name, _, params = part.strip().partition(";")
+        if name.strip().lower() == encoding:
+            return not re.fullmatch(r"\s*q=0(\.0*)?\s*", params)
+    return False
+
+
+def pad_gzip(data: bytes) -> bytes:
+    """
+    Stores random padding as the file name in the gzip header, which
+    decoders skip.
+    """
+    header = bytearray(data[:10])
+    header[3] = gzip.FNAME
+    padding = b"a" * secrets.randbelow(MAX_RANDOM_BYTES)
+    return bytes(header) + padding + b"\x00" + data[10:]
+
+
+def brotli_padding() -> bytes:
+    """
+    Metadata meta-block of random length, which decoders skip. It must start
+    on a byte boundary, right after a flush of the compressor.
+    """
+    skip = secrets.randbelow(MAX_RANDOM_BYTES)
+    # ISLAST 0, MNIBBLES 0 (metadata), reserved 0, MSKIPBYTES 1, MSKIPLEN - 1
+    header = 0b010110 | skip << 6
+    return header.to_bytes(2, "little") + b"a" * (skip + 1)
+
+
+def compress(encoding: str, content: bytes) -> bytes:
+    if encoding == "br":
+        compressor = brotli.Compressor(quality=settings.BROTLI_QUALITY)
+        return (
+            compressor.process(content)
+            + compressor.flush()
+            + brotli_padding()
+            + compressor.finish()
+        )
+    return pad_gzip(gzip.compress(content, compresslevel=settings.GZIP_LEVEL, mtime=0))
+
+
+def compress_stream(encoding: str, chunks):
+    """
+    Compresses a streaming response chunk by chunk. Every chunk is flushed,
+    so clients receive rows of an export as they are produced.
+    """
+    if encoding == "br":
+        compressor = brotli.Compressor(quality=settings.BROTLI_QUALITY)
+        for chunk in chunks:
+            yield compressor.process(chunk) + compressor.flush()
+        yield compressor.flush() + brotli_padding() + compressor.finish()
+        return
+
+    # wbits 31 writes the gzip header and trailer
+    compressor = zlib.compressobj(settings.GZIP_LEVEL, zlib.DEFLATED, 31)
+    # The gzip header comes with the first output, which gets the padding
+    first = True
+    for chunk in chunks:
+        data = compressor.compress(chunk) + compressor.flush(zlib.Z_SYNC_FLUSH)
+        yield pad_gzip(data) if first else data
+        first = False
+    data = compressor.flush()
+    yield pad_gzip(data) if first else data
+
+
+class CompressionMiddleware(MiddlewareMixin):
+    """
+    Compresses JSON, text and schema responses with Brotli when the client
+    and the server support it, gzip otherwise. Responses smaller than
+    COMPRESSION_MIN_SIZE bytes are sent as they are, the CPU is better spent
+    elsewhere. Streaming responses are compressed on the fly.
+    """
+
+    def choose_encoding(self, request) -> str | None:
+        if brotli is not None and accepts(request, "br"):
+            return "br"
+        if accepts(request, "gzip"):
+            return "gzip"
+        return None
+
+    def process_response(self, request, response):
+        if (
+            response.has_header("Content-Encoding")
+            or not COMPRESSIBLE_TYPES.match(response.get("Content-Type", ""))
+            or (
+                not response.streaming
+                and len(response.content) < settings.COMPRESSION_MIN_SIZE
+            )
+        ):
+            return response
+
+        patch_vary_headers(response, ("Accept-Encoding",))
+        encoding = self.choose_encoding(request)
+        if encoding is None:
+            return response
+
+        if response.streaming:
+            if response.is_async:
+                # Async iterators are left to the ASGI server
+                return response
+            response.streaming_content = compress_stream(
+                encoding, response.streaming_content
+            )
+            del response.headers["Content-Length"]
+        else:
+            compressed = compress(encoding, response.content)
+            if len(compressed) >= len(response.content):
+                return response
+            response.content = compressed
+            response.headers["Content-Length"] = str(len(compressed))
+
+        # The compressed body is a different representation, like in
+        # GZipMiddleware strong ETags become weak
+        etag = response.get("ETag")
+        if etag and etag.startswith('"'):
+            response.headers["ETag"] = "W/" + etag
+        response.headers["Content-Encoding"] = encoding
+        return response
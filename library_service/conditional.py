@@ -0,0 +1,79 @@
+import hashlib
+from datetime import datetime
+
+from django.db.models import F
+from django.utils.cache import get_conditional_response
+from django.utils.http import http_date, quote_etag
+from rest_framework.response import Response
+
+CONDITIONAL_HEADERS = ("If-None-Match", "If-Modified-Since")
+
+
+class ConditionalRetrieveMixin:
+    """
+    Answers retrieve requests with `If-None-Match` or `If-Modified-Since`
+    from a single query of the object's version columns, before loading and
+    serializing it. Other responses get the `ETag` and `Last-Modified`
+    validators, read along with the object.
+
+    `get_version_lookups()` must cover everything the representation shows.
+    Last-Modified is only sent when all version values are timestamps.
+    """
+
+    def get_version_lookups(self) -> list:
+        return ["updated_at"]
+
+    def version_annotations(self) -> dict:
+        return {
+            f"version_{index}": F(lookup) if isinstance(lookup, str) else lookup
+            for index, lookup in enumerate(self.get_version_lookups())
+        }
+
+    def filter_queryset(self, queryset):
+        queryset = super().filter_queryset(queryset)
+        if self.action == "retrieve":
+            queryset = queryset.annotate(**self.version_annotations())
+        return queryset
+
+    def get_version(self, **kwargs) -> tuple | None:
+        lookup_url_kwarg = self.lookup_url_kwarg or self.lookup_field
+        return (
+            self.filter_queryset(self.get_queryset())
+            .filter(**{self.lookup_field: kwargs[lookup_url_kwarg]})
+            .values_list(*self.version_annotations())
+            .first()
+        )
+
+    def get_validators(self, request, version: tuple) -> dict:
+        # The representation also depends on ?fields=, ?expand= and the format
+        validator = repr(
+            (version, request.get_full_path(), request.accepted_media_type)
+        )
+        return {
+            "etag": quote_etag(hashlib.sha256(validator.encode()).hexdigest()[:32]),
+            "last_modified": (
+                int(max(version).timestamp())
+                if all(isinstance(value, datetime) for value in version)
+                else None
+            ),
+        }
+
+    def set_validators(self, response, validators: dict):
+        response["ETag"] = validators["etag"]
+        if validators["last_modified"] is not None:
+            response["Last-Modified"] = http_date(validators["last_modified"])
+        return response
+
+    def retrieve(self, request, *args, **kwargs):
+        if any(header in request.headers for header in CONDITIONAL_HEADERS):
+            version = self.get_version(**kwargs)
+            if version is not None:
+                validators = self.get_validators(request, version)
+                response = get_conditional_response(request, **validators)
+                if response is not None:
+                    return self.set_validators(response, validators)
+
+        instance = self.get_object()
+        version = tuple(getattr(instance, name) for name in self.version_annotations())
+        response = Response(self.get_serializer(instance).data)
+        return self.set_validators(response, self.get_validators(request, version))
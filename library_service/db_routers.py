@@ -0,0 +1,95 @@
+import random
+from contextlib import contextmanager
+from contextvars import ContextVar
+
+from django.conf import settings
+from django.core.cache import cache
+from rest_framework.permissions import SAFE_METHODS
+
+_read_from_replica = ContextVar("read_from_replica", default=False)
+
+
+@contextmanager
+def replica_reads():
+    """
+    Routes reads inside the block to a read replica, if any is configured.
+    """
+    token = _read_from_replica.set(True)
+    try:
+        yield
+    finally:
+        _read_from_replica.reset(token)
+
+
+def pin_key(user) -> str:
+    return f"primary-pin:{user.pk}"
+
+
+def pin_to_primary(user) -> None:
+    """
+    Keeps the user's reads on primary until replicas have caught up
+    with the user's own write.
+    """
+    if user.is_authenticated and settings.DATABASE_REPLICAS:
+        cache.set(pin_key(user), True, timeout=settings.REPLICA_STICKY_SECONDS)
+
+
+def is_pinned_to_primary(user) -> bool:
+    return user.is_authenticated and cache.get(pin_key(user), False)
+
+
+class ReplicaRouter:
+    """
+    Reads go to a random replica inside `replica_reads()`, everything else
+    (writes, migrations, Celery tasks) stays on the primary database.
+    """
+
+    def db_for_read(self, model, **hints):
+        if _read_from_replica.get() and settings.DATABASE_REPLICAS:
+            return random.choice(settings.DATABASE_REPLICAS)
+        return None
+
+    def db_for_write(self, model, **hints):
+        return "default"
+
+    def allow_relation(self, obj1, obj2, **hints):
+        return True
+
+    def allow_migrate(self, db, app_label, model_name=None, **hints):
+        return db not in settings.DATABASE_REPLICAS
+
+
+class ReadReplicaMixin:
+    """
+    Serves safe requests of `replica_actions` from the read replicas.
+
+    A successful write through the view pins the user to primary for
+    REPLICA_STICKY_SECONDS, so users always read their own writes. Unsafe
+    requests of `read_only_actions` write nothing and don't pin.
+    """
+
+    replica_actions = ("list", "retrieve")
+    read_only_actions = ()
+
+    def initial(self, request, *args, **kwargs):
+        super().initial(request, *args, **kwargs)
+        self._replica_token = None
+        if (
+            request.method in SAFE_METHODS
+            and self.action in self.replica_actions
+            and not is_pinned_to_primary(request.user)
+        ):
+            self._replica_token = _read_from_replica.set(True)
+
+    def finalize_response(self, request, response, *args, **kwargs):
+        token = getattr(self, "_replica_token", None)
+        if token is not None:
+            _read_from_replica.reset(token)
+            self._replica_token = None
+        elif (
+            request.method not in SAFE_METHODS
+            and response.status_code < 400
+            and getattr(self, "action", None) not in self.read_only_actions
+        ):
+            pin_to_primary(request.user)
+        return super().finalize_response(request, response, *args, **kwargs)
@@ -0,0 +1,76 @@
+from django.core.exceptions import ImproperlyConfigured
+from rest_framework import serializers
+from rest_framework.response import Response
+
+
+def value_converters(serializer, lookups: dict) -> list:
+    """
+    (output name, values() lookup, converter) for every field of the
+    serializer. Converters are the fields' own `to_representation`, so the
+    output is the serializer's.
+    """
+    columns = []
+    for name, field in serializer.fields.items():
+        if field.write_only:
+            continue
+        if isinstance(
+            field,
+            (
+                serializers.BaseSerializer,
+                serializers.SerializerMethodField,
+                serializers.ManyRelatedField,
+            ),
+        ) or (field.source == "*" and name not in lookups):
+            raise ImproperlyConfigured(
+                f"{type(serializer).__name__}.{name} can't be read from values()."
+            )
+        # values() returns the primary key of a foreign key
+        convert = (
+            None
+            if isinstance(field, serializers.PrimaryKeyRelatedField)
+            else field.to_representation
+        )
+        columns.append(
+            (name, lookups.get(name, "__".join(field.source_attrs)), convert)
+        )
+    return columns
+
+
+class ValuesListMixin:
+    """
+    Lists rows straight from a `.values()` query of the output columns,
+    without model instances and per-row serializer binding. The rows are
+    converted by the list serializer's field classes, so responses are the
+    same as the serializer's.
+
+    `list_lookups` maps output fields to lookups for fields whose source is
+    not a column path, such as properties backed by an annotation.
+    """
+
+    list_from_values = True
+    list_lookups = {}
+
+    def list(self, request, *args, **kwargs):
+        serializer = self.get_serializer()
+        # Expanded relations are nested serializers, they need model instances
+        if not self.list_from_values or any(
+            isinstance(field, serializers.BaseSerializer)
+            for field in serializer.fields.values()
+        ):
+            return super().list(request, *args, **kwargs)
+
+        columns = value_converters(serializer, self.list_lookups)
+        queryset = self.filter_queryset(self.get_queryset()).values_list(
+            *(lookup for _, lookup, _ in columns)
+        )
+        page = self.paginate_queryset(queryset)
+        rows = [
+            {
+                name: (value if value is None or convert is None else convert(value))
+                for (name, _, convert), value in zip(columns, row)
+            }
+            for row in (queryset if page is None else page)
+        ]
+        if page is None:
+            return Response(rows)
+        return self.get_paginated_response(rows)
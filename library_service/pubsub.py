@@ -0,0 +1,156 @@
+import asyncio
+import json
+import logging
+import threading
+import time
+from functools import cache
+
+from django.conf import settings
+from django.utils.module_loading import import_string
+
+logger = logging.getLogger(__name__)
+
+
+class Subscription:
+    """
+    Changes of the subscribed topics for one listener in an event loop.
+
+    Changes that arrive before the listener reads them are merged, the latest
+    value of a topic wins, so a slow client never buffers more than one value
+    per topic.
+    """
+
+    def __init__(self, hub, topics: set):
+        self.hub = hub
+        self.topics = frozenset(topics)
+        self.loop = asyncio.get_running_loop()
+        self.pending = {}
+        self.ready = asyncio.Event()
+
+    def push(self, changes: dict) -> None:
+        # Runs in the subscriber's event loop
+        self.pending.update(changes)
+        self.ready.set()
+
+    async def get(self, timeout: float = None) -> dict:
+        """
+        Waits for changes, returns an empty dict after `timeout` seconds.
+        """
+        try:
+            await asyncio.wait_for(self.ready.wait(), timeout)
+        except asyncio.TimeoutError:
+            return {}
+        self.ready.clear()
+        changes, self.pending = self.pending, {}
+        return changes
+
+    def close(self) -> None:
+        self.hub.unsubscribe(self)
+
+
+class Hub:
+    """
+    Fans messages out to the subscriptions of this process. Messages are
+    dicts keyed by topic, a subscription only gets its own topics.
+    """
+
+    def __init__(self):
+        self.lock = threading.Lock()
+        self.subscriptions = set()
+
+    def subscribe(self, topics: set) -> Subscription:
+        subscription = Subscription(self, topics)
+        with self.lock:
+            self.subscriptions.add(subscription)
+        return subscription
+
+    def unsubscribe(self, subscription: Subscription) -> None:
+        with self.lock:
+            self.subscriptions.discard(subscription)
+
+    def dispatch(self, message: dict) -> None:
+        """
+        Hands the message to the subscriptions, from any thread.
+        """
+        with self.lock:
+            subscriptions = list(self.subscriptions)
+        for subscription in subscriptions:
+            changes = {
+                topic: value
+                for topic, value in message.items()
+                if topic in subscription.topics
+            }
+            if changes:
+                try:
+                    subscription.loop.call_soon_threadsafe(subscription.push, changes)
+                except RuntimeError:
+                    # The subscriber's loop is closed
+                    self.unsubscribe(subscription)
+
+
+class LocMemPubSubBackend:
+    """
+    Delivers messages to subscribers of the publishing process only, so it
+    is meant for development, tests and single-process deployments.
+    """
+
+    def __init__(self, channel: str):
+        self.channel = channel
+        self.hub = Hub()
+
+    def publish(self, message: dict) -> None:
+        self.hub.dispatch(message)
+
+    def subscribe(self, topics: set) -> Subscription:
+        return self.hub.subscribe(topics)
+
+
+class RedisPubSubBackend:
+    """
+    Publishes messages to a Redis channel, shared by all app processes.
+
+    Every process listens to the channel with one connection and one thread,
+    however many clients are subscribed, and fans messages out locally.
+    """
+
+    def __init__(self, channel: str, url: str = None):
+        import redis
+
+        self.channel = channel
+        self.client = redis.Redis.from_url(url or settings.PUBSUB_REDIS_URL)
+        self.errors = redis.RedisError
+        self.hub = Hub()
+        self.listener = None
+        self.lock = threading.Lock()
+
+    def publish(self, message: dict) -> None:
+        try:
+            self.client.publish(self.channel, json.dumps(message))
+        except self.errors:
+            # Subscribers miss this change, the API itself must keep working
+            logger.warning("Publishing to %s failed", self.channel)
+
+    def subscribe(self, topics: set) -> Subscription:
+        with self.lock:
+            if self.listener is None:
+                self.listener = threading.Thread(
+                    target=self.listen, name=f"pubsub-{self.channel}", daemon=True
+                )
+                self.listener.start()
+        return self.hub.subscribe(topics)
+
+    def listen(self) -> None:
+        while True:
+            try:
+                pubsub = self.client.pubsub(ignore_subscribe_messages=True)
+                pubsub.subscribe(self.channel)
+                for message in pubsub.listen():
+                    self.hub.dispatch(json.loads(message["data"]))
+            except self.errors:
+                logger.warning("Lost the %s subscription, reconnecting", self.channel)
+                time.sleep(1)
+
+
+@cache
+def get_pubsub(channel: str):
+    return import_string(settings.PUBSUB_BACKEND)(channel)
@@ -0,0 +1,76 @@
+import hashlib
+import json
+from functools import cache
+from pathlib import Path
+
+from django.conf import settings
+from django.http import HttpResponse
+from django.views.decorators.cache import cache_control
+from django.views.decorators.http import condition, require_safe
+from django.views.decorators.vary import vary_on_headers
+
+YAML = "yaml"
+JSON = "json"
+
+
+def generate_schema() -> dict:
+    """
+    Introspects every view and serializer, like `SpectacularAPIView` does.
+    """
+    from drf_spectacular.generators import SchemaGenerator
+
+    return SchemaGenerator().get_schema(request=None, public=True)
+
+
+def write_schema(path: Path) -> None:
+    path.parent.mkdir(parents=True, exist_ok=True)
+    path.write_text(json.dumps(generate_schema(), indent=2))
+
+
+@cache
+def rendered_schema() -> dict[str, tuple[bytes, str, str]]:
+    """
+    The schema rendered once per format, as (content, content type, ETag).
+
+    Reads the file written by `manage.py generate_schema`. Without it the
+    schema is generated on the first request and kept for the process lifetime.
+    """
+    from drf_spectacular.renderers import OpenApiJsonRenderer, OpenApiYamlRenderer
+
+    path = Path(settings.API_SCHEMA_FILE)
+    schema = json.loads(path.read_text()) if path.exists() else generate_schema()
+
+    rendered = {}
+    for name, renderer in (
+        (YAML, OpenApiYamlRenderer()),
+        (JSON, OpenApiJsonRenderer()),
+    ):
+        content = renderer.render(schema, renderer_context={})
+        etag = f'"{hashlib.sha256(content).hexdigest()[:32]}"'
+        rendered[name] = (content, renderer.media_type, etag)
+    return rendered
+
+
+def requested_format(request) -> str:
+    requested = request.GET.get("format")
+    if requested is None and JSON in request.headers.get("Accept", ""):
+        return JSON
+    return JSON if requested == JSON else YAML
+
+
+def schema_etag(request, *args, **kwargs) -> str:
+    return rendered_schema()[requested_format(request)][2]
+
+
+@require_safe
+@cache_control(public=True, max_age=settings.API_SCHEMA_MAX_AGE)
+@vary_on_headers("Accept")
+@condition(etag_func=schema_etag)
+def schema_view(request):
+    """
+    Serves the pregenerated OpenAPI schema as YAML, or as JSON for
+    `?format=json` and `Accept: application/json`. Clients revalidate with
+    `If-None-Match` and get 304 until the schema changes.
+    """
+    content, content_type, _ = rendered_schema()[requested_format(request)]
+    return HttpResponse(content, content_type=content_type)
@@ -18,10 +18,11 @@ BASE_DIR = Path(__file__).resolve().parent.parent
 SECRET_KEY = os.getenv("SECRET_KEY")
 
 # SECURITY WARNING: don't run with debug turned on in production!
-DEBUG = True
+DEBUG = os.getenv("DEBUG", "True") == "True"
 
 ALLOWED_HOSTS = [
     "127.0.0.1",
+    *filter(None, os.getenv("ALLOWED_HOSTS", "").split(",")),
 ]
 
 INTERNAL_IPS = [
@@ -38,18 +39,21 @@ INSTALLED_APPS = [
     "django.contrib.messages",
     "django.contrib.staticfiles",
     "rest_framework",
-    "debug_toolbar",
     "django_celery_beat",
     "drf_spectacular",
     "books",
     "users",
     "borrowings",
     "payments",
+    "notifications",
+    "idempotency",
+    "events",
 ]
 
 MIDDLEWARE = [
     "django.middleware.security.SecurityMiddleware",
-    "debug_toolbar.middleware.DebugToolbarMiddleware",
+    # Serves the collected static files under gunicorn
+    "whitenoise.middleware.WhiteNoiseMiddleware",
     "django.contrib.sessions.middleware.SessionMiddleware",
     "django.middleware.common.CommonMiddleware",
     "django.middleware.csrf.CsrfViewMiddleware",
@@ -58,6 +62,25 @@ MIDDLEWARE = [
     "django.middleware.clickjacking.XFrameOptionsMiddleware",
 ]
 
+# Compresses JSON responses of at least COMPRESSION_MIN_SIZE bytes with Brotli
+# (if the brotli package is installed) or gzip. Turn it off when a proxy in
+# front of the app compresses responses.
+RESPONSE_COMPRESSION = os.getenv("RESPONSE_COMPRESSION", "True") == "True"
+COMPRESSION_MIN_SIZE = int(os.getenv("COMPRESSION_MIN_SIZE", 1024))
+GZIP_LEVEL = int(os.getenv("GZIP_LEVEL", 6))
+BROTLI_QUALITY = int(os.getenv("BROTLI_QUALITY", 5))
+if RESPONSE_COMPRESSION:
+    # WhiteNoise serves static files compressed in advance, so it comes first
+    MIDDLEWARE.insert(2, "library_service.compression.CompressionMiddleware")
+
+# The toolbar is a development tool, production workers don't import it
+if DEBUG:
+    INSTALLED_APPS.insert(INSTALLED_APPS.index("rest_framework") + 1, "debug_toolbar")
+    # After the compression, the toolbar edits the uncompressed page
+    MIDDLEWARE.insert(
+        2 + RESPONSE_COMPRESSION, "debug_toolbar.middleware.DebugToolbarMiddleware"
+    )
+
 ROOT_URLCONF = "library_service.urls"
 
 TEMPLATES = [
@@ -93,6 +116,57 @@ DATABASES = {
     }
 }
 
+# Connection reuse. With DB_POOL_MAX_SIZE every process keeps a psycopg pool of
+# that size (the number of threads of a web worker, 1-2 for a Celery worker),
+# otherwise connections persist for CONN_MAX_AGE seconds. Both are health checked
+# before use.
+DB_POOL_MAX_SIZE = int(os.getenv("DB_POOL_MAX_SIZE", 0))
+if DB_POOL_MAX_SIZE:
+    from psycopg_pool import ConnectionPool
+
+    DATABASES["default"]["OPTIONS"] = {
+        "pool": {
+            "min_size": min(int(os.getenv("DB_POOL_MIN_SIZE", 1)), DB_POOL_MAX_SIZE),
+            "max_size": DB_POOL_MAX_SIZE,
+            "timeout": float(os.getenv("DB_POOL_TIMEOUT", 10)),
+            "check": ConnectionPool.check_connection,
+        }
+    }
+else:
+    DATABASES["default"]["CONN_MAX_AGE"] = int(os.getenv("CONN_MAX_AGE", 60))
+    DATABASES["default"]["CONN_HEALTH_CHECKS"] = True
+
+# Read replicas of the default database, e.g. POSTGRES_REPLICA_HOSTS=replica-1,replica-2
+DATABASE_REPLICAS = []
+for number, host in enumerate(
+    filter(None, os.getenv("POSTGRES_REPLICA_HOSTS", "").split(",")), start=1
+):
+    DATABASES[f"replica_{number}"] = {
+        **DATABASES["default"],
+        "HOST": host.strip(),
+        "TEST": {"MIRROR": "default"},
+    }
+    DATABASE_REPLICAS.append(f"replica_{number}")
+
+DATABASE_ROUTERS = ["library_service.db_routers.ReplicaRouter"]
+
+# After a write, the user reads from primary until replicas have caught up
+REPLICA_STICKY_SECONDS = int(os.getenv("REPLICA_STICKY_SECONDS", 10))
+
+# Primary pins of library_service.db_routers live in the cache, which must be
+# shared by all processes through Redis when replicas are configured
+CACHE_REDIS_URL = os.getenv("CACHE_REDIS_URL")
+CACHES = {
+    "default": (
+        {
+            "BACKEND": "django.core.cache.backends.redis.RedisCache",
+            "LOCATION": CACHE_REDIS_URL,
+        }
+        if CACHE_REDIS_URL
+        else {"BACKEND": "django.core.cache.backends.locmem.LocMemCache"}
+    )
+}
+
 
 # Password validation
 # https://docs.djangoproject.com/en/5.1/ref/settings/#auth-password-validators
@@ -112,6 +186,33 @@ AUTH_PASSWORD_VALIDATORS = [
     },
 ]
 
+# New passwords are hashed with PASSWORD_HASHER. The other hashers verify
+# existing hashes, which are upgraded on the user's next login.
+PASSWORD_HASHER_CHOICES = {
+    "argon2": "users.hashers.TunedArgon2PasswordHasher",
+    "scrypt": "users.hashers.TunedScryptPasswordHasher",
+    "pbkdf2": "django.contrib.auth.hashers.PBKDF2PasswordHasher",
+}
+PASSWORD_HASHER = os.getenv("PASSWORD_HASHER", "argon2")
+PASSWORD_HASHERS = [
+    PASSWORD_HASHER_CHOICES[PASSWORD_HASHER],
+    *(
+        hasher
+        for name, hasher in PASSWORD_HASHER_CHOICES.items()
+        if name != PASSWORD_HASHER
+    ),
+]
+# OWASP's minimum for Argon2id: 19 MiB, 2 iterations, 1 lane
+ARGON2_TIME_COST = int(os.getenv("ARGON2_TIME_COST", 2))
+ARGON2_MEMORY_COST = int(os.getenv("ARGON2_MEMORY_COST", 19 * 1024))
+ARGON2_PARALLELISM = int(os.getenv("ARGON2_PARALLELISM", 1))
+SCRYPT_WORK_FACTOR = int(os.getenv("SCRYPT_WORK_FACTOR", 2**14))
+
+# Threads of a web worker that may check passwords at once; further logins
+# wait up to LOGIN_QUEUE_TIMEOUT seconds, so other requests keep being served
+LOGIN_CONCURRENCY = int(os.getenv("LOGIN_CONCURRENCY", 2))
+LOGIN_QUEUE_TIMEOUT = float(os.getenv("LOGIN_QUEUE_TIMEOUT", 5))
+
 
 # Internationalization
 # https://docs.djangoproject.com/en/5.1/topics/i18n/
@@ -129,6 +230,12 @@ USE_TZ = True
 # https://docs.djangoproject.com/en/5.1/howto/static-files/
 
 STATIC_URL = "static/"
+# Filled by `collectstatic` in the migrate service, served by WhiteNoise
+STATIC_ROOT = BASE_DIR / "staticfiles"
+STORAGES = {
+    "default": {"BACKEND": "django.core.files.storage.FileSystemStorage"},
+    "staticfiles": {"BACKEND": "whitenoise.storage.CompressedStaticFilesStorage"},
+}
 
 # Default primary key field type
 # https://docs.djangoproject.com/en/5.1/ref/settings/#default-auto-field
@@ -137,7 +244,28 @@ DEFAULT_AUTO_FIELD = "django.db.models.BigAutoField"
 
 AUTH_USER_MODEL = "users.User"
 
+# orjson renders and parses JSON several times faster than the json module,
+# with the same output. FAST_JSON=False switches back to DRF's classes.
+FAST_JSON = os.getenv("FAST_JSON", "True") == "True"
+
 REST_FRAMEWORK = {
+    "DEFAULT_RENDERER_CLASSES": [
+        (
+            "library_service.renderers.ORJSONRenderer"
+            if FAST_JSON
+            else "rest_framework.renderers.JSONRenderer"
+        ),
+        "rest_framework.renderers.BrowsableAPIRenderer",
+    ],
+    "DEFAULT_PARSER_CLASSES": [
+        (
+            "library_service.parsers.ORJSONParser"
+            if FAST_JSON
+            else "rest_framework.parsers.JSONParser"
+        ),
+        "rest_framework.parsers.FormParser",
+        "rest_framework.parsers.MultiPartParser",
+    ],
     "DEFAULT_SCHEMA_CLASS": "drf_spectacular.openapi.AutoSchema",
     "DEFAULT_PAGINATION_CLASS": "rest_framework.pagination.LimitOffsetPagination",
     "PAGE_SIZE": 10,
@@ -147,8 +275,40 @@ REST_FRAMEWORK = {
     "DEFAULT_PERMISSION_CLASSES": [
         "books.permissions.IsAdminAllOrReadOnly",
     ],
+    # Scopes of library_service.throttling.ScopedRateLimitThrottle
+    "DEFAULT_THROTTLE_RATES": {
+        "borrowing_create": os.getenv("THROTTLE_BORROWING_CREATE", "10/min"),
+        "payment_renew": os.getenv("THROTTLE_PAYMENT_RENEW", "5/min"),
+        "login": os.getenv("THROTTLE_LOGIN", "10/min"),
+    },
+    # Reverse proxies in front of the app. Client IPs are read from the
+    # X-Forwarded-For entries they add, never from the ones clients send
+    "NUM_PROXIES": int(os.getenv("NUM_PROXIES", 0)),
 }
 
+# Rate limits are shared by all processes through Redis when it is configured
+RATE_LIMIT_REDIS_URL = os.getenv("RATE_LIMIT_REDIS_URL")
+RATE_LIMIT_BACKEND = (
+    "library_service.throttling.RedisRateLimitBackend"
+    if RATE_LIMIT_REDIS_URL
+    else "library_service.throttling.LocMemRateLimitBackend"
+)
+
+# Book availability changes reach the streams of all processes through Redis
+# when it is configured, otherwise only the streams of the writing process
+PUBSUB_REDIS_URL = os.getenv("PUBSUB_REDIS_URL")
+PUBSUB_BACKEND = (
+    "library_service.pubsub.RedisPubSubBackend"
+    if PUBSUB_REDIS_URL
+    else "library_service.pubsub.LocMemPubSubBackend"
+)
+AVAILABILITY_STREAM_MAX_BOOKS = int(os.getenv("AVAILABILITY_STREAM_MAX_BOOKS", 50))
+AVAILABILITY_STREAM_HEARTBEAT_SECONDS = int(
+    os.getenv("AVAILABILITY_STREAM_HEARTBEAT_SECONDS", 20)
+)
+# How long clients wait before reconnecting to a dropped stream
+AVAILABILITY_STREAM_RETRY_MS = int(os.getenv("AVAILABILITY_STREAM_RETRY_MS", 3000))
+
 SIMPLE_JWT = {
     "ACCESS_TOKEN_LIFETIME": timedelta(days=1),
     "REFRESH_TOKEN_LIFETIME": timedelta(days=7),
@@ -169,9 +329,54 @@ SPECTACULAR_SETTINGS = {
     },
 }
 
+# Written by `manage.py generate_schema`, generated on first request when missing
+API_SCHEMA_FILE = os.getenv("API_SCHEMA_FILE") or BASE_DIR / "schema.json"
+API_SCHEMA_MAX_AGE = int(os.getenv("API_SCHEMA_MAX_AGE", 3600))
+
 CELERY_TIMEZONE = "UTC"
 CELERY_TASK_TRACK_STARTED = True
 CELERY_TASK_TIME_LIMIT = 30 * 60
 
+# Counter shards per book for available copies. More shards spread concurrent
+# borrows of a popular book over more rows
+BOOK_AVAILABILITY_SHARDS = int(os.getenv("BOOK_AVAILABILITY_SHARDS", 4))
+
+# Number of users handled by one reminder worker task
+REMINDER_CHUNK_SIZE = int(os.getenv("REMINDER_CHUNK_SIZE", 500))
+
+# Notifications claimed and sent together by one delivery worker
+NOTIFICATION_BATCH_SIZE = int(os.getenv("NOTIFICATION_BATCH_SIZE", 200))
+NOTIFICATION_MAX_ATTEMPTS = 5
+# Notifications of a worker that died while sending them are retried after this
+NOTIFICATION_CLAIM_TIMEOUT_SECONDS = int(
+    os.getenv("NOTIFICATION_CLAIM_TIMEOUT_SECONDS", 600)
+)
+
+# How long responses are replayed to retries with the same Idempotency-Key
+IDEMPOTENCY_KEY_TTL_HOURS = int(os.getenv("IDEMPOTENCY_KEY_TTL_HOURS", 24))
+
+# Items priced by one /api/borrowings/quote/ request
+QUOTE_MAX_ITEMS = int(os.getenv("QUOTE_MAX_ITEMS", 10_000))
+
+# Page size of /api/events/ without ?limit=, and the largest ?limit= accepted
+EVENTS_PAGE_SIZE = int(os.getenv("EVENTS_PAGE_SIZE", 1000))
+EVENTS_MAX_PAGE_SIZE = int(os.getenv("EVENTS_MAX_PAGE_SIZE", 10_000))
+
+# Sub-requests accepted by /api/batch/ in one request
+BATCH_MAX_REQUESTS = int(os.getenv("BATCH_MAX_REQUESTS", 20))
+
+# How long a returned copy is held for the next user in the reservation queue
+RESERVATION_HOLD_HOURS = int(os.getenv("RESERVATION_HOLD_HOURS", 48))
+
+EMAIL_BACKEND = os.getenv(
+    "EMAIL_BACKEND", "django.core.mail.backends.console.EmailBackend"
+)
+EMAIL_HOST = os.getenv("EMAIL_HOST", "localhost")
+EMAIL_PORT = int(os.getenv("EMAIL_PORT", 25))
+EMAIL_HOST_USER = os.getenv("EMAIL_HOST_USER", "")
+EMAIL_HOST_PASSWORD = os.getenv("EMAIL_HOST_PASSWORD", "")
+EMAIL_USE_TLS = os.getenv("EMAIL_USE_TLS", "false").lower() == "true"
+DEFAULT_FROM_EMAIL = os.getenv("DEFAULT_FROM_EMAIL", "library@example.com")
+
 
 STRIPE_SECRET_KEY = os.getenv("STRIPE_SECRET_KEY")
@@ -0,0 +1,145 @@
+from django.core.exceptions import FieldDoesNotExist, ImproperlyConfigured
+from drf_spectacular.utils import OpenApiParameter
+from rest_framework import serializers
+from rest_framework.exceptions import ValidationError
+
+FIELDS_PARAMETER = OpenApiParameter(
+    "fields",
+    type=str,
+    description="Comma-separated fields to return, all fields by default.",
+)
+EXPAND_PARAMETER = OpenApiParameter(
+    "expand",
+    type=str,
+    description="Comma-separated related objects to nest instead of their "
+    "id or title. An empty value nests none.",
+)
+
+
+def split_param(value: str | None) -> set | None:
+    if value is None:
+        return None
+    return {name.strip() for name in value.split(",") if name.strip()}
+
+
+def queryset_paths(serializer, prefix: str = "") -> tuple[set, set]:
+    """
+    only() and select_related() paths for the columns the fields of
+    `serializer` read. Sources that are not model fields, like properties,
+    are skipped, they must not read deferred columns.
+    """
+    model = serializer.Meta.model
+    only, related = {f"{prefix}{model._meta.pk.name}"}, set()
+
+    for field in serializer.fields.values():
+        if field.source == "*":
+            continue
+        nested = isinstance(field, serializers.BaseSerializer)
+        current, path = model, prefix
+        for index, attr in enumerate(field.source_attrs):
+            try:
+                model_field = current._meta.get_field(attr)
+            except FieldDoesNotExist:
+                break
+            only.add(f"{path}{attr}")
+            last = index == len(field.source_attrs) - 1
+            if not model_field.is_relation or (last and not nested):
+                break
+            if not (model_field.many_to_one or model_field.one_to_one):
+                raise ImproperlyConfigured(
+                    f"{attr} can't be loaded with select_related()."
+                )
+            related.add(f"{path}{attr}")
+            current, path = model_field.related_model, f"{path}{attr}__"
+        else:
+            if nested:
+                nested_only, nested_related = queryset_paths(field, path)
+                only |= nested_only
+                related |= nested_related
+
+    return only, related
+
+
+class SparseFieldsMixin:
+    """
+    `?fields=` trims the output of list and retrieve to the given fields and
+    `?expand=` nests the given `expandable_fields`, other expandable fields
+    are shown in their `collapsed_serializer_class` form. The queryset loads
+    only the columns and joins the remaining fields read.
+
+    `expandable_fields` maps field names to the nested serializer class and
+    the prefetches it needs.
+    """
+
+    sparse_actions = ("list", "retrieve")
+    expandable_fields = {}
+    collapsed_serializer_class = None
+
+    @property
+    def requested_fields(self) -> set | None:
+        return split_param(self.request.query_params.get("fields"))
+
+    @property
+    def requested_expand(self) -> set | None:
+        return split_param(self.request.query_params.get("expand"))
+
+    def field_requested(self, name: str) -> bool:
+        requested = self.requested_fields
+        return requested is None or name in requested
+
+    def expand_fields(self, serializer) -> None:
+        expand = self.requested_expand
+        if expand is None:
+            return
+        unknown = expand - set(self.expandable_fields)
+        if unknown:
+            raise ValidationError(
+                {"expand": f"Can't expand {', '.join(sorted(unknown))}."}
+            )
+
+        collapsed = self.collapsed_serializer_class().get_fields()
+        fields = serializer.fields
+        for name, (serializer_class, _) in self.expandable_fields.items():
+            if name in fields:
+                fields[name] = (
+                    serializer_class(read_only=True)
+                    if name in expand
+                    else collapsed[name]
+                )
+
+    def trim_fields(self, serializer) -> None:
+        requested = self.requested_fields
+        if requested is None:
+            return
+        fields = serializer.fields
+        unknown = requested - set(fields)
+        if unknown:
+            raise ValidationError({"fields": f"Unknown {', '.join(sorted(unknown))}."})
+        for name in list(fields):
+            if name not in requested:
+                del fields[name]
+
+    def get_serializer(self, *args, **kwargs):
+        serializer = super().get_serializer(*args, **kwargs)
+        if self.action in self.sparse_actions:
+            fields_of = getattr(serializer, "child", serializer)
+            self.expand_fields(fields_of)
+            self.trim_fields(fields_of)
+        return serializer
+
+    def filter_queryset(self, queryset):
+        queryset = super().filter_queryset(queryset)
+        if self.action not in self.sparse_actions or (
+            self.requested_fields is None and self.requested_expand is None
+        ):
+            return queryset
+
+        serializer = self.get_serializer()
+        only, related = queryset_paths(serializer)
+        queryset = queryset.select_related(None).only(*only)
+        if related:
+            queryset = queryset.select_related(*related)
+        for name, (_, prefetches) in self.expandable_fields.items():
+            if isinstance(serializer.fields.get(name), serializers.BaseSerializer):
+                queryset = queryset.prefetch_related(*prefetches)
+        return queryset
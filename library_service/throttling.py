@@ -0,0 +1,149 @@
+import logging
+import threading
+import time
+import uuid
+from collections import defaultdict, deque
+from functools import cache
+
+from django.conf import settings
+from django.utils.module_loading import import_string
+from rest_framework.settings import api_settings
+from rest_framework.throttling import BaseThrottle
+
+logger = logging.getLogger(__name__)
+
+PERIODS = {"s": 1, "m": 60, "h": 60 * 60, "d": 24 * 60 * 60}
+
+# Sliding window log: one sorted set per key holding the timestamps of the
+# allowed requests of the last window. Returns the milliseconds to wait, 0 if
+# the request is allowed and has been recorded.
+SLIDING_WINDOW_SCRIPT = """
+local now, window, limit = tonumber(ARGV[1]), tonumber(ARGV[2]), tonumber(ARGV[3])
+redis.call("ZREMRANGEBYSCORE", KEYS[1], "-inf", now - window)
+if redis.call("ZCARD", KEYS[1]) < limit then
+    redis.call("ZADD", KEYS[1], now, ARGV[4])
+    redis.call("PEXPIRE", KEYS[1], window)
+    return 0
+end
+local oldest = redis.call("ZRANGE", KEYS[1], 0, 0, "WITHSCORES")
+return math.max(tonumber(oldest[2]) + window - now, 1)
+"""
+
+
+def parse_rate(rate: str) -> tuple[int, int]:
+    """
+    "10/min" -> (10 requests, 60 seconds), like DRF's throttle rates.
+    """
+    requests, period = rate.split("/")
+    return int(requests), PERIODS[period[0]]
+
+
+class RedisRateLimitBackend:
+    """
+    Keeps the sliding windows in Redis, shared by all app processes. Every
+    check is one atomic script call, a single round trip.
+    """
+
+    def __init__(self, url: str = None):
+        import redis
+
+        self.client = redis.Redis.from_url(url or settings.RATE_LIMIT_REDIS_URL)
+        self.script = self.client.register_script(SLIDING_WINDOW_SCRIPT)
+        self.errors = redis.RedisError
+
+    def hit(self, key: str, limit: int, window: int) -> float:
+        """
+        Records a request for `key` if fewer than `limit` were allowed in the
+        last `window` seconds. Returns the seconds to wait, 0 when allowed.
+        """
+        now_ms = int(time.time() * 1000)
+        try:
+            wait_ms = self.script(
+                keys=[key], args=[now_ms, window * 1000, limit, uuid.uuid4().hex]
+            )
+        except self.errors:
+            # Rate limiting must not take the API down with Redis
+            logger.warning("Rate limit check failed, allowing the request")
+            return 0
+        return wait_ms / 1000
+
+
+class LocMemRateLimitBackend:
+    """
+    Keeps the sliding windows in process memory. Limits are per process, so
+    it is meant for development, tests and single-process deployments.
+    """
+
+    def __init__(self):
+        self.lock = threading.Lock()
+        self.windows = defaultdict(deque)
+
+    def hit(self, key: str, limit: int, window: int) -> float:
+        now = time.monotonic()
+        with self.lock:
+            timestamps = self.windows[key]
+            while timestamps and timestamps[0] <= now - window:
+                timestamps.popleft()
+            if len(timestamps) < limit:
+                timestamps.append(now)
+                return 0
+            return timestamps[0] + window - now
+
+    def clear(self) -> None:
+        with self.lock:
+            self.windows.clear()
+
+
+@cache
+def get_backend():
+    return import_string(settings.RATE_LIMIT_BACKEND)()
+
+
+class ScopedRateLimitThrottle(BaseThrottle):
+    """
+    Limits requests per user (per client IP for anonymous requests) and per
+    scope, with the rates of REST_FRAMEWORK["DEFAULT_THROTTLE_RATES"].
+
+    The scope is the view's `throttle_scope`, or the scope of the current
+    action in `throttle_scopes` for viewsets. Views and actions without a
+    scope or rate are not limited. Views with a `throttle_field` are also
+    limited per submitted value of that field, e.g. the email of logins.
+    """
+
+    wait_seconds = None
+
+    def get_scope(self, view) -> str | None:
+        scopes = getattr(view, "throttle_scopes", {})
+        return scopes.get(getattr(view, "action", None)) or getattr(
+            view, "throttle_scope", None
+        )
+
+    def get_idents(self, request, view) -> list[str]:
+        if request.user and request.user.is_authenticated:
+            idents = [f"user:{request.user.pk}"]
+        else:
+            idents = [f"ip:{self.get_ident(request)}"]
+
+        field = getattr(view, "throttle_field", None)
+        value = (
+            request.data.get(field) if field and hasattr(request.data, "get") else None
+        )
+        if isinstance(value, str) and value.strip():
+            idents.append(f"{field}:{value.strip().lower()}")
+        return idents
+
+    def allow_request(self, request, view) -> bool:
+        scope = self.get_scope(view)
+        rate = api_settings.DEFAULT_THROTTLE_RATES.get(scope)
+        if rate is None:
+            return True
+
+        limit, window = parse_rate(rate)
+        self.wait_seconds = max(
+            get_backend().hit(f"throttle:{scope}:{ident}", limit, window)
+            for ident in self.get_idents(request, view)
+        )
+        return not self.wait_seconds
+
+    def wait(self) -> float | None:
+        return self.wait_seconds
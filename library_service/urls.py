@@ -1,11 +1,35 @@
-from debug_toolbar.toolbar import debug_toolbar_urls
+from functools import cache
+
+from django.conf import settings
 from django.contrib import admin
 from django.urls import path, include
-from drf_spectacular.views import (
-    SpectacularAPIView,
-    SpectacularSwaggerView,
-    SpectacularRedocView,
-)
+from django.utils.module_loading import import_string
+from django.views.decorators.cache import cache_control
+from django.views.decorators.csrf import csrf_exempt
+
+from library_service.batch import BatchView
+from library_service.schema import schema_view
+
+# The documentation pages only embed the schema URL
+docs_cache = cache_control(public=True, max_age=settings.API_SCHEMA_MAX_AGE)
+
+
+def lazy_view(view_path: str, **initkwargs):
+    """
+    Imports the class-based view on its first request, keeping rarely used
+    views such as the API schema out of worker startup.
+    """
+
+    @cache
+    def get_view():
+        return import_string(view_path).as_view(**initkwargs)
+
+    @csrf_exempt
+    def view(request, *args, **kwargs):
+        return get_view()(request, *args, **kwargs)
+
+    return view
+
 
 urlpatterns = [
     path("admin/", admin.site.urls),
@@ -13,15 +37,26 @@ urlpatterns = [
     path("api/users/", include("users.urls", namespace="user")),
     path("api/borrowings/", include("borrowings.urls", namespace="borrowing")),
     path("api/payments/", include("payments.urls", namespace="payment")),
-    path("api/schema/", SpectacularAPIView.as_view(), name="schema"),
+    path("api/events/", include("events.urls", namespace="event")),
+    path("api/batch/", BatchView.as_view(), name="batch"),
+    path("api/schema/", schema_view, name="schema"),
     path(
         "api/schema/swagger-ui/",
-        SpectacularSwaggerView.as_view(url_name="schema"),
+        docs_cache(
+            lazy_view("drf_spectacular.views.SpectacularSwaggerView", url_name="schema")
+        ),
         name="swagger-ui",
     ),
     path(
         "api/schema/redoc/",
-        SpectacularRedocView.as_view(url_name="schema"),
+        docs_cache(
+            lazy_view("drf_spectacular.views.SpectacularRedocView", url_name="schema")
+        ),
         name="redoc",
     ),
-] + debug_toolbar_urls()
+]
+
+if settings.DEBUG:
+    from debug_toolbar.toolbar import debug_toolbar_urls
+
+    urlpatterns += debug_toolbar_urls()
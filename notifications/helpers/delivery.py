@@ -0,0 +1,147 @@
+from itertools import groupby
+
+from django.conf import settings
+from django.core.mail import EmailMessage, get_connection
+from django.db import transaction
+from django.db.models import Case, F, Value, When
+from django.utils import timezone
+from django.utils.html import strip_tags
+
+from borrowings.helpers.telegram import send_message
+from notifications.models import Notification
+from users.models import User
+
+
+def send_emails(notifications: list) -> tuple[list, list]:
+    """
+    Sends the whole batch over a single mail connection.
+    """
+    messages = [
+        EmailMessage(
+            subject=notification.subject,
+            body=strip_tags(notification.message),
+            to=[notification.address],
+        )
+        for notification in notifications
+    ]
+    try:
+        get_connection().send_messages(messages)
+    except Exception:
+        return [], notifications
+    return notifications, []
+
+
+def send_telegram_messages(notifications: list) -> tuple[list, list]:
+    """
+    Sends messages one by one, reusing one HTTP connection for the batch.
+    """
+    import requests
+
+    sent, failed = [], []
+    with requests.Session() as session:
+        for notification in notifications:
+            try:
+                send_message(
+                    notification.message,
+                    chat_id=notification.address,
+                    session=session,
+                )
+            except Exception:
+                failed.append(notification)
+            else:
+                sent.append(notification)
+    return sent, failed
+
+
+SENDERS = {
+    User.NotificationChannel.EMAIL: send_emails,
+    User.NotificationChannel.TELEGRAM: send_telegram_messages,
+}
+
+
+def deliver_batch(notifications: list) -> tuple[list, list]:
+    sent, failed = [], []
+    notifications = sorted(notifications, key=lambda notification: notification.channel)
+    for channel, group in groupby(
+        notifications, key=lambda notification: notification.channel
+    ):
+        channel_sent, channel_failed = SENDERS[channel](list(group))
+        sent.extend(channel_sent)
+        failed.extend(channel_failed)
+    return sent, failed
+
+
+def release_stale_claims() -> int:
+    """
+    Puts notifications back in the queue whose worker died while sending them.
+    """
+    return Notification.objects.filter(
+        status=Notification.Status.SENDING,
+        claimed_at__lt=timezone.now()
+        - timezone.timedelta(seconds=settings.NOTIFICATION_CLAIM_TIMEOUT_SECONDS),
+    ).update(status=Notification.Status.PENDING, claimed_at=None)
+
+
+def claim_batch(batch_size: int, skipped: set) -> list:
+    """
+    Marks a batch of pending notifications as sending in a short transaction.
+
+    Rows are picked with `SELECT ... FOR UPDATE SKIP LOCKED`, so several workers
+    can drain the queue at the same time without claiming the same rows.
+    """
+    with transaction.atomic():
+        ids = list(
+            Notification.objects.select_for_update(skip_locked=True)
+            .filter(status=Notification.Status.PENDING)
+            .exclude(id__in=skipped)
+            .order_by("id")
+            .values_list("id", flat=True)[:batch_size]
+        )
+        Notification.objects.filter(id__in=ids).update(
+            status=Notification.Status.SENDING, claimed_at=timezone.now()
+        )
+    return list(Notification.objects.filter(id__in=ids).order_by("id"))
+
+
+def deliver_pending_notifications(batch_size: int = None) -> int:
+    """
+    Delivers pending notifications batch by batch until the queue is empty.
+
+    Messages are sent outside of any transaction, after their rows are claimed,
+    and every row records its own outcome. Failed notifications go back to the
+    queue until they run out of attempts.
+    """
+    batch_size = batch_size or settings.NOTIFICATION_BATCH_SIZE
+    delivered = 0
+    skipped = set()
+    release_stale_claims()
+
+    while True:
+        batch = claim_batch(batch_size, skipped)
+        if not batch:
+            return delivered
+
+        sent, failed = deliver_batch(batch)
+
+        Notification.objects.filter(
+            id__in=[notification.id for notification in sent]
+        ).update(
+            status=Notification.Status.SENT, sent_at=timezone.now(), claimed_at=None
+        )
+
+        failed_ids = [notification.id for notification in failed]
+        Notification.objects.filter(id__in=failed_ids).update(
+            status=Case(
+                When(
+                    attempts__gte=settings.NOTIFICATION_MAX_ATTEMPTS - 1,
+                    then=Value(Notification.Status.FAILED),
+                ),
+                default=Value(Notification.Status.PENDING),
+            ),
+            attempts=F("attempts") + 1,
+            claimed_at=None,
+        )
+
+        # Failed notifications are retried by the next run, not by this loop
+        skipped.update(failed_ids)
+        delivered += len(sent)
@@ -0,0 +1,38 @@
+from notifications.models import Notification
+from users.models import User
+
+
+def address_for(user) -> str | None:
+    """
+    Where the user wants to be notified, or None if they opted out.
+    """
+    if user.notification_channel == User.NotificationChannel.TELEGRAM:
+        return user.telegram_chat_id or None
+    if user.notification_channel == User.NotificationChannel.EMAIL:
+        return user.email
+    return None
+
+
+def build_notification(user, subject: str, message: str, dedup_key: str):
+    address = address_for(user)
+    if address is None:
+        return None
+
+    return Notification(
+        user=user,
+        channel=user.notification_channel,
+        address=address,
+        subject=subject,
+        message=message,
+        dedup_key=dedup_key,
+    )
+
+
+def enqueue_notifications(notifications: list) -> None:
+    """
+    Stores notifications in one query. Keys that are already queued are skipped.
+    """
+    Notification.objects.bulk_create(
+        [notification for notification in notifications if notification],
+        ignore_conflicts=True,
+    )
@@ -0,0 +1,42 @@
+from django.db import models
+
+from users.models import User
+
+
+class Notification(models.Model):
+    """
+    Outgoing message queued for one user.
+    `dedup_key` makes enqueueing idempotent: the same key is stored only once.
+    """
+
+    class Status(models.TextChoices):
+        PENDING = "pending"
+        SENDING = "sending"
+        SENT = "sent"
+        FAILED = "failed"
+
+    user = models.ForeignKey(
+        User, on_delete=models.CASCADE, related_name="notifications"
+    )
+    channel = models.CharField(max_length=20, choices=User.NotificationChannel.choices)
+    address = models.CharField(max_length=255)
+    subject = models.CharField(max_length=255)
+    message = models.TextField()
+    dedup_key = models.CharField(max_length=255, unique=True)
+    status = models.CharField(
+        max_length=20, choices=Status.choices, default=Status.PENDING
+    )
+    attempts = models.PositiveSmallIntegerField(default=0)
+    created_at = models.DateTimeField(auto_now_add=True)
+    # When a delivery worker took the notification for sending
+    claimed_at = models.DateTimeField(blank=True, null=True)
+    sent_at = models.DateTimeField(blank=True, null=True)
+
+    class Meta:
+        indexes = [
+            models.Index(fields=["status", "id"], name="notification_status_id_idx"),
+        ]
+        ordering = ("id",)
+
+    def __str__(self):
+        return f"{self.subject} ({self.channel} to {self.address}): {self.status}"
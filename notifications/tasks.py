@@ -0,0 +1,8 @@
+from celery import shared_task
+
+from notifications.helpers.delivery import deliver_pending_notifications
+
+
+@shared_task
+def deliver_notifications_task() -> int:
+    return deliver_pending_notifications()
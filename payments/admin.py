@@ -1,5 +1,45 @@
 from django.contrib import admin
+from django.db import transaction
+from django.utils import timezone
 
+from events.log import record_events
+from events.models import Event
+from library_service.admin import LargeTableAdmin
 from payments.models import Payment
 
-admin.site.register(Payment)
+
+@admin.register(Payment)
+class PaymentAdmin(LargeTableAdmin):
+    list_display = (
+        "id",
+        "borrowing_id",
+        "user_email",
+        "payment_type",
+        "payment_status",
+        "amount_to_pay",
+    )
+    list_select_related = ("borrowing__user",)
+    list_filter = ("payment_status", "payment_type")
+    search_fields = ("=borrowing__user__email",)
+    raw_id_fields = ("borrowing",)
+    actions = ("expire_sessions",)
+
+    @admin.display(description="User", ordering="borrowing__user__email")
+    def user_email(self, payment: Payment) -> str:
+        return payment.borrowing.user.email
+
+    @admin.action(description="Mark selected pending sessions as expired")
+    def expire_sessions(self, request, queryset) -> None:
+        with transaction.atomic():
+            expired_ids = list(
+                queryset.filter(payment_status=Payment.PaymentStatus.PENDING)
+                .select_for_update()
+                .values_list("id", flat=True)
+            )
+            expired = Payment.objects.filter(pk__in=expired_ids).update(
+                payment_status=Payment.PaymentStatus.EXPIRED, updated_at=timezone.now()
+            )
+            record_events(
+                Event.Type.PAYMENT_EXPIRED, Payment.objects.filter(pk__in=expired_ids)
+            )
+        self.message_user(request, f"{expired} checkout sessions marked as expired.")
@@ -0,0 +1,17 @@
+# Generated by Django 5.1.1 on 2026-10-19 16:09
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ("payments", "0006_alter_payment_borrowing_and_more"),
+    ]
+
+    operations = [
+        migrations.AddIndex(
+            model_name="payment",
+            index=models.Index(fields=["payment_status"], name="payment_status_idx"),
+        ),
+    ]
@@ -1,5 +1,6 @@
 from django.db import models
 from django.db.models import UniqueConstraint
+from django.db.models.functions import Now
 
 from borrowings.models import Borrowing
 
@@ -31,6 +32,9 @@ class Payment(models.Model):
     session_url = models.URLField(max_length=500)
     session_id = models.CharField(max_length=100)
     amount_to_pay = models.DecimalField(max_digits=10, decimal_places=2)
+    # Validator for conditional GETs, bulk updates must set it too. The
+    # database default covers rows written with COPY.
+    updated_at = models.DateTimeField(auto_now=True, db_default=Now())
 
     class Meta:
         constraints = [
@@ -39,6 +43,10 @@ class Payment(models.Model):
                 name="unique_payment_borrowing_and_payment_type",
             ),
         ]
+        indexes = [
+            # Filters on payment_type use the unique constraint's index
+            models.Index(fields=["payment_status"], name="payment_status_idx"),
+        ]
         ordering = ("id",)
 
     def __str__(self):
@@ -1,11 +1,25 @@
-import stripe
+from django.db import transaction
+from drf_spectacular.utils import extend_schema, extend_schema_view
 from rest_framework import viewsets, mixins, status
 from rest_framework.permissions import IsAuthenticated
 from rest_framework.response import Response
 from rest_framework.views import APIView
 
-from borrowings.helpers.payment import create_checkout_session
+from borrowings.helpers.payment import create_checkout_session, get_stripe
 from borrowings.helpers.telegram import send_message
+from borrowings.serializers import BorrowingSerializer
+from events.log import record_event
+from events.models import Event
+from idempotency.decorators import idempotent
+from library_service.conditional import ConditionalRetrieveMixin
+from library_service.db_routers import ReadReplicaMixin, pin_to_primary
+from library_service.fast_list import ValuesListMixin
+from library_service.sparse_fields import (
+    EXPAND_PARAMETER,
+    FIELDS_PARAMETER,
+    SparseFieldsMixin,
+)
+from library_service.throttling import ScopedRateLimitThrottle
 from payments.models import Payment
 from payments.serializers import (
     PaymentSerializer,
@@ -13,11 +27,24 @@ from payments.serializers import (
 )
 
 
+@extend_schema_view(
+    list=extend_schema(parameters=[FIELDS_PARAMETER, EXPAND_PARAMETER]),
+    retrieve=extend_schema(parameters=[FIELDS_PARAMETER, EXPAND_PARAMETER]),
+)
 class PaymentViewSet(
-    mixins.ListModelMixin, mixins.RetrieveModelMixin, viewsets.GenericViewSet
+    ReadReplicaMixin,
+    ConditionalRetrieveMixin,
+    SparseFieldsMixin,
+    ValuesListMixin,
+    mixins.ListModelMixin,
+    mixins.RetrieveModelMixin,
+    viewsets.GenericViewSet,
 ):
     queryset = Payment.objects.all().select_related()
     permission_classes = (IsAuthenticated,)
+    # Lists show the borrowing id, details nest the borrowing
+    expandable_fields = {"borrowing": (BorrowingSerializer, ())}
+    collapsed_serializer_class = PaymentSerializer
 
     def get_queryset(self):
         queryset = (
@@ -27,6 +54,9 @@ class PaymentViewSet(
         )
         return queryset
 
+    def get_version_lookups(self) -> list:
+        return ["updated_at", "borrowing__updated_at", "borrowing__book__updated_at"]
+
     def get_serializer_class(self):
         if self.action == "list":
             return PaymentSerializer
@@ -35,7 +65,10 @@ class PaymentViewSet(
 
 class PaymentRenewView(APIView):
     permission_classes = (IsAuthenticated,)
+    throttle_classes = (ScopedRateLimitThrottle,)
+    throttle_scope = "payment_renew"
 
+    @idempotent
     def post(self, request, pk: int) -> Response:
         db_checkout_session = Payment.objects.get(pk=pk)
 
@@ -47,6 +80,7 @@ class PaymentRenewView(APIView):
                 amount_to_pay=db_checkout_session.amount_to_pay,
                 payment_type=db_checkout_session.payment_type,
             )
+            pin_to_primary(request.user)
 
             return Response(
                 {
@@ -66,16 +100,25 @@ class PaymentSuccessView(APIView):
     def get(self, request, *args, **kwargs) -> Response:
         session_id = request.query_params.get("session_id")
 
-        stripe_checkout_session = stripe.checkout.Session.retrieve(session_id)
+        stripe_checkout_session = get_stripe().checkout.Session.retrieve(session_id)
 
         db_checkout_session = Payment.objects.select_related(
             "borrowing__user", "borrowing__book"
         ).get(session_id=session_id)
 
+        was_paid = db_checkout_session.payment_status == Payment.PaymentStatus.PAID
         db_checkout_session.payment_status = stripe_checkout_session.get(
             "payment_status"
         )
-        db_checkout_session.save()
+        with transaction.atomic():
+            db_checkout_session.save()
+            if (
+                not was_paid
+                and db_checkout_session.payment_status == Payment.PaymentStatus.PAID
+            ):
+                record_event(Event.Type.PAYMENT_PAID, db_checkout_session)
+        # Stripe redirects here without a token, so pin the payment's owner
+        pin_to_primary(db_checkout_session.borrowing.user)
 
         send_message(
             f"💸 <b>Payment received</b>\n"
@@ -0,0 +1,176 @@
+from datetime import date, timedelta
+from decimal import Decimal
+from unittest import mock
+
+from django.contrib.auth import get_user_model
+from django.db import connection
+from django.test import TestCase
+from django.test.utils import CaptureQueriesContext
+from django.urls import reverse
+from django.utils import timezone
+
+from benchmarks.fakes import fake_integrations
+from books.models import Book
+from borrowings.models import Borrowing, Reservation
+from library_service.admin import EstimatedCountPaginator
+from payments.models import Payment
+from tests.tests_books import sample_book
+from tests.tests_borrowings import sample_borrowing, sample_user
+
+
+def changelist_url(model) -> str:
+    return reverse(f"admin:{model._meta.app_label}_{model._meta.model_name}_changelist")
+
+
+class AdminChangelistTests(TestCase):
+    def setUp(self) -> None:
+        self.admin = get_user_model().objects.create_superuser(
+            email="admin@mail.com", password="1qazcde3"
+        )
+        self.client.force_login(self.admin)
+        self.rows = 0
+
+    def add_rows(self, count: int) -> None:
+        for _ in range(count):
+            self.rows += 1
+            user = sample_user(email=f"user{self.rows}@mail.com")
+            book = sample_book(title=f"Book {self.rows}")
+            borrowing = sample_borrowing(user=user, book=book)
+            Payment.objects.create(
+                borrowing=borrowing,
+                session_url="test_url",
+                session_id=f"session_{self.rows}",
+                amount_to_pay=Decimal("9.99"),
+            )
+            Reservation.objects.create(user=user, book=book)
+
+    def changelist_queries(self, model, **params) -> int:
+        with CaptureQueriesContext(connection) as queries:
+            res = self.client.get(changelist_url(model), params)
+        self.assertEqual(res.status_code, 200)
+        return len(queries)
+
+    def test_changelist_queries_do_not_grow_with_rows(self) -> None:
+        for model in (Borrowing, Payment, Book, Reservation):
+            with self.subTest(model=model.__name__):
+                self.add_rows(2)
+                few = self.changelist_queries(model)
+                self.add_rows(5)
+
+                self.assertEqual(self.changelist_queries(model), few)
+
+    def test_filtered_changelists(self) -> None:
+        self.add_rows(3)
+
+        self.assertEqual(
+            self.changelist_queries(Borrowing, is_active__exact=1),
+            self.changelist_queries(Borrowing),
+        )
+        self.assertEqual(
+            self.changelist_queries(Payment, payment_status__exact="pending"),
+            self.changelist_queries(Payment),
+        )
+
+    def test_unfiltered_count_of_a_large_table_is_estimated(self) -> None:
+        self.add_rows(2)
+
+        with mock.patch(
+            "library_service.admin.estimated_row_count", return_value=5_000_000
+        ), mock.patch.object(connection, "vendor", "postgresql"):
+            paginator = EstimatedCountPaginator(Borrowing.objects.all(), 50)
+            filtered = EstimatedCountPaginator(
+                Borrowing.objects.filter(is_active=True), 50
+            )
+
+            self.assertEqual(paginator.count, 5_000_000)
+            self.assertEqual(filtered.count, 2)
+
+
+class AdminActionTests(TestCase):
+    def setUp(self) -> None:
+        self.admin = get_user_model().objects.create_superuser(
+            email="admin@mail.com", password="1qazcde3"
+        )
+        self.client.force_login(self.admin)
+
+    def run_action(self, model, action: str, objects) -> None:
+        res = self.client.post(
+            changelist_url(model),
+            {"action": action, "_selected_action": [obj.pk for obj in objects]},
+        )
+        self.assertEqual(res.status_code, 302)
+
+    def test_mark_returned(self) -> None:
+        book = sample_book(copies=3, daily_fee=Decimal("2.00"))
+        today = timezone.localdate()
+        overdue = sample_borrowing(
+            book=book, expected_return_date=today - timedelta(days=3)
+        )
+        on_time = sample_borrowing(
+            user=sample_user(email="other@mail.com"),
+            book=book,
+            expected_return_date=today + timedelta(days=3),
+        )
+        for _ in range(2):
+            book.borrow_one_copy()
+
+        self.run_action(Borrowing, "mark_returned", [overdue, on_time])
+
+        overdue.refresh_from_db()
+        on_time.refresh_from_db()
+        self.assertFalse(overdue.is_active)
+        self.assertEqual(overdue.actual_return_date, today)
+        self.assertEqual(overdue.accrued_overdue_fee, Decimal("6.00"))
+        self.assertEqual(on_time.accrued_overdue_fee, Decimal("0.00"))
+        self.assertEqual(book.available_copies, 3)
+
+    def test_mark_returned_skips_returned_borrowings(self) -> None:
+        book = sample_book(copies=3)
+        returned = sample_borrowing(
+            book=book, is_active=False, actual_return_date=date(2024, 11, 5)
+        )
+
+        self.run_action(Borrowing, "mark_returned", [returned])
+
+        returned.refresh_from_db()
+        self.assertEqual(returned.actual_return_date, date(2024, 11, 5))
+        self.assertEqual(book.available_copies, 3)
+
+    def test_mark_returned_hands_copies_to_the_queue(self) -> None:
+        book = sample_book(copies=1)
+        borrowing = sample_borrowing(book=book)
+        book.borrow_one_copy()
+        waiting = Reservation.objects.create(
+            user=sample_user(email="waiting@mail.com"), book=book
+        )
+
+        with fake_integrations():
+            self.run_action(Borrowing, "mark_returned", [borrowing])
+
+        waiting.refresh_from_db()
+        self.assertEqual(waiting.status, Reservation.Status.READY)
+        self.assertEqual(book.available_copies, 0)
+
+    def test_expire_sessions(self) -> None:
+        payments = [
+            Payment.objects.create(
+                borrowing=sample_borrowing(
+                    user=sample_user(email=f"user{index}@mail.com"),
+                    book=sample_book(title=f"Book {index}"),
+                ),
+                payment_status=payment_status,
+                session_url="test_url",
+                session_id=f"session_{index}",
+                amount_to_pay=Decimal("9.99"),
+            )
+            for index, payment_status in enumerate(
+                (Payment.PaymentStatus.PENDING, Payment.PaymentStatus.PAID)
+            )
+        ]
+
+        self.run_action(Payment, "expire_sessions", payments)
+
+        self.assertEqual(
+            list(Payment.objects.values_list("payment_status", flat=True)),
+            [Payment.PaymentStatus.EXPIRED, Payment.PaymentStatus.PAID],
+        )
@@ -0,0 +1,182 @@
+from concurrent.futures import ThreadPoolExecutor
+from datetime import timedelta
+from importlib import import_module
+from unittest import skipUnless
+
+from django.db import connection
+from django.test import TestCase, TransactionTestCase, override_settings
+from django.utils import timezone
+from rest_framework import status
+from rest_framework.test import APIClient
+
+from benchmarks.fakes import fake_integrations
+from books.models import Book, BookAvailability, BookCopy, split_copies
+from tests.tests_books import BOOK_URL, detail_url, sample_book
+from tests.tests_borrowings import BORROWING_URL, sample_borrowing, sample_user
+
+move_to_shards = import_module("books.migrations.0005_bookavailability")
+
+
+@override_settings(BOOK_AVAILABILITY_SHARDS=4)
+class BookAvailabilityTests(TestCase):
+    def test_split_copies(self) -> None:
+        self.assertEqual(split_copies(10, 4), [3, 3, 2, 2])
+        self.assertEqual(split_copies(1, 4), [1, 0, 0, 0])
+
+    def test_new_book_gets_counter_shards(self) -> None:
+        book = sample_book(copies=10)
+
+        self.assertEqual(
+            list(
+                book.availability.order_by("shard").values_list("available", flat=True)
+            ),
+            [3, 3, 2, 2],
+        )
+        self.assertEqual(book.available_copies, 10)
+
+    def test_take_one_drains_every_shard(self) -> None:
+        book = sample_book(copies=3)
+
+        taken = [book.borrow_one_copy() for _ in range(4)]
+
+        self.assertEqual(
+            [copy is not None for copy in taken], [True, True, True, False]
+        )
+        self.assertEqual(book.available_copies, 0)
+
+    def test_put_back_one(self) -> None:
+        book = sample_book(copies=3)
+        book.borrow_one_copy()
+
+        book.return_one_copy()
+
+        self.assertEqual(book.available_copies, 3)
+
+    def test_borrowing_does_not_touch_the_book_row(self) -> None:
+        book = sample_book(copies=2)
+        client = APIClient()
+        client.force_authenticate(sample_user())
+
+        with fake_integrations():
+            res = client.post(
+                BORROWING_URL,
+                {
+                    "book": book.id,
+                    "expected_return_date": timezone.localdate() + timedelta(days=3),
+                },
+            )
+
+        self.assertEqual(res.status_code, status.HTTP_201_CREATED)
+        book.refresh_from_db()
+        self.assertEqual(book.copies, 2)
+        self.assertEqual(book.available_copies, 1)
+
+
+class BookStockTests(TestCase):
+    def setUp(self) -> None:
+        self.client = APIClient()
+        self.client.force_authenticate(sample_user(is_staff=True))
+        self.book = sample_book(copies=3)
+        self.book.borrow_one_copy()
+
+    def update_copies(self, copies: int):
+        return self.client.patch(
+            detail_url(self.book.id),
+            {"copies": copies, "daily_fee": self.book.daily_fee},
+        )
+
+    def test_stock_change_moves_the_shelf_count(self) -> None:
+        res = self.update_copies(5)
+
+        self.assertEqual(res.status_code, status.HTTP_200_OK)
+        self.assertEqual(res.data["available_copies"], 4)
+
+    def test_stock_cannot_drop_below_borrowed_copies(self) -> None:
+        self.assertEqual(self.update_copies(1).status_code, status.HTTP_200_OK)
+        self.assertEqual(self.book.available_copies, 0)
+
+        res = self.update_copies(0)
+
+        self.assertEqual(res.status_code, status.HTTP_400_BAD_REQUEST)
+
+    def test_stock_can_be_patched_alone(self) -> None:
+        res = self.client.patch(detail_url(self.book.id), {"copies": 5})
+
+        self.assertEqual(res.status_code, status.HTTP_200_OK)
+        self.assertEqual(res.data["available_copies"], 4)
+
+    def test_stock_cut_short_of_shelf_copies_is_rejected(self) -> None:
+        # The copies left the shelf after the stock check, e.g. to borrowers
+        self.book.book_copies.filter(status=BookCopy.Status.AVAILABLE).update(
+            status=BookCopy.Status.BORROWED
+        )
+
+        res = self.update_copies(2)
+
+        self.assertEqual(res.status_code, status.HTTP_400_BAD_REQUEST)
+        self.assertIn("copies", res.data)
+        self.book.refresh_from_db()
+        self.assertEqual(self.book.copies, 3)
+        self.assertEqual(self.book.available_copies, 2)
+
+    def test_list_reads_the_aggregated_count(self) -> None:
+        for index in range(5):
+            sample_book(title=f"Book {index}")
+
+        with self.assertNumQueries(2):
+            res = self.client.get(BOOK_URL)
+
+        self.assertEqual(res.data["results"][0]["copies"], 2)
+
+
+class ShardMigrationTests(TestCase):
+    def test_moves_shelf_copies_to_shards_and_back(self) -> None:
+        book = sample_book(copies=10)
+        for index, is_active in enumerate((True, False)):
+            sample_borrowing(
+                user=sample_user(email=f"user{index}@mail.com"),
+                book=book,
+                is_active=is_active,
+            )
+        BookAvailability.objects.all().delete()
+
+        with connection.cursor() as cursor:
+            cursor.execute(move_to_shards.SPLIT_COPIES, [4] * 3)
+            cursor.execute(move_to_shards.ADD_BORROWED_COPIES)
+
+        book.refresh_from_db()
+        self.assertEqual(book.copies, 11)
+        self.assertEqual(
+            list(
+                book.availability.order_by("shard").values_list("available", flat=True)
+            ),
+            [3, 3, 2, 2],
+        )
+
+        with connection.cursor() as cursor:
+            cursor.execute(move_to_shards.MERGE_SHARDS)
+
+        book.refresh_from_db()
+        self.assertEqual(book.copies, 10)
+
+
+@skipUnless(
+    connection.vendor == "postgresql", "Concurrent row locks require PostgreSQL"
+)
+@override_settings(BOOK_AVAILABILITY_SHARDS=8)
+class BookAvailabilityConcurrencyTests(TransactionTestCase):
+    def test_concurrent_borrowers_never_oversell(self) -> None:
+        book = sample_book(copies=50)
+
+        def take(_):
+            try:
+                return BookAvailability.objects.take_one(book.id)
+            finally:
+                connection.close()
+
+        with ThreadPoolExecutor(max_workers=20) as executor:
+            taken = list(executor.map(take, range(200)))
+
+        self.assertEqual(sum(taken), 50)
+        self.assertEqual(book.available_copies, 0)
+        self.assertEqual(Book.objects.get(pk=book.pk).copies, 50)
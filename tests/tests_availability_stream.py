@@ -0,0 +1,171 @@
+import asyncio
+import json
+from unittest import mock
+
+from asgiref.sync import sync_to_async
+from django.test import SimpleTestCase, TestCase, override_settings
+from django.urls import reverse
+from django.utils import timezone
+from rest_framework import status
+
+from benchmarks.fakes import fake_integrations
+from books.models import AVAILABILITY_CHANNEL, BookAvailability
+from borrowings.helpers.returns import return_borrowings
+from borrowings.models import Borrowing
+from library_service.pubsub import Hub, get_pubsub
+from tests.tests_books import sample_book
+from tests.tests_borrowings import BORROWING_URL, sample_borrowing, sample_user
+from tests.tests_reservations import client_for, return_url
+from tests.tests_throttling import NO_THROTTLING
+
+STREAM_URL = reverse("book:availability-stream")
+
+
+class HubTests(SimpleTestCase):
+    async def test_subscribers_get_their_topics(self) -> None:
+        hub = Hub()
+        first, second = hub.subscribe({"1", "2"}), hub.subscribe({"3"})
+
+        hub.dispatch({"1": 4, "3": 0})
+        hub.dispatch({"1": 3})
+
+        self.assertEqual(await first.get(timeout=1), {"1": 3})
+        self.assertEqual(await second.get(timeout=1), {"3": 0})
+        self.assertEqual(await second.get(timeout=0.01), {})
+
+    async def test_closed_subscription_gets_nothing(self) -> None:
+        hub = Hub()
+        subscription = hub.subscribe({"1"})
+        subscription.close()
+
+        hub.dispatch({"1": 4})
+
+        self.assertEqual(await subscription.get(timeout=0.01), {})
+
+    async def test_changes_from_other_threads(self) -> None:
+        hub = Hub()
+        subscription = hub.subscribe({"1"})
+
+        await asyncio.to_thread(hub.dispatch, {"1": 2})
+
+        self.assertEqual(await subscription.get(timeout=1), {"1": 2})
+
+
+@override_settings(REST_FRAMEWORK=NO_THROTTLING)
+class AvailabilityPublishingTests(TestCase):
+    def setUp(self) -> None:
+        self.user = sample_user()
+        self.book = sample_book(copies=3)
+        self.publish = mock.patch.object(
+            get_pubsub(AVAILABILITY_CHANNEL), "publish"
+        ).start()
+        self.addCleanup(mock.patch.stopall)
+
+    def published(self) -> list:
+        return [call.args[0] for call in self.publish.call_args_list]
+
+    def test_borrowing_and_returning_publish_the_count(self) -> None:
+        client = client_for(self.user)
+
+        with fake_integrations(), self.captureOnCommitCallbacks(execute=True):
+            client.post(
+                BORROWING_URL,
+                {
+                    "book": self.book.id,
+                    "expected_return_date": timezone.localdate()
+                    + timezone.timedelta(days=3),
+                },
+            )
+        borrowing = Borrowing.objects.get(user=self.user)
+        with fake_integrations(), self.captureOnCommitCallbacks(execute=True):
+            res = client.post(return_url(borrowing.id))
+
+        self.assertEqual(res.status_code, status.HTTP_200_OK)
+        self.assertEqual(
+            self.published(), [{str(self.book.id): 2}, {str(self.book.id): 3}]
+        )
+
+    def test_nothing_is_published_before_commit(self) -> None:
+        with self.captureOnCommitCallbacks() as callbacks:
+            self.book.borrow_one_copy()
+
+        self.assertEqual(self.published(), [])
+        self.assertEqual(len(callbacks), 1)
+
+    def test_bulk_returns_publish_every_book(self) -> None:
+        other = sample_book(title="Other", copies=1)
+        for book in (self.book, other):
+            sample_borrowing(user=self.user, book=book)
+            book.borrow_one_copy()
+        self.publish.reset_mock()
+
+        with self.captureOnCommitCallbacks(execute=True):
+            return_borrowings(Borrowing.objects.all())
+
+        self.assertEqual(self.published(), [{str(self.book.id): 3, str(other.id): 1}])
+
+
+class AvailabilityStreamTests(TestCase):
+    def setUp(self) -> None:
+        self.book = sample_book(copies=3)
+
+    async def disconnect(self, stream) -> None:
+        # The ASGI handler cancels the response task when the client leaves
+        waiting = asyncio.ensure_future(anext(stream))
+        await asyncio.sleep(0.01)
+        waiting.cancel()
+        with self.assertRaises(asyncio.CancelledError):
+            await waiting
+
+    async def read_event(self, stream) -> dict:
+        chunk = await anext(stream)
+        event, data = chunk.decode().strip().splitlines()
+        self.assertEqual(event, "event: availability")
+        return json.loads(data.removeprefix("data: "))
+
+    async def test_current_counts_then_changes(self) -> None:
+        res = await self.async_client.get(STREAM_URL, {"books": f"{self.book.id},0"})
+        stream = aiter(res.streaming_content)
+
+        self.assertEqual(res["Content-Type"], "text/event-stream")
+        self.assertEqual(await anext(stream), b"retry: 3000\n\n")
+        self.assertEqual(
+            await self.read_event(stream), {"book": self.book.id, "available_copies": 3}
+        )
+
+        await sync_to_async(BookAvailability.objects.filter(book=self.book).update)(
+            available=0
+        )
+        get_pubsub(AVAILABILITY_CHANNEL).publish(
+            {str(self.book.id): 0, str(self.book.id + 1): 5}
+        )
+
+        self.assertEqual(
+            await self.read_event(stream), {"book": self.book.id, "available_copies": 0}
+        )
+        await self.disconnect(stream)
+        self.assertFalse(get_pubsub(AVAILABILITY_CHANNEL).hub.subscriptions)
+
+    @override_settings(AVAILABILITY_STREAM_HEARTBEAT_SECONDS=0.1)
+    async def test_idle_stream_sends_keep_alives(self) -> None:
+        res = await self.async_client.get(STREAM_URL, {"books": str(self.book.id)})
+        stream = aiter(res.streaming_content)
+        await anext(stream)
+        await anext(stream)
+
+        self.assertEqual(await anext(stream), b": keep-alive\n\n")
+        await self.disconnect(stream)
+
+    @override_settings(AVAILABILITY_STREAM_MAX_BOOKS=2)
+    async def test_invalid_book_lists(self) -> None:
+        for books in ("", "1,a", "1,2,3"):
+            with self.subTest(books=books):
+                res = await self.async_client.get(STREAM_URL, {"books": books})
+
+                self.assertEqual(res.status_code, status.HTTP_400_BAD_REQUEST)
+
+    def test_refused_over_wsgi(self) -> None:
+        res = self.client.get(STREAM_URL, {"books": str(self.book.id)})
+
+        self.assertEqual(res.status_code, status.HTTP_501_NOT_IMPLEMENTED)
+        self.assertFalse(get_pubsub(AVAILABILITY_CHANNEL).hub.subscriptions)
@@ -0,0 +1,114 @@
+from django.db import connection
+from django.test import TestCase, override_settings
+from django.test.utils import CaptureQueriesContext
+from django.urls import reverse
+from rest_framework import status
+from rest_framework.test import APIClient
+from rest_framework_simplejwt.tokens import RefreshToken
+
+from tests.tests_books import sample_book
+from tests.tests_borrowings import sample_borrowing, sample_user
+from tests.tests_reservations import client_for
+from tests.tests_throttling import NO_THROTTLING
+
+BATCH_URL = reverse("batch")
+
+
+def batch(client, *paths: str, **extra):
+    return client.post(
+        BATCH_URL,
+        {"requests": [{"method": "GET", "path": path} for path in paths]},
+        format="json",
+        **extra,
+    )
+
+
+@override_settings(REST_FRAMEWORK=NO_THROTTLING)
+class BatchTests(TestCase):
+    def setUp(self) -> None:
+        self.user = sample_user()
+        self.client = client_for(self.user)
+        self.books = [sample_book(title=f"Book {index}") for index in range(3)]
+        sample_borrowing(user=self.user, book=self.books[0])
+
+    def test_startup_requests_in_one_round_trip(self) -> None:
+        paths = [
+            "/api/users/me/",
+            "/api/borrowings/?is_active=true",
+            "/api/payments/",
+            *(f"/api/books/{book.id}/" for book in self.books),
+        ]
+
+        res = batch(self.client, *paths)
+
+        self.assertEqual(res.status_code, status.HTTP_200_OK)
+        self.assertEqual([sub["path"] for sub in res.data["responses"]], paths)
+        for path, sub in zip(paths, res.data["responses"]):
+            single = self.client.get(path)
+            self.assertEqual(sub["status"], single.status_code)
+            self.assertEqual(sub["body"], single.json())
+
+    def test_identical_requests_run_once(self) -> None:
+        path = f"/api/books/{self.books[0].id}/"
+        with CaptureQueriesContext(connection) as once:
+            batch(self.client, path)
+
+        with CaptureQueriesContext(connection) as twice:
+            res = batch(self.client, path, path)
+
+        self.assertEqual(len(twice), len(once))
+        self.assertEqual(res.data["responses"][0], res.data["responses"][1])
+
+    def test_token_is_checked_once(self) -> None:
+        client = APIClient()
+        client.credentials(
+            HTTP_AUTHORIZE=f"Bearer {RefreshToken.for_user(self.user).access_token}"
+        )
+
+        with CaptureQueriesContext(connection) as queries:
+            res = batch(client, "/api/users/me/", "/api/borrowings/", "/api/payments/")
+
+        self.assertEqual(
+            [sub["status"] for sub in res.data["responses"]], [status.HTTP_200_OK] * 3
+        )
+        user_queries = [
+            query["sql"]
+            for query in queries
+            if query["sql"].startswith('SELECT "users_user"')
+        ]
+        self.assertEqual(len(user_queries), 1)
+
+    def test_sub_requests_keep_their_permissions(self) -> None:
+        res = batch(APIClient(), "/api/borrowings/", f"/api/books/{self.books[0].id}/")
+
+        self.assertEqual(
+            [sub["status"] for sub in res.data["responses"]],
+            [status.HTTP_401_UNAUTHORIZED, status.HTTP_200_OK],
+        )
+
+    def test_missing_and_non_api_paths(self) -> None:
+        res = batch(self.client, "/api/books/0/", "/api/unknown/", "/api/schema/")
+
+        self.assertEqual(
+            [sub["status"] for sub in res.data["responses"]],
+            [
+                status.HTTP_404_NOT_FOUND,
+                status.HTTP_404_NOT_FOUND,
+                status.HTTP_400_BAD_REQUEST,
+            ],
+        )
+
+    @override_settings(BATCH_MAX_REQUESTS=2)
+    def test_invalid_batches_are_rejected(self) -> None:
+        for payload in (
+            {"requests": []},
+            {"requests": [{"method": "POST", "path": "/api/books/"}]},
+            {"requests": [{"path": "/admin/"}]},
+            {"requests": [{"path": "https://example.com/api/books/"}]},
+            {"requests": [{"path": BATCH_URL}]},
+            {"requests": [{"path": "/api/books/"}] * 3},
+        ):
+            with self.subTest(payload=payload):
+                res = self.client.post(BATCH_URL, payload, format="json")
+
+                self.assertEqual(res.status_code, status.HTTP_400_BAD_REQUEST)
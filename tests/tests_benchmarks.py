@@ -0,0 +1,48 @@
+from django.test import TestCase
+
+from benchmarks.compare import METRICS, compare_reports
+from benchmarks.report import percentile
+from benchmarks.run import run_benchmark
+from benchmarks.scenarios import SCENARIOS
+from borrowings.models import Borrowing
+from payments.models import Payment
+
+
+class BenchmarkSuiteTests(TestCase):
+    def test_percentile_nearest_rank(self) -> None:
+        values = list(range(1, 101))
+        self.assertEqual(percentile(values, 50), 50)
+        self.assertEqual(percentile(values, 99), 99)
+        self.assertEqual(percentile([7], 95), 7)
+
+    def test_run_benchmark_smoke(self) -> None:
+        report = run_benchmark(
+            users=3,
+            books=5,
+            borrowings=10,
+            scenarios=list(SCENARIOS),
+            iterations=2,
+        )
+
+        self.assertEqual(report["dataset"]["borrowings"], 10)
+        self.assertIn("GET book:book-list", report["endpoints"])
+        self.assertIn("POST borrowing:borrowing-list", report["endpoints"])
+        self.assertIn("POST borrowing:borrowing-return-book", report["endpoints"])
+
+        for stats in report["endpoints"].values():
+            self.assertLessEqual(stats["p50_ms"], stats["p99_ms"])
+            self.assertGreater(stats["queries_max"], 0)
+
+        # Scenario payments go through the fake Stripe and end up paid
+        self.assertFalse(
+            Payment.objects.filter(
+                payment_status=Payment.PaymentStatus.PENDING
+            ).exists()
+        )
+        self.assertTrue(Borrowing.objects.filter(actual_return_date__isnull=False))
+
+    def test_compare_reports(self) -> None:
+        baseline = {"endpoints": {"GET x": dict.fromkeys(METRICS, 10)}}
+        candidate = {"endpoints": {"GET x": dict.fromkeys(METRICS, 5)}}
+
+        self.assertEqual(compare_reports(baseline, candidate)["GET x"]["p95_ms"], -50.0)
@@ -0,0 +1,238 @@
+from concurrent.futures import ThreadPoolExecutor
+from datetime import timedelta
+from importlib import import_module
+from unittest import skipUnless
+
+from django.contrib.auth import get_user_model
+from django.db import connection
+from django.test import TestCase, TransactionTestCase
+from django.urls import reverse
+from django.utils import timezone
+from rest_framework import status
+
+from benchmarks.fakes import fake_integrations
+from books.models import Book, BookCopy
+from borrowings.helpers.returns import return_borrowings
+from borrowings.models import Borrowing, Reservation
+from tests.tests_books import detail_url, sample_book
+from tests.tests_borrowings import BORROWING_URL, sample_borrowing, sample_user
+from tests.tests_reservations import client_for, return_url
+
+expand_copies = import_module("books.migrations.0007_bookcopy")
+link_copies = import_module(
+    "borrowings.migrations.0008_borrowing_copy_reservation_copy"
+)
+
+
+def statuses(book) -> list:
+    return list(book.book_copies.values_list("status", flat=True))
+
+
+class BookCopyTests(TestCase):
+    def setUp(self) -> None:
+        self.user = sample_user()
+        self.client = client_for(self.user)
+        self.book = sample_book(copies=2)
+
+    def borrow(self, client=None):
+        return (client or self.client).post(
+            BORROWING_URL,
+            {
+                "book": self.book.id,
+                "expected_return_date": timezone.localdate() + timedelta(days=3),
+            },
+        )
+
+    def test_new_book_gets_a_copy_per_stock_unit(self) -> None:
+        self.assertEqual(
+            list(self.book.book_copies.values_list("barcode", "status")),
+            [
+                (f"LP{self.book.id}-1", BookCopy.Status.AVAILABLE),
+                (f"LP{self.book.id}-2", BookCopy.Status.AVAILABLE),
+            ],
+        )
+
+    def test_borrowers_get_different_copies(self) -> None:
+        other = client_for(sample_user(email="other@mail.com"))
+
+        with fake_integrations():
+            self.borrow()
+            self.borrow(other)
+
+        copies = list(Borrowing.objects.values_list("copy__barcode", flat=True))
+        self.assertEqual(copies, [f"LP{self.book.id}-1", f"LP{self.book.id}-2"])
+        self.assertEqual(statuses(self.book), [BookCopy.Status.BORROWED] * 2)
+        self.assertEqual(self.book.available_copies, 0)
+        self.assertEqual(
+            self.client.get(BORROWING_URL).data["results"][0]["copy"], copies[0]
+        )
+
+    def test_return_puts_the_copy_back(self) -> None:
+        with fake_integrations():
+            self.borrow()
+            self.client.post(return_url(Borrowing.objects.get().id))
+
+        self.assertEqual(statuses(self.book), [BookCopy.Status.AVAILABLE] * 2)
+        self.assertEqual(self.book.available_copies, 2)
+
+    def test_returned_copy_is_held_for_the_reservation(self) -> None:
+        waiting = sample_user(email="waiting@mail.com")
+        with fake_integrations():
+            self.borrow()
+            self.borrow(client_for(sample_user(email="other@mail.com")))
+            reservation = Reservation.objects.create(user=waiting, book=self.book)
+            borrowing = Borrowing.objects.first()
+            self.client.post(return_url(borrowing.id))
+
+            reservation.refresh_from_db()
+            self.assertEqual(reservation.copy, borrowing.copy)
+            self.assertEqual(reservation.copy.status, BookCopy.Status.HELD)
+            self.assertEqual(self.book.available_copies, 0)
+
+            self.borrow(client_for(waiting))
+
+        self.assertEqual(Borrowing.objects.get(user=waiting).copy_id, borrowing.copy_id)
+        self.assertEqual(statuses(self.book), [BookCopy.Status.BORROWED] * 2)
+
+    def test_bulk_return(self) -> None:
+        with fake_integrations():
+            self.borrow()
+
+        return_borrowings(Borrowing.objects.all())
+
+        self.assertEqual(statuses(self.book), [BookCopy.Status.AVAILABLE] * 2)
+        self.assertEqual(self.book.available_copies, 2)
+
+    def test_shelf_count_ahead_of_the_copies(self) -> None:
+        BookCopy.objects.update(status=BookCopy.Status.LOST)
+
+        self.assertIsNone(self.book.borrow_one_copy())
+        self.assertEqual(self.book.available_copies, 2)
+
+    def test_stock_changes(self) -> None:
+        staff = client_for(sample_user(email="staff@mail.com", is_staff=True))
+        self.book.borrow_one_copy()
+
+        staff.patch(
+            detail_url(self.book.id), {"copies": 4, "daily_fee": self.book.daily_fee}
+        )
+        self.assertEqual(self.book.book_copies.count(), 4)
+        self.assertEqual(self.book.book_copies.last().barcode, f"LP{self.book.id}-4")
+
+        staff.patch(
+            detail_url(self.book.id), {"copies": 1, "daily_fee": self.book.daily_fee}
+        )
+        self.assertEqual(
+            statuses(self.book),
+            [BookCopy.Status.BORROWED] + [BookCopy.Status.WITHDRAWN] * 3,
+        )
+        self.assertEqual(self.book.available_copies, 0)
+
+    def test_new_copies_are_numbered_after_the_highest(self) -> None:
+        BookCopy.objects.add(self.book.id, 8)
+        self.book.book_copies.filter(barcode=f"LP{self.book.id}-2").delete()
+
+        BookCopy.objects.add(self.book.id, 1)
+
+        self.assertEqual(self.book.book_copies.last().barcode, f"LP{self.book.id}-11")
+
+
+class CopyWriteOffTests(TestCase):
+    def test_admin_writes_off_copies_on_the_shelf(self) -> None:
+        book = sample_book(copies=3)
+        borrowed = book.borrow_one_copy()
+        admin = get_user_model().objects.create_superuser(
+            email="admin@mail.com", password="1qazcde3"
+        )
+        self.client.force_login(admin)
+
+        self.client.post(
+            reverse("admin:books_bookcopy_changelist"),
+            {
+                "action": "mark_lost",
+                "_selected_action": list(book.book_copies.values_list("pk", flat=True)),
+            },
+        )
+
+        self.assertEqual(
+            statuses(book),
+            [BookCopy.Status.BORROWED, BookCopy.Status.LOST, BookCopy.Status.LOST],
+        )
+        self.assertEqual(Book.objects.get(pk=book.pk).copies, 1)
+        self.assertEqual(book.available_copies, 0)
+
+        book.return_one_copy(borrowed)
+        self.assertEqual(book.available_copies, 1)
+
+
+class CopyMigrationTests(TestCase):
+    def run_sql(self, *statements) -> None:
+        with connection.cursor() as cursor:
+            for statement in statements:
+                cursor.execute(statement)
+
+    def test_expands_copies_and_links_borrowings(self) -> None:
+        book = sample_book(copies=3)
+        borrowings = [
+            sample_borrowing(
+                user=sample_user(email=f"user{index}@mail.com"),
+                book=book,
+                is_active=is_active,
+            )
+            for index, is_active in enumerate((True, False, True))
+        ]
+        reservation = Reservation.objects.create(
+            user=sample_user(email="waiting@mail.com"),
+            book=book,
+            status=Reservation.Status.READY,
+        )
+        BookCopy.objects.all().delete()
+
+        self.run_sql(
+            expand_copies.EXPAND_COPIES,
+            link_copies.LINK_BORROWED_COPIES,
+            link_copies.LINK_HELD_COPIES,
+            link_copies.MARK_BORROWED_COPIES,
+            link_copies.MARK_HELD_COPIES,
+        )
+
+        barcodes = {
+            borrowing.id: borrowing.copy and borrowing.copy.barcode
+            for borrowing in Borrowing.objects.select_related("copy")
+        }
+        self.assertEqual(
+            barcodes,
+            {
+                borrowings[0].id: f"LP{book.id}-1",
+                borrowings[1].id: None,
+                borrowings[2].id: f"LP{book.id}-2",
+            },
+        )
+        reservation.refresh_from_db()
+        self.assertEqual(reservation.copy.barcode, f"LP{book.id}-3")
+        self.assertEqual(
+            statuses(book),
+            [BookCopy.Status.BORROWED, BookCopy.Status.BORROWED, BookCopy.Status.HELD],
+        )
+
+
+@skipUnless(
+    connection.vendor == "postgresql", "Concurrent row locks require PostgreSQL"
+)
+class CopyAllocationConcurrencyTests(TransactionTestCase):
+    def test_concurrent_borrowers_get_distinct_copies(self) -> None:
+        book = sample_book(copies=50)
+
+        def take(_):
+            try:
+                copy = BookCopy.objects.take_one(book.id)
+                return copy and copy.pk
+            finally:
+                connection.close()
+
+        with ThreadPoolExecutor(max_workers=20) as executor:
+            taken = [pk for pk in executor.map(take, range(200)) if pk]
+
+        self.assertEqual(len(taken), 50)
+        self.assertEqual(len(set(taken)), 50)
+        self.assertEqual(book.available_copies, 0)
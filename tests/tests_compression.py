@@ -0,0 +1,200 @@
+import gzip
+import json
+import zlib
+from datetime import timedelta
+from decimal import Decimal
+from unittest import skipUnless
+
+from django.http import HttpResponse, StreamingHttpResponse
+from django.test import RequestFactory, SimpleTestCase, TestCase, override_settings
+from django.utils import timezone
+from django.utils.http import http_date
+from rest_framework import status
+
+from borrowings.helpers.fee_accrual import accrue_overdue_fees
+from library_service import compression
+from library_service.compression import CompressionMiddleware
+from payments.models import Payment
+from tests.tests_books import sample_book
+from tests.tests_borrowings import BORROWING_URL, sample_borrowing, sample_user
+from tests.tests_payments import detail_url as payment_url
+from tests.tests_reservations import client_for
+
+PAYLOAD = json.dumps([{"id": index, "title": "Kobzar"} for index in range(200)])
+
+
+def borrowing_url(borrowing_id: int) -> str:
+    return f"{BORROWING_URL}{borrowing_id}/"
+
+
+@override_settings(COMPRESSION_MIN_SIZE=1024, GZIP_LEVEL=6)
+class CompressionMiddlewareTests(SimpleTestCase):
+    def respond(self, response, accept_encoding: str = "gzip, deflate, br"):
+        request = RequestFactory().get("/", HTTP_ACCEPT_ENCODING=accept_encoding)
+        return CompressionMiddleware(lambda request: response)(request)
+
+    def json_response(self, content: str = PAYLOAD) -> HttpResponse:
+        return HttpResponse(content, content_type="application/json")
+
+    def test_large_json_is_gzipped(self) -> None:
+        res = self.respond(self.json_response(), "gzip")
+
+        self.assertEqual(res["Content-Encoding"], "gzip")
+        self.assertEqual(res["Vary"], "Accept-Encoding")
+        self.assertEqual(int(res["Content-Length"]), len(res.content))
+        self.assertEqual(gzip.decompress(res.content).decode(), PAYLOAD)
+        self.assertLess(len(res.content), len(PAYLOAD) / 5)
+
+    def test_small_responses_are_not_compressed(self) -> None:
+        res = self.respond(self.json_response('{"detail": "ok"}'))
+
+        self.assertFalse(res.has_header("Content-Encoding"))
+
+    def test_clients_without_gzip_get_identity(self) -> None:
+        for accept_encoding in ("", "identity", "gzip;q=0"):
+            with self.subTest(accept_encoding=accept_encoding):
+                res = self.respond(self.json_response(), accept_encoding)
+
+                self.assertFalse(res.has_header("Content-Encoding"))
+                self.assertEqual(res["Vary"], "Accept-Encoding")
+
+    def test_binary_content_is_not_compressed(self) -> None:
+        res = self.respond(HttpResponse(PAYLOAD, content_type="image/png"))
+
+        self.assertFalse(res.has_header("Content-Encoding"))
+
+    def test_strong_etag_becomes_weak(self) -> None:
+        response = self.json_response()
+        response["ETag"] = '"abc"'
+
+        self.assertEqual(self.respond(response, "gzip")["ETag"], 'W/"abc"')
+
+    def test_streaming_response_is_compressed_per_chunk(self) -> None:
+        rows = [f"{index},Kobzar\n".encode() for index in range(500)]
+        response = StreamingHttpResponse(iter(rows), content_type="text/csv")
+
+        res = self.respond(response, "gzip")
+        chunks = list(res.streaming_content)
+
+        self.assertEqual(res["Content-Encoding"], "gzip")
+        self.assertFalse(res.has_header("Content-Length"))
+        self.assertEqual(len(chunks), len(rows) + 1)
+        # Every chunk can be decoded as soon as it arrives
+        decompressor = zlib.decompressobj(31)
+        self.assertEqual(decompressor.decompress(chunks[0]), rows[0])
+        self.assertEqual(gzip.decompress(b"".join(chunks)), b"".join(rows))
+
+    @skipUnless(compression.brotli, "brotli is not installed")
+    def test_brotli_is_preferred(self) -> None:
+        res = self.respond(self.json_response())
+
+        self.assertEqual(res["Content-Encoding"], "br")
+        self.assertEqual(compression.brotli.decompress(res.content).decode(), PAYLOAD)
+
+    def test_compressed_length_is_padded_at_random(self) -> None:
+        # Ten responses of the same body differ in length, against BREACH
+        for encoding in ("gzip", "br") if compression.brotli else ("gzip",):
+            with self.subTest(encoding=encoding):
+                lengths = {
+                    len(self.respond(self.json_response(), encoding).content)
+                    for _ in range(10)
+                }
+
+                self.assertGreater(len(lengths), 1)
+
+
+@override_settings(COMPRESSION_MIN_SIZE=200)
+class ApiCompressionTests(TestCase):
+    def test_list_is_compressed(self) -> None:
+        user = sample_user()
+        for index in range(5):
+            sample_borrowing(user=user, book=sample_book(title=f"Book {index}"))
+
+        res = client_for(user).get(BORROWING_URL, HTTP_ACCEPT_ENCODING="gzip")
+
+        self.assertEqual(res["Content-Encoding"], "gzip")
+        self.assertEqual(len(json.loads(gzip.decompress(res.content))["results"]), 5)
+
+
+class ConditionalGetTests(TestCase):
+    def setUp(self) -> None:
+        self.book = sample_book()
+        self.borrowing = sample_borrowing(
+            book=self.book,
+            expected_return_date=timezone.localdate() - timedelta(days=2),
+        )
+        self.client = client_for(self.borrowing.user)
+
+    def get(self, url: str, data: dict = None, **headers):
+        return self.client.get(url, data, **headers)
+
+    def test_unchanged_borrowing_is_not_sent_again(self) -> None:
+        url = borrowing_url(self.borrowing.id)
+        etag = self.get(url)["ETag"]
+
+        with self.assertNumQueries(1):
+            res = self.get(url, HTTP_IF_NONE_MATCH=etag)
+
+        self.assertEqual(res.status_code, status.HTTP_304_NOT_MODIFIED)
+        self.assertEqual(res["ETag"], etag)
+        self.assertEqual(res.content, b"")
+
+    def test_changes_change_the_etag(self) -> None:
+        url = borrowing_url(self.borrowing.id)
+
+        for change in (
+            lambda: self.borrowing.save(),
+            accrue_overdue_fees,
+            self.book.borrow_one_copy,
+            lambda: self.book.save(),
+        ):
+            etag = self.get(url)["ETag"]
+            change()
+            res = self.get(url, HTTP_IF_NONE_MATCH=etag)
+
+            self.assertEqual(res.status_code, status.HTTP_200_OK)
+            self.assertNotEqual(res["ETag"], etag)
+
+    def test_etag_depends_on_the_selected_fields(self) -> None:
+        url = borrowing_url(self.borrowing.id)
+        etag = self.get(url)["ETag"]
+
+        res = self.get(url, {"fields": "id"}, HTTP_IF_NONE_MATCH=etag)
+
+        self.assertEqual(res.status_code, status.HTTP_200_OK)
+
+    def test_last_modified_without_nested_availability(self) -> None:
+        url = borrowing_url(self.borrowing.id)
+
+        self.assertFalse(self.get(url).has_header("Last-Modified"))
+        self.assertTrue(
+            self.client.get(url, {"expand": ""}).has_header("Last-Modified")
+        )
+
+    def test_payment_if_modified_since(self) -> None:
+        payment = Payment.objects.create(
+            borrowing=self.borrowing,
+            session_url="test_url",
+            session_id="test_session_id",
+            amount_to_pay=Decimal("9.99"),
+        )
+        url = payment_url(payment.id)
+        last_modified = self.get(url)["Last-Modified"]
+
+        res = self.get(url, HTTP_IF_MODIFIED_SINCE=last_modified)
+        later = self.get(
+            url,
+            HTTP_IF_MODIFIED_SINCE=http_date(
+                (payment.updated_at - timedelta(minutes=1)).timestamp()
+            ),
+        )
+
+        self.assertEqual(res.status_code, status.HTTP_304_NOT_MODIFIED)
+        self.assertEqual(later.status_code, status.HTTP_200_OK)
+
+    def test_other_users_borrowing_is_not_found(self) -> None:
+        other = client_for(sample_user(email="other@mail.com"))
+
+        res = other.get(borrowing_url(self.borrowing.id), HTTP_IF_NONE_MATCH="*")
+
+        self.assertEqual(res.status_code, status.HTTP_404_NOT_FOUND)
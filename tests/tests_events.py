@@ -0,0 +1,195 @@
+import json
+from datetime import timedelta
+from decimal import Decimal
+from io import StringIO
+
+from django.contrib.auth import get_user_model
+from django.core.management import call_command
+from django.test import TestCase, override_settings
+from django.urls import reverse
+from django.utils import timezone
+from rest_framework import status
+
+from benchmarks.fakes import fake_integrations
+from borrowings.helpers.returns import return_borrowings
+from borrowings.models import Borrowing
+from events.models import Event
+from payments.models import Payment
+from tests.tests_books import sample_book
+from tests.tests_borrowings import BORROWING_URL, sample_borrowing, sample_user
+from tests.tests_reservations import client_for, return_url
+from tests.tests_throttling import NO_THROTTLING
+
+EVENT_URL = reverse("event:event-list")
+
+
+def event_types() -> list:
+    return list(Event.objects.values_list("type", flat=True))
+
+
+@override_settings(REST_FRAMEWORK=NO_THROTTLING)
+class EventRecordingTests(TestCase):
+    def setUp(self) -> None:
+        self.user = sample_user()
+        self.client = client_for(self.user)
+        self.book = sample_book(copies=1)
+
+    def borrow(self, book=None):
+        return self.client.post(
+            BORROWING_URL,
+            {
+                "book": (book or self.book).id,
+                "expected_return_date": timezone.localdate() + timedelta(days=3),
+            },
+        )
+
+    def test_borrowing_writes_borrowing_and_payment_events(self) -> None:
+        with fake_integrations():
+            self.borrow()
+        borrowing = Borrowing.objects.get()
+
+        created, payment = Event.objects.all()
+        self.assertEqual(created.type, Event.Type.BORROWING_CREATED)
+        self.assertEqual(created.object_id, borrowing.id)
+        self.assertEqual(
+            created.payload,
+            {
+                "id": borrowing.id,
+                "user_id": self.user.id,
+                "book_id": self.book.id,
+                "copy_id": borrowing.copy_id,
+                "borrow_date": str(borrowing.borrow_date),
+                "expected_return_date": str(borrowing.expected_return_date),
+                "actual_return_date": None,
+                "is_active": True,
+                "accrued_overdue_fee": "0.00",
+            },
+        )
+        self.assertEqual(payment.type, Event.Type.PAYMENT_CREATED)
+        self.assertEqual(payment.payload["payment_status"], "pending")
+
+    def test_failed_borrowing_writes_no_events(self) -> None:
+        with fake_integrations():
+            self.borrow()
+            Payment.objects.update(payment_status=Payment.PaymentStatus.PAID)
+            res = self.borrow()
+
+        self.assertEqual(res.status_code, status.HTTP_400_BAD_REQUEST)
+        self.assertEqual(len(event_types()), 2)
+
+    def test_return_and_payment(self) -> None:
+        with fake_integrations():
+            self.borrow()
+            payment = Payment.objects.get()
+            for _ in range(2):
+                self.client.get(
+                    reverse("payment:checkout-success"),
+                    {"session_id": payment.session_id},
+                )
+            self.client.post(return_url(Borrowing.objects.get().id))
+
+        self.assertEqual(
+            event_types(),
+            [
+                Event.Type.BORROWING_CREATED,
+                Event.Type.PAYMENT_CREATED,
+                Event.Type.PAYMENT_PAID,
+                Event.Type.BORROWING_RETURNED,
+            ],
+        )
+        self.assertEqual(
+            Event.objects.last().payload["actual_return_date"],
+            str(timezone.localdate()),
+        )
+
+    def test_bulk_returns(self) -> None:
+        borrowings = [
+            sample_borrowing(user=self.user, book=sample_book(title=f"Book {index}"))
+            for index in range(3)
+        ]
+
+        return_borrowings(Borrowing.objects.all())
+
+        self.assertEqual(
+            list(Event.objects.values_list("type", "object_id")),
+            [(Event.Type.BORROWING_RETURNED, borrowing.id) for borrowing in borrowings],
+        )
+        self.assertFalse(Event.objects.first().payload["is_active"])
+
+    def test_admin_expiry(self) -> None:
+        payment = Payment.objects.create(
+            borrowing=sample_borrowing(user=self.user, book=self.book),
+            session_url="test_url",
+            session_id="session",
+            amount_to_pay=Decimal("9.99"),
+        )
+        admin = get_user_model().objects.create_superuser(
+            email="admin@mail.com", password="1qazcde3"
+        )
+        self.client.force_login(admin)
+
+        self.client.post(
+            reverse("admin:payments_payment_changelist"),
+            {"action": "expire_sessions", "_selected_action": [payment.pk]},
+        )
+
+        event = Event.objects.get()
+        self.assertEqual(event.type, Event.Type.PAYMENT_EXPIRED)
+        self.assertEqual(event.payload["payment_status"], "expired")
+
+
+class EventConsumerTests(TestCase):
+    def setUp(self) -> None:
+        self.staff = sample_user(email="staff@mail.com", is_staff=True)
+        for index in range(5):
+            sample_borrowing(user=self.staff, book=sample_book(title=f"Book {index}"))
+        return_borrowings(Borrowing.objects.all())
+        self.ids = list(Event.objects.values_list("id", flat=True))
+
+    def test_pages_follow_the_cursor(self) -> None:
+        client = client_for(self.staff)
+        cursor, seen = "", []
+
+        for _ in range(3):
+            res = client.get(EVENT_URL, {"cursor": cursor, "limit": 2})
+            seen += [event["id"] for event in res.data["events"]]
+            cursor = res.data["next_cursor"]
+
+        self.assertEqual(seen, self.ids)
+        last = client.get(EVENT_URL, {"cursor": cursor})
+        self.assertEqual(last.data, {"events": [], "next_cursor": cursor})
+
+    def test_new_events_after_the_last_cursor(self) -> None:
+        client = client_for(self.staff)
+        cursor = client.get(EVENT_URL).data["next_cursor"]
+
+        sample_borrowing(user=self.staff, book=sample_book(title="New"))
+        return_borrowings(Borrowing.objects.filter(book__title="New"))
+        res = client.get(EVENT_URL, {"cursor": cursor})
+
+        self.assertEqual(len(res.data["events"]), 1)
+        self.assertEqual(res.data["events"][0]["type"], Event.Type.BORROWING_RETURNED)
+
+    def test_customers_have_no_access(self) -> None:
+        res = client_for(sample_user()).get(EVENT_URL)
+
+        self.assertEqual(res.status_code, status.HTTP_403_FORBIDDEN)
+
+    @override_settings(EVENTS_MAX_PAGE_SIZE=10)
+    def test_invalid_parameters(self) -> None:
+        client = client_for(self.staff)
+
+        for params in ({"cursor": "abc"}, {"limit": "x"}, {"limit": 0}, {"limit": 11}):
+            with self.subTest(params=params):
+                res = client.get(EVENT_URL, params)
+
+                self.assertEqual(res.status_code, status.HTTP_400_BAD_REQUEST)
+
+    def test_export_command(self) -> None:
+        stdout, stderr = StringIO(), StringIO()
+
+        call_command("export_events", batch_size=2, stdout=stdout, stderr=stderr)
+
+        lines = [json.loads(line) for line in stdout.getvalue().splitlines()]
+        self.assertEqual([event["id"] for event in lines], self.ids)
+        self.assertIn(f"Next cursor: {lines[-1]['cursor']}", stderr.getvalue())
@@ -0,0 +1,98 @@
+from datetime import date
+from decimal import Decimal
+from unittest import mock
+
+from django.contrib.auth import get_user_model
+from django.core.exceptions import ImproperlyConfigured
+from django.test import TestCase
+from rest_framework import status
+from rest_framework.test import APIClient
+
+from books.views import BookViewSet
+from borrowings.views import BorrowingViewSet
+from library_service.fast_list import value_converters
+from payments.models import Payment
+from payments.serializers import PaymentDetailSerializer
+from payments.views import PaymentViewSet
+from tests.tests_books import BOOK_URL, sample_book
+from tests.tests_borrowings import BORROWING_URL, sample_borrowing, sample_user
+from tests.tests_payments import PAYMENT_URL
+
+
+class ValuesListParityTests(TestCase):
+    """
+    Lists read from values() must be byte for byte the serializers' output.
+    """
+
+    def setUp(self) -> None:
+        self.staff = get_user_model().objects.create_user(
+            email="staff@mail.com", password="1qazcde3", is_staff=True
+        )
+        self.user = sample_user()
+        for index in range(4):
+            book = sample_book(
+                title=f"Книга {index}",
+                daily_fee=Decimal("1.5") + index,
+                cover="Soft" if index % 2 else "Hard",
+            )
+            borrowing = sample_borrowing(
+                user=self.user if index % 2 else sample_user(email=f"u{index}@m.com"),
+                book=book,
+                expected_return_date=date(2024, 11, 10 + index),
+                actual_return_date=date(2024, 11, 12) if index == 3 else None,
+                is_active=index != 3,
+            )
+            book.borrow_one_copy()
+            Payment.objects.create(
+                borrowing=borrowing,
+                session_url=f"https://checkout.stripe.com/{index}",
+                session_id=f"session_{index}",
+                amount_to_pay=Decimal("7.4") * index,
+            )
+
+    def assertSameResponse(self, viewset, user, url: str, params: dict = None):
+        client = APIClient()
+        client.force_authenticate(user)
+
+        fast = client.get(url, params)
+        with mock.patch.object(viewset, "list_from_values", False):
+            serialized = client.get(url, params)
+
+        self.assertEqual(fast.status_code, status.HTTP_200_OK)
+        self.assertEqual(fast.content, serialized.content)
+
+    def test_book_list(self) -> None:
+        for params in ({}, {"limit": 2, "offset": 1}):
+            with self.subTest(params=params):
+                self.assertSameResponse(BookViewSet, self.user, BOOK_URL, params)
+
+    def test_borrowing_list(self) -> None:
+        for user, params in (
+            (self.user, {}),
+            (self.staff, {}),
+            (self.staff, {"is_active": "false"}),
+            (self.staff, {"user_id": self.user.id, "ordering": "-id"}),
+            (self.staff, {"ordering": "-expected_return_date", "limit": 2}),
+        ):
+            with self.subTest(user=user.email, params=params):
+                self.assertSameResponse(BorrowingViewSet, user, BORROWING_URL, params)
+
+    def test_payment_list(self) -> None:
+        for user in (self.user, self.staff):
+            with self.subTest(user=user.email):
+                self.assertSameResponse(PaymentViewSet, user, PAYMENT_URL)
+
+    def test_list_reads_only_output_columns(self) -> None:
+        client = APIClient()
+        client.force_authenticate(self.staff)
+
+        with self.assertNumQueries(2) as queries:
+            client.get(BORROWING_URL)
+
+        select = queries.captured_queries[-1]["sql"]
+        self.assertNotIn("password", select)
+        self.assertNotIn("daily_fee", select)
+
+    def test_nested_serializers_are_rejected(self) -> None:
+        with self.assertRaises(ImproperlyConfigured):
+            value_converters(PaymentDetailSerializer(), {})
@@ -0,0 +1,127 @@
+from datetime import timedelta
+from decimal import Decimal
+
+from django.test import TestCase
+from django.urls import reverse
+from django.utils import timezone
+from rest_framework import status
+from rest_framework.test import APIClient
+
+from benchmarks.fakes import fake_integrations
+from borrowings.helpers.borrowing_calculations import calculate_overdue_fee
+from borrowings.helpers.fee_accrual import accrue_overdue_fees
+from borrowings.models import Borrowing
+from tests.tests_books import sample_book
+from tests.tests_borrowings import BORROWING_URL, sample_borrowing, sample_user
+
+
+class FeeLedgerTests(TestCase):
+    def setUp(self) -> None:
+        self.today = timezone.localdate()
+        self.user = sample_user()
+        self.books = [
+            sample_book(title="Cheap", daily_fee=Decimal("0.50")),
+            sample_book(title="Regular", daily_fee=Decimal("0.99")),
+            sample_book(title="Expensive", daily_fee=Decimal("12.35")),
+        ]
+
+    def borrowing(self, days_overdue: int, book, **params) -> Borrowing:
+        return sample_borrowing(
+            user=self.user,
+            book=book,
+            expected_return_date=self.today - timedelta(days=days_overdue),
+            **params,
+        )
+
+    def test_ledger_equals_formula(self) -> None:
+        borrowings = [
+            self.borrowing(days, book)
+            for days in (1, 2, 7, 30, 365)
+            for book in self.books
+        ]
+
+        updated = accrue_overdue_fees(self.today)
+
+        self.assertEqual(updated, len(borrowings))
+        for borrowing in borrowings:
+            borrowing.refresh_from_db()
+            self.assertEqual(
+                borrowing.accrued_overdue_fee, calculate_overdue_fee(borrowing)
+            )
+            self.assertEqual(borrowing.fee_accrued_on, self.today)
+
+    def test_accrual_skips_returned_and_not_yet_due_borrowings(self) -> None:
+        returned = self.borrowing(3, self.books[0], is_active=False)
+        not_due = self.borrowing(-2, self.books[1])
+        due_today = self.borrowing(0, self.books[2])
+
+        self.assertEqual(accrue_overdue_fees(self.today), 0)
+        for borrowing in (returned, not_due, due_today):
+            borrowing.refresh_from_db()
+            self.assertEqual(borrowing.accrued_overdue_fee, Decimal("0"))
+
+    def test_accrual_catches_up_after_missed_days(self) -> None:
+        borrowing = self.borrowing(10, self.books[1])
+
+        accrue_overdue_fees(self.today - timedelta(days=5))
+        accrue_overdue_fees(self.today)
+        accrue_overdue_fees(self.today)
+
+        borrowing.refresh_from_db()
+        self.assertEqual(borrowing.accrued_overdue_fee, Decimal("9.90"))
+
+
+class FeeLedgerApiTests(TestCase):
+    def setUp(self) -> None:
+        self.client = APIClient()
+        self.user = sample_user(is_staff=True)
+        self.client.force_authenticate(self.user)
+        self.today = timezone.localdate()
+
+    def test_borrowings_can_be_ordered_by_accrued_fee(self) -> None:
+        for days, title in ((1, "One"), (5, "Five"), (3, "Three")):
+            sample_borrowing(
+                user=self.user,
+                book=sample_book(title=title),
+                expected_return_date=self.today - timedelta(days=days),
+            )
+        accrue_overdue_fees(self.today)
+
+        res = self.client.get(BORROWING_URL, {"ordering": "-accrued_overdue_fee"})
+
+        self.assertEqual(res.status_code, status.HTTP_200_OK)
+        self.assertEqual(
+            [borrowing["book"] for borrowing in res.data["results"]],
+            ["Five", "Three", "One"],
+        )
+        self.assertEqual(res.data["results"][0]["accrued_overdue_fee"], "4.95")
+
+    def test_overdue_summary(self) -> None:
+        for days, title in ((1, "One"), (5, "Five")):
+            sample_borrowing(
+                user=self.user,
+                book=sample_book(title=title),
+                expected_return_date=self.today - timedelta(days=days),
+            )
+        accrue_overdue_fees(self.today)
+
+        res = self.client.get(reverse("borrowing:borrowing-overdue-summary"))
+
+        self.assertEqual(res.data["overdue_borrowings"], 2)
+        self.assertEqual(res.data["accrued_overdue_fees"], Decimal("5.94"))
+
+    def test_return_closes_the_ledger(self) -> None:
+        borrowing = sample_borrowing(
+            user=self.user,
+            expected_return_date=self.today - timedelta(days=4),
+        )
+
+        with fake_integrations():
+            res = self.client.post(
+                reverse("borrowing:borrowing-return-book", args=(borrowing.id,))
+            )
+
+        self.assertEqual(res.status_code, status.HTTP_201_CREATED)
+        borrowing.refresh_from_db()
+        self.assertEqual(borrowing.accrued_overdue_fee, Decimal("3.96"))
+        self.assertEqual(borrowing.payments.get().amount_to_pay, Decimal("3.96"))
@@ -0,0 +1,189 @@
+from concurrent.futures import ThreadPoolExecutor
+from datetime import timedelta
+from decimal import Decimal
+from unittest import skipUnless
+
+from django.db import connection
+from django.test import TestCase, TransactionTestCase, override_settings
+from django.urls import reverse
+from django.utils import timezone
+from rest_framework import status
+
+from benchmarks.fakes import fake_integrations
+from borrowings.models import Borrowing
+from idempotency.models import IdempotencyKey
+from idempotency.tasks import purge_expired_idempotency_keys_task
+from payments.models import Payment
+from tests.tests_books import sample_book
+from tests.tests_borrowings import BORROWING_URL, sample_borrowing, sample_user
+from tests.tests_reservations import client_for, return_url
+from tests.tests_throttling import NO_THROTTLING
+
+
+def borrow_payload(book) -> dict:
+    return {
+        "book": book.id,
+        "expected_return_date": timezone.localdate() + timedelta(days=7),
+    }
+
+
+@override_settings(REST_FRAMEWORK=NO_THROTTLING)
+class IdempotencyKeyTests(TestCase):
+    def setUp(self) -> None:
+        self.user = sample_user()
+        self.client = client_for(self.user)
+        self.book = sample_book(copies=3)
+
+    def borrow(self, key: str = "borrow-1", payload: dict = None):
+        return self.client.post(
+            BORROWING_URL,
+            payload or borrow_payload(self.book),
+            HTTP_IDEMPOTENCY_KEY=key,
+        )
+
+    def test_retried_borrowing_is_created_once(self) -> None:
+        with fake_integrations() as (fake_stripe, fake_telegram):
+            first = self.borrow()
+            retry = self.borrow()
+
+        self.assertEqual(first.status_code, status.HTTP_201_CREATED)
+        self.assertEqual(retry.status_code, status.HTTP_201_CREATED)
+        self.assertEqual(retry.data, first.data)
+        self.assertEqual(retry["Idempotent-Replayed"], "true")
+        self.assertEqual(Borrowing.objects.filter(user=self.user).count(), 1)
+        self.assertEqual(self.book.available_copies, 2)
+        self.assertEqual(len(fake_stripe.sessions), 1)
+        self.assertEqual(len(fake_telegram.messages), 1)
+
+    def test_retry_is_served_without_writes(self) -> None:
+        with fake_integrations():
+            self.borrow()
+
+            with self.assertNumQueries(1):
+                self.borrow()
+
+    def test_key_reused_for_another_request_is_rejected(self) -> None:
+        with fake_integrations():
+            self.borrow()
+            res = self.borrow(payload=borrow_payload(sample_book(title="Other")))
+
+        self.assertEqual(res.status_code, status.HTTP_422_UNPROCESSABLE_ENTITY)
+        self.assertEqual(Borrowing.objects.filter(user=self.user).count(), 1)
+
+    def test_failed_request_does_not_use_up_the_key(self) -> None:
+        with fake_integrations():
+            invalid = self.borrow(payload={"book": self.book.id})
+            valid = self.borrow()
+
+        self.assertEqual(invalid.status_code, status.HTTP_400_BAD_REQUEST)
+        self.assertEqual(valid.status_code, status.HTTP_201_CREATED)
+
+    def test_keys_are_scoped_per_user(self) -> None:
+        other = client_for(sample_user(email="other@mail.com"))
+
+        with fake_integrations():
+            self.borrow()
+            res = other.post(
+                BORROWING_URL,
+                borrow_payload(self.book),
+                HTTP_IDEMPOTENCY_KEY="borrow-1",
+            )
+
+        self.assertEqual(res.status_code, status.HTTP_201_CREATED)
+        self.assertEqual(Borrowing.objects.count(), 2)
+
+    def test_expired_key_runs_the_request_again(self) -> None:
+        with fake_integrations():
+            self.borrow()
+            IdempotencyKey.objects.update(
+                expires_at=timezone.now() - timedelta(seconds=1)
+            )
+            Payment.objects.update(payment_status=Payment.PaymentStatus.PAID)
+            res = self.borrow()
+
+        self.assertNotIn("Idempotent-Replayed", res)
+        self.assertEqual(Borrowing.objects.filter(user=self.user).count(), 2)
+
+    def test_retried_return_puts_the_copy_back_once(self) -> None:
+        borrowing = sample_borrowing(
+            user=self.user,
+            book=self.book,
+            expected_return_date=timezone.localdate() + timedelta(days=3),
+        )
+        self.book.borrow_one_copy()
+
+        with fake_integrations():
+            responses = [
+                self.client.post(
+                    return_url(borrowing.id), HTTP_IDEMPOTENCY_KEY="return-1"
+                )
+                for _ in range(2)
+            ]
+
+        self.assertEqual(responses[1].status_code, responses[0].status_code)
+        self.assertEqual(responses[1].data, responses[0].data)
+        self.assertEqual(self.book.available_copies, 3)
+
+    def test_retried_renewal_creates_one_checkout_session(self) -> None:
+        payment = Payment.objects.create(
+            borrowing=sample_borrowing(user=self.user, book=self.book),
+            payment_status=Payment.PaymentStatus.EXPIRED,
+            payment_type=Payment.PaymentType.BORROWING_PAYMENT,
+            session_url="test_url",
+            session_id="test_session_id",
+            amount_to_pay=Decimal("9.99"),
+        )
+        url = reverse("payment:checkout-renew", args=(payment.id,))
+
+        with fake_integrations() as (fake_stripe, _):
+            for _ in range(2):
+                res = self.client.post(url, HTTP_IDEMPOTENCY_KEY="renew-1")
+
+        self.assertEqual(res.status_code, status.HTTP_200_OK)
+        self.assertEqual(len(fake_stripe.sessions), 1)
+
+    def test_purge_expired_keys(self) -> None:
+        with fake_integrations():
+            self.borrow("kept")
+            self.borrow("expired")
+        IdempotencyKey.objects.filter(key="expired").update(
+            expires_at=timezone.now() - timedelta(seconds=1)
+        )
+
+        self.assertEqual(purge_expired_idempotency_keys_task(), 1)
+        self.assertEqual(
+            list(IdempotencyKey.objects.values_list("key", flat=True)), ["kept"]
+        )
+
+
+@skipUnless(
+    connection.vendor == "postgresql", "Concurrent row locks require PostgreSQL"
+)
+@override_settings(REST_FRAMEWORK=NO_THROTTLING)
+class IdempotencyConcurrencyTests(TransactionTestCase):
+    def test_parallel_requests_with_the_same_key_borrow_once(self) -> None:
+        user = sample_user()
+        book = sample_book(copies=5)
+
+        def send(_):
+            try:
+                return client_for(user).post(
+                    BORROWING_URL,
+                    borrow_payload(book),
+                    HTTP_IDEMPOTENCY_KEY="parallel",
+                )
+            finally:
+                connection.close()
+
+        with fake_integrations() as (fake_stripe, _):
+            with ThreadPoolExecutor(max_workers=8) as executor:
+                responses = list(executor.map(send, range(8)))
+
+        self.assertEqual(
+            {res.status_code for res in responses}, {status.HTTP_201_CREATED}
+        )
+        for res in responses[1:]:
+            self.assertEqual(res.data, responses[0].data)
+        self.assertEqual(Borrowing.objects.count(), 1)
+        self.assertEqual(book.available_copies, 4)
+        self.assertEqual(len(fake_stripe.sessions), 1)
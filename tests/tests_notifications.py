@@ -0,0 +1,143 @@
+from datetime import timedelta
+from unittest import mock
+
+from django.core import mail
+from django.test import TestCase, override_settings
+from django.urls import reverse
+from django.utils import timezone
+from rest_framework import status
+from rest_framework.test import APIClient
+
+from notifications.helpers.delivery import deliver_pending_notifications
+from notifications.helpers.queue import build_notification, enqueue_notifications
+from notifications.models import Notification
+from tests.tests_borrowings import sample_user
+
+SEND_TELEGRAM = "notifications.helpers.delivery.send_message"
+
+
+def sample_notification(user, key: str = "key") -> Notification:
+    return build_notification(
+        user, subject="Subject", message="<b>Hello</b>", dedup_key=key
+    )
+
+
+@override_settings(
+    EMAIL_BACKEND="django.core.mail.backends.locmem.EmailBackend",
+    NOTIFICATION_MAX_ATTEMPTS=2,
+)
+class NotificationDeliveryTests(TestCase):
+    def setUp(self) -> None:
+        self.email_user = sample_user(email="email@mail.com")
+        self.telegram_user = sample_user(
+            email="telegram@mail.com",
+            notification_channel="telegram",
+            telegram_chat_id="42",
+        )
+
+    def test_enqueue_skips_duplicate_keys_and_opted_out_users(self) -> None:
+        silent_user = sample_user(email="silent@mail.com", notification_channel="none")
+
+        enqueue_notifications(
+            [
+                sample_notification(self.email_user, "a"),
+                sample_notification(silent_user, "b"),
+            ]
+        )
+        enqueue_notifications([sample_notification(self.email_user, "a")])
+
+        self.assertEqual(Notification.objects.count(), 1)
+
+    @mock.patch(SEND_TELEGRAM)
+    def test_deliver_sends_each_channel_in_batches(self, send_telegram) -> None:
+        enqueue_notifications(
+            [
+                sample_notification(self.email_user, "a"),
+                sample_notification(self.telegram_user, "b"),
+                sample_notification(self.email_user, "c"),
+            ]
+        )
+
+        delivered = deliver_pending_notifications(batch_size=2)
+
+        self.assertEqual(delivered, 3)
+        self.assertEqual(len(mail.outbox), 2)
+        self.assertEqual(mail.outbox[0].body, "Hello")
+        self.assertEqual(send_telegram.call_args.kwargs["chat_id"], "42")
+        self.assertFalse(
+            Notification.objects.exclude(status=Notification.Status.SENT).exists()
+        )
+
+    @mock.patch(SEND_TELEGRAM, side_effect=Exception("Telegram is down"))
+    def test_failed_notifications_are_retried_until_max_attempts(self, _) -> None:
+        enqueue_notifications([sample_notification(self.telegram_user)])
+
+        self.assertEqual(deliver_pending_notifications(), 0)
+        notification = Notification.objects.get()
+        self.assertEqual(notification.status, Notification.Status.PENDING)
+
+        deliver_pending_notifications()
+        notification.refresh_from_db()
+        self.assertEqual(notification.status, Notification.Status.FAILED)
+        self.assertEqual(notification.attempts, 2)
+
+    @mock.patch(SEND_TELEGRAM)
+    def test_notifications_are_claimed_while_sending(self, send_telegram) -> None:
+        enqueue_notifications([sample_notification(self.telegram_user)])
+        send_telegram.side_effect = lambda *args, **kwargs: self.assertEqual(
+            Notification.objects.get().status, Notification.Status.SENDING
+        )
+
+        self.assertEqual(deliver_pending_notifications(), 1)
+        notification = Notification.objects.get()
+        self.assertEqual(notification.status, Notification.Status.SENT)
+        self.assertIsNone(notification.claimed_at)
+
+    @override_settings(NOTIFICATION_CLAIM_TIMEOUT_SECONDS=60)
+    def test_stale_claims_are_sent_again(self) -> None:
+        enqueue_notifications(
+            [
+                sample_notification(self.email_user, "stale"),
+                sample_notification(self.email_user, "in-flight"),
+            ]
+        )
+        now = timezone.now()
+        for key, claimed_at in (
+            ("stale", now - timedelta(minutes=5)),
+            ("in-flight", now),
+        ):
+            Notification.objects.filter(dedup_key=key).update(
+                status=Notification.Status.SENDING, claimed_at=claimed_at
+            )
+
+        self.assertEqual(deliver_pending_notifications(), 1)
+        self.assertEqual(
+            dict(Notification.objects.values_list("dedup_key", "status")),
+            {
+                "stale": Notification.Status.SENT,
+                "in-flight": Notification.Status.SENDING,
+            },
+        )
+
+
+class NotificationPreferenceTests(TestCase):
+    def setUp(self) -> None:
+        self.client = APIClient()
+        self.user = sample_user()
+        self.client.force_authenticate(self.user)
+
+    def test_user_can_switch_to_telegram(self) -> None:
+        res = self.client.patch(
+            reverse("user:manage_user"),
+            {"notification_channel": "telegram", "telegram_chat_id": "42"},
+        )
+
+        self.assertEqual(res.status_code, status.HTTP_200_OK)
+        self.user.refresh_from_db()
+        self.assertEqual(self.user.notification_channel, "telegram")
+
+    def test_telegram_channel_requires_chat_id(self) -> None:
+        res = self.client.patch(
+            reverse("user:manage_user"), {"notification_channel": "telegram"}
+        )
+        self.assertEqual(res.status_code, status.HTTP_400_BAD_REQUEST)
@@ -0,0 +1,72 @@
+from unittest import mock
+
+from django.contrib.auth import get_user_model
+from django.contrib.auth.hashers import make_password
+from django.test import TestCase, override_settings
+from django.urls import reverse
+from rest_framework import status
+from rest_framework.test import APIClient
+
+from tests.tests_borrowings import sample_user
+from tests.tests_throttling import NO_THROTTLING
+
+TOKEN_URL = reverse("user:token_obtain_pair")
+PASSWORD = "1qazcde3"
+
+
+@override_settings(REST_FRAMEWORK=NO_THROTTLING)
+class PasswordHashingTests(TestCase):
+    def login(self, user) -> int:
+        return (
+            APIClient()
+            .post(TOKEN_URL, {"email": user.email, "password": PASSWORD})
+            .status_code
+        )
+
+    def refreshed_password(self, user) -> str:
+        return get_user_model().objects.get(pk=user.pk).password
+
+    def test_new_passwords_use_argon2id(self) -> None:
+        user = sample_user()
+
+        self.assertTrue(user.password.startswith("argon2$argon2id$"))
+        self.assertIn("m=19456,t=2,p=1", user.password)
+
+    def test_pbkdf2_hash_is_upgraded_on_login(self) -> None:
+        user = sample_user()
+        user.password = make_password(PASSWORD, hasher="pbkdf2_sha256")
+        user.save(update_fields=["password"])
+
+        self.assertEqual(self.login(user), status.HTTP_200_OK)
+        self.assertTrue(self.refreshed_password(user).startswith("argon2$"))
+
+    def test_hash_is_upgraded_when_costs_change(self) -> None:
+        user = sample_user()
+
+        with self.settings(ARGON2_MEMORY_COST=8 * 1024):
+            self.assertEqual(self.login(user), status.HTTP_200_OK)
+
+        self.assertIn("m=8192", self.refreshed_password(user))
+
+    def test_failed_login_keeps_the_hash(self) -> None:
+        user = sample_user()
+        user.password = make_password(PASSWORD, hasher="pbkdf2_sha256")
+        user.save(update_fields=["password"])
+
+        res = APIClient().post(TOKEN_URL, {"email": user.email, "password": "wrong"})
+
+        self.assertEqual(res.status_code, status.HTTP_401_UNAUTHORIZED)
+        self.assertEqual(self.refreshed_password(user), user.password)
+
+    def test_login_waits_for_a_free_password_check_slot(self) -> None:
+        user = sample_user()
+
+        with mock.patch("users.views.password_check_slots") as slots:
+            slots.acquire.return_value = False
+            res = APIClient().post(
+                TOKEN_URL, {"email": user.email, "password": PASSWORD}
+            )
+
+        self.assertEqual(res.status_code, status.HTTP_503_SERVICE_UNAVAILABLE)
+        self.assertEqual(res["Retry-After"], "1")
+        slots.release.assert_not_called()
@@ -0,0 +1,141 @@
+from datetime import timedelta
+from decimal import Decimal
+
+from django.test import TestCase, override_settings
+from django.urls import reverse
+from django.utils import timezone
+from rest_framework import status
+from rest_framework.test import APIClient
+
+from borrowings.helpers.borrowing_calculations import calculate_overdue_fee
+from borrowings.models import Borrowing
+from payments.models import Payment
+from tests.tests_books import sample_book
+from tests.tests_borrowings import sample_borrowing, sample_user
+from tests.tests_reservations import client_for
+
+QUOTE_URL = reverse("borrowing:borrowing-quote")
+PROJECTION_URL = reverse("borrowing:borrowing-overdue-projection")
+
+
+class QuoteTests(TestCase):
+    def setUp(self) -> None:
+        self.today = timezone.localdate()
+        self.client = client_for(sample_user())
+        self.cheap = sample_book(title="Cheap", daily_fee=Decimal("0.50"))
+        self.expensive = sample_book(title="Expensive", daily_fee=Decimal("12.35"))
+
+    def item(self, book, days: int) -> dict:
+        return {
+            "book": book.id,
+            "expected_return_date": self.today + timedelta(days=days),
+        }
+
+    def test_prices_every_item(self) -> None:
+        items = [self.item(self.cheap, 3), self.item(self.expensive, 7)]
+
+        with self.assertNumQueries(1):
+            res = self.client.post(QUOTE_URL, {"items": items}, format="json")
+
+        self.assertEqual(res.status_code, status.HTTP_200_OK)
+        self.assertEqual(
+            [(item["days"], Decimal(item["price"])) for item in res.data["items"]],
+            [(3, Decimal("1.50")), (7, Decimal("86.45"))],
+        )
+        self.assertEqual(Decimal(res.data["total"]), Decimal("87.95"))
+
+    def test_creates_nothing(self) -> None:
+        self.client.post(
+            QUOTE_URL, {"items": [self.item(self.cheap, 3)]}, format="json"
+        )
+
+        self.assertFalse(Borrowing.objects.exists())
+        self.assertFalse(Payment.objects.exists())
+        self.assertEqual(self.cheap.available_copies, 3)
+
+    def test_invalid_items(self) -> None:
+        cases = {
+            "empty": [],
+            "past date": [self.item(self.cheap, 0)],
+            "unknown book": [
+                self.item(self.cheap, 1),
+                {**self.item(self.cheap, 1), "book": 999},
+            ],
+        }
+
+        for name, items in cases.items():
+            with self.subTest(name):
+                res = self.client.post(QUOTE_URL, {"items": items}, format="json")
+
+                self.assertEqual(res.status_code, status.HTTP_400_BAD_REQUEST)
+
+    @override_settings(QUOTE_MAX_ITEMS=2)
+    def test_item_limit(self) -> None:
+        items = [self.item(self.cheap, days) for days in (1, 2, 3)]
+
+        res = self.client.post(QUOTE_URL, {"items": items}, format="json")
+
+        self.assertEqual(res.status_code, status.HTTP_400_BAD_REQUEST)
+
+    def test_requires_authentication(self) -> None:
+        res = APIClient().post(QUOTE_URL, {}, format="json")
+
+        self.assertEqual(res.status_code, status.HTTP_401_UNAUTHORIZED)
+
+
+class OverdueProjectionTests(TestCase):
+    def setUp(self) -> None:
+        self.today = timezone.localdate()
+        self.staff = sample_user(email="staff@mail.com", is_staff=True)
+        self.book = sample_book(daily_fee=Decimal("0.99"))
+
+    def borrowing(self, due_in: int, **params) -> Borrowing:
+        return sample_borrowing(
+            user=self.staff,
+            book=self.book,
+            expected_return_date=self.today + timedelta(days=due_in),
+            **params,
+        )
+
+    def test_projects_active_borrowings(self) -> None:
+        overdue = self.borrowing(-3)
+        due_soon = self.borrowing(2)
+        self.borrowing(10)
+        self.borrowing(-5, is_active=False)
+
+        with self.assertNumQueries(1):
+            res = client_for(self.staff).get(
+                PROJECTION_URL, {"on": self.today + timedelta(days=4)}
+            )
+
+        self.assertEqual(res.status_code, status.HTTP_200_OK)
+        self.assertEqual(
+            [(row["id"], row["overdue_days"]) for row in res.data["borrowings"]],
+            [(overdue.id, 7), (due_soon.id, 2)],
+        )
+        self.assertEqual(res.data["overdue_borrowings"], 2)
+        self.assertEqual(res.data["projected_overdue_fees"], Decimal("8.91"))
+
+    def test_today_matches_the_fee_formula(self) -> None:
+        overdue = self.borrowing(-4)
+
+        res = client_for(self.staff).get(PROJECTION_URL)
+
+        self.assertEqual(
+            res.data["borrowings"][0]["projected_fee"],
+            calculate_overdue_fee(overdue),
+        )
+
+    def test_past_or_invalid_date(self) -> None:
+        client = client_for(self.staff)
+
+        for on in (self.today - timedelta(days=1), "tomorrow"):
+            with self.subTest(on=on):
+                res = client.get(PROJECTION_URL, {"on": on})
+
+                self.assertEqual(res.status_code, status.HTTP_400_BAD_REQUEST)
+
+    def test_customers_have_no_access(self) -> None:
+        res = client_for(sample_user()).get(PROJECTION_URL)
+
+        self.assertEqual(res.status_code, status.HTTP_403_FORBIDDEN)
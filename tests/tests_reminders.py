@@ -0,0 +1,120 @@
+from datetime import timedelta
+from unittest import mock
+
+from django.test import TestCase, override_settings
+from django.utils import timezone
+
+from borrowings.helpers.fee_accrual import accrue_overdue_fees
+from borrowings.helpers.overdue_alert import (
+    enqueue_reminders_for_range,
+    plan_reminder_chunks,
+)
+from borrowings.models import Borrowing
+from borrowings.tasks import send_overdue_alert_message_task
+from library_service.celery import app as celery_app
+from notifications.models import Notification
+from tests.tests_books import sample_book
+from tests.tests_borrowings import sample_borrowing, sample_user
+
+DELIVER_BATCH = "notifications.helpers.delivery.deliver_batch"
+
+
+def due_in(days: int, **params) -> Borrowing:
+    return sample_borrowing(
+        expected_return_date=timezone.localdate() + timedelta(days=days), **params
+    )
+
+
+class ReminderFanOutTests(TestCase):
+    def setUp(self) -> None:
+        self.today = timezone.localdate()
+        self.users = [sample_user(email=f"user_{index}@mail.com") for index in range(3)]
+        self.books = [sample_book(title=f"Book {index}") for index in range(3)]
+
+    def test_plan_splits_users_with_due_borrowings_into_ranges(self) -> None:
+        for user in self.users:
+            due_in(0, user=user, book=self.books[0])
+            due_in(-1, user=user, book=self.books[1])
+        due_in(5, user=sample_user(email="later@mail.com"), book=self.books[0])
+
+        chunks = plan_reminder_chunks(self.today, chunk_size=2)
+
+        self.assertEqual(
+            chunks,
+            [
+                (self.users[0].id, self.users[1].id),
+                (self.users[2].id, self.users[2].id),
+            ],
+        )
+
+    def test_chunk_queues_one_digest_per_user(self) -> None:
+        user = self.users[0]
+        for days, book in zip((0, 1, -2), self.books):
+            due_in(days, user=user, book=book)
+
+        accrue_overdue_fees(self.today)
+        queued = enqueue_reminders_for_range(user.id, user.id, self.today)
+
+        self.assertEqual(queued, 1)
+        notification = Notification.objects.get(user=user)
+        self.assertEqual(notification.channel, "email")
+        self.assertEqual(notification.address, user.email)
+        self.assertIn("Overdue Alert", notification.message)
+        self.assertIn("<b>Book 0</b>: return <b>today</b>", notification.message)
+        self.assertIn("<b>Book 1</b>: return <b>tomorrow</b>", notification.message)
+        self.assertIn("(2 days, fee $1.98)", notification.message)
+
+    def test_rerunning_a_chunk_does_not_notify_twice(self) -> None:
+        user = self.users[0]
+        borrowing = due_in(-1, user=user, book=self.books[0])
+
+        enqueue_reminders_for_range(user.id, user.id, self.today)
+        enqueue_reminders_for_range(user.id, user.id, self.today)
+
+        self.assertEqual(Notification.objects.count(), 1)
+        borrowing.refresh_from_db()
+        self.assertEqual(borrowing.reminded_on, self.today)
+
+    def test_users_follow_their_channel_preference(self) -> None:
+        telegram_user, silent_user, email_user = self.users
+        telegram_user.notification_channel = "telegram"
+        telegram_user.telegram_chat_id = "12345"
+        telegram_user.save()
+        silent_user.notification_channel = "none"
+        silent_user.save()
+        for user in self.users:
+            due_in(0, user=user, book=self.books[0])
+
+        enqueue_reminders_for_range(self.users[0].id, self.users[-1].id, self.today)
+
+        self.assertEqual(
+            set(Notification.objects.values_list("channel", "address")),
+            {("telegram", "12345"), ("email", email_user.email)},
+        )
+
+
+@override_settings(REMINDER_CHUNK_SIZE=2)
+class ReminderPlannerTaskTests(TestCase):
+    def setUp(self) -> None:
+        celery_app.conf.task_always_eager = True
+
+    def tearDown(self) -> None:
+        celery_app.conf.task_always_eager = False
+
+    @mock.patch(DELIVER_BATCH, side_effect=lambda batch: (batch, []))
+    def test_planner_fans_out_chunk_tasks(self, deliver_batch) -> None:
+        book = sample_book()
+        for index in range(5):
+            due_in(-1, user=sample_user(email=f"user_{index}@mail.com"), book=book)
+
+        chunks = send_overdue_alert_message_task()
+
+        self.assertEqual(chunks, 3)
+        self.assertEqual(
+            Notification.objects.filter(status=Notification.Status.SENT).count(), 5
+        )
+
+    @mock.patch("borrowings.tasks.send_no_overdue_message")
+    def test_planner_without_due_borrowings(self, send_no_overdue) -> None:
+        self.assertEqual(send_overdue_alert_message_task(), 0)
+        send_no_overdue.assert_called_once()
@@ -0,0 +1,93 @@
+import io
+import uuid
+from datetime import date, datetime, time, timedelta, timezone
+from decimal import Decimal
+
+from django.test import SimpleTestCase, TestCase, override_settings
+from django.utils.translation import gettext_lazy
+from rest_framework import status
+from rest_framework.exceptions import ParseError
+from rest_framework.parsers import JSONParser
+from rest_framework.renderers import JSONRenderer
+
+from library_service.parsers import ORJSONParser
+from library_service.renderers import ORJSONRenderer
+from payments.serializers import PaymentDetailSerializer
+from tests.tests_borrowings import sample_user
+from tests.tests_payments import detail_url, sample_payment
+from tests.tests_reservations import client_for
+from tests.tests_throttling import NO_THROTTLING, TOKEN_URL
+
+PAYLOAD = {
+    "amount": Decimal("12.50"),
+    "created_at": datetime(2024, 11, 1, 9, 30, 15, 123456, tzinfo=timezone.utc),
+    "naive": datetime(2024, 11, 1, 9, 30),
+    "date": date(2024, 11, 1),
+    "time": time(9, 30, 15, 500000),
+    "duration": timedelta(days=1, seconds=5),
+    "id": uuid.UUID("12345678-1234-5678-1234-567812345678"),
+    "lazy": gettext_lazy("Borrowing"),
+    "text": "Книга «Кобзар»\u2028line\u2029separator",
+    "numbers": [1, 2.5, None, True],
+    7: "integer key",
+}
+
+
+class ORJSONRendererTests(SimpleTestCase):
+    def test_output_matches_json_renderer(self) -> None:
+        self.assertEqual(
+            ORJSONRenderer().render(PAYLOAD), JSONRenderer().render(PAYLOAD)
+        )
+
+    def test_indented_output_matches_json_renderer(self) -> None:
+        media_type = "application/json; indent=4"
+
+        self.assertEqual(
+            ORJSONRenderer().render(PAYLOAD, media_type),
+            JSONRenderer().render(PAYLOAD, media_type),
+        )
+
+    def test_no_content(self) -> None:
+        self.assertEqual(ORJSONRenderer().render(None), b"")
+
+
+class ORJSONParserTests(SimpleTestCase):
+    def parse(self, body: bytes, parser=None):
+        return (parser or ORJSONParser()).parse(io.BytesIO(body))
+
+    def test_parses_like_json_parser(self) -> None:
+        body = '{"book": 1, "title": "Кобзар", "fee": 1.5, "tags": [null]}'.encode()
+
+        self.assertEqual(self.parse(body), self.parse(body, JSONParser()))
+
+    def test_invalid_json(self) -> None:
+        for body in (b"{", b'{"fee": NaN}', b"\xff"):
+            with self.subTest(body=body), self.assertRaises(ParseError):
+                self.parse(body)
+
+
+class FastJSONApiTests(TestCase):
+    def test_responses_are_rendered_like_before(self) -> None:
+        payment = sample_payment()
+        res = client_for(payment.borrowing.user).get(detail_url(payment.id))
+
+        self.assertEqual(res.status_code, status.HTTP_200_OK)
+        self.assertEqual(
+            res.content,
+            JSONRenderer().render(PaymentDetailSerializer(payment).data),
+        )
+
+    @override_settings(REST_FRAMEWORK=NO_THROTTLING)
+    def test_json_requests_are_parsed(self) -> None:
+        user = sample_user()
+
+        res = self.client.post(
+            TOKEN_URL,
+            {"email": user.email, "password": "1qazcde3"},
+            content_type="application/json",
+        )
+        invalid = self.client.post(TOKEN_URL, b"{", content_type="application/json")
+
+        self.assertEqual(res.status_code, status.HTTP_200_OK)
+        self.assertIn("access", res.json())
+        self.assertEqual(invalid.status_code, status.HTTP_400_BAD_REQUEST)
@@ -0,0 +1,176 @@
+from datetime import timedelta
+from decimal import Decimal
+
+from django.core.cache import cache
+from django.core.management import call_command
+from django.db import connections
+from django.test import TestCase, override_settings
+from django.urls import reverse
+from django.utils import timezone
+from rest_framework import status
+from rest_framework.test import APIClient
+
+from benchmarks.fakes import fake_integrations
+from books.models import Book
+from borrowings.models import Borrowing
+from library_service.db_routers import (
+    ReplicaRouter,
+    is_pinned_to_primary,
+    replica_reads,
+)
+from payments.models import Payment
+from tests.tests_books import BOOK_URL, sample_book
+from tests.tests_borrowings import BORROWING_URL, sample_user
+
+REPLICA = "replica"
+
+
+def replicate(*objects) -> None:
+    """
+    Copies rows to the replica, standing in for streaming replication.
+    """
+    for obj in objects:
+        type(obj).objects.using(REPLICA).bulk_create([obj])
+
+
+@override_settings(DATABASE_REPLICAS=[REPLICA], REPLICA_STICKY_SECONDS=60)
+class ReplicaRoutingTests(TestCase):
+    """
+    The replica is a separate in-memory database that only receives rows
+    through `replicate()`, so anything written since then is invisible there,
+    like on a lagging replica.
+    """
+
+    # Resolved in setUpClass, after the replica connection has been added
+    databases = "__all__"
+
+    @classmethod
+    def setUpClass(cls):
+        connections.settings[REPLICA] = {
+            **connections.settings["default"],
+            "NAME": ":memory:",
+            "ENGINE": "django.db.backends.sqlite3",
+        }
+        call_command("migrate", database=REPLICA, verbosity=0)
+        super().setUpClass()
+
+    @classmethod
+    def tearDownClass(cls):
+        super().tearDownClass()
+        connections[REPLICA].close()
+        del connections[REPLICA]
+        del connections.settings[REPLICA]
+
+    def setUp(self) -> None:
+        cache.clear()
+        self.user = sample_user()
+        self.client = APIClient()
+        self.client.force_authenticate(self.user)
+        self.book = sample_book(title="Replicated")
+        replicate(self.user, self.book, *self.book.availability.all())
+
+    def test_router_uses_replica_only_inside_replica_reads(self) -> None:
+        router = ReplicaRouter()
+
+        self.assertIsNone(router.db_for_read(Book))
+        with replica_reads():
+            self.assertEqual(router.db_for_read(Book), REPLICA)
+            self.assertEqual(router.db_for_write(Book), "default")
+        self.assertFalse(router.allow_migrate(REPLICA, "books"))
+
+    def test_catalogue_is_read_from_replica(self) -> None:
+        sample_book(title="Not replicated yet")
+
+        res = APIClient().get(BOOK_URL)
+
+        self.assertEqual(
+            [book["title"] for book in res.data["results"]], ["Replicated"]
+        )
+
+    def test_user_reads_own_writes_after_borrowing(self) -> None:
+        with fake_integrations():
+            res = self.client.post(
+                BORROWING_URL,
+                {
+                    "book": self.book.id,
+                    "expected_return_date": timezone.localdate() + timedelta(days=3),
+                },
+            )
+        self.assertEqual(res.status_code, status.HTTP_201_CREATED)
+
+        own = self.client.get(BORROWING_URL)
+        other_client = APIClient()
+        other_client.force_authenticate(sample_user(email="other@mail.com"))
+        other = other_client.get(BOOK_URL)
+
+        self.assertEqual(own.data["count"], 1)
+        # The other user is not pinned and still sees the replica's stale copy count
+        self.assertEqual(other.data["results"][0]["copies"], 3)
+
+    def test_reads_return_to_replica_after_the_sticky_window(self) -> None:
+        borrowing = Borrowing.objects.create(
+            user=self.user,
+            book=self.book,
+            expected_return_date=timezone.localdate() + timedelta(days=3),
+        )
+        with fake_integrations():
+            self.client.post(
+                reverse("borrowing:borrowing-return-book", args=(borrowing.id,))
+            )
+        self.assertEqual(self.client.get(BORROWING_URL).data["count"], 1)
+
+        cache.clear()
+
+        self.assertEqual(self.client.get(BORROWING_URL).data["count"], 0)
+
+    def test_failed_write_does_not_pin(self) -> None:
+        res = self.client.post(BORROWING_URL, {"book": self.book.id})
+        self.assertEqual(res.status_code, status.HTTP_400_BAD_REQUEST)
+
+        Borrowing.objects.create(
+            user=self.user,
+            book=self.book,
+            expected_return_date=timezone.localdate() + timedelta(days=3),
+        )
+
+        self.assertEqual(self.client.get(BORROWING_URL).data["count"], 0)
+
+    def test_payment_success_pins_the_payment_owner(self) -> None:
+        payment = Payment.objects.create(
+            borrowing=Borrowing.objects.create(
+                user=self.user,
+                book=self.book,
+                expected_return_date=timezone.localdate() + timedelta(days=3),
+            ),
+            session_url="test_url",
+            session_id="test_session_id",
+            amount_to_pay=Decimal("9.99"),
+        )
+
+        # Stripe redirects the browser here without the user's token
+        with fake_integrations():
+            APIClient().get(
+                reverse("payment:checkout-success"),
+                {"session_id": payment.session_id},
+            )
+
+        self.assertTrue(is_pinned_to_primary(self.user))
+        self.assertEqual(self.client.get(BORROWING_URL).data["count"], 1)
+
+    def test_quote_does_not_pin(self) -> None:
+        res = self.client.post(
+            reverse("borrowing:borrowing-quote"),
+            {
+                "items": [
+                    {
+                        "book": self.book.id,
+                        "expected_return_date": timezone.localdate()
+                        + timedelta(days=3),
+                    }
+                ]
+            },
+            format="json",
+        )
+
+        self.assertEqual(res.status_code, status.HTTP_200_OK)
+        self.assertFalse(is_pinned_to_primary(self.user))
@@ -0,0 +1,295 @@
+from concurrent.futures import ThreadPoolExecutor
+from datetime import timedelta
+from unittest import mock, skipUnless
+
+from django.db import connection
+from django.test import TestCase, TransactionTestCase
+from django.urls import reverse
+from django.utils import timezone
+from rest_framework import status
+from rest_framework.test import APIClient
+
+from benchmarks.fakes import fake_integrations
+from books.models import BookCopy
+from borrowings.helpers.reservations import expire_holds
+from borrowings.models import Borrowing, Reservation
+from notifications.models import Notification
+from tests.tests_books import sample_book
+from tests.tests_borrowings import BORROWING_URL, sample_borrowing, sample_user
+
+RESERVATION_URL = reverse("borrowing:reservation-list")
+DELIVERY_TASK = "borrowings.helpers.reservations.deliver_notifications_task"
+
+
+def return_url(borrowing_id):
+    return reverse("borrowing:borrowing-return-book", args=(borrowing_id,))
+
+
+def reservation_url(reservation_id):
+    return reverse("borrowing:reservation-detail", args=(reservation_id,))
+
+
+def client_for(user) -> APIClient:
+    client = APIClient()
+    client.force_authenticate(user)
+    return client
+
+
+def borrow(client, book):
+    return client.post(
+        BORROWING_URL,
+        {
+            "book": book.id,
+            "expected_return_date": timezone.localdate() + timedelta(days=7),
+        },
+    )
+
+
+class ReservationQueueTests(TestCase):
+    def setUp(self) -> None:
+        self.book = sample_book(copies=1)
+        self.book.availability.update(available=0)
+        self.borrower = sample_user(email="borrower@mail.com")
+        self.borrowing = sample_borrowing(
+            user=self.borrower,
+            book=self.book,
+            expected_return_date=timezone.localdate() + timedelta(days=3),
+        )
+        self.waiters = [
+            sample_user(email=f"waiter_{index}@mail.com") for index in range(3)
+        ]
+        self.clients = [client_for(waiter) for waiter in self.waiters]
+
+    def reserve_all(self) -> list:
+        return [
+            client.post(RESERVATION_URL, {"book": self.book.id}).data["id"]
+            for client in self.clients
+        ]
+
+    def return_copy(self):
+        with fake_integrations():
+            return client_for(self.borrower).post(return_url(self.borrowing.id))
+
+    def test_reserve_out_of_stock_book(self) -> None:
+        res = self.clients[0].post(RESERVATION_URL, {"book": self.book.id})
+
+        self.assertEqual(res.status_code, status.HTTP_201_CREATED)
+        self.assertEqual(res.data["status"], "waiting")
+        self.assertEqual(res.data["position"], 1)
+
+    def test_reserve_available_book_is_rejected(self) -> None:
+        book = sample_book(title="On the shelf", copies=1)
+
+        res = self.clients[0].post(RESERVATION_URL, {"book": book.id})
+
+        self.assertEqual(res.status_code, status.HTTP_400_BAD_REQUEST)
+
+    def test_reserve_twice_is_rejected(self) -> None:
+        self.clients[0].post(RESERVATION_URL, {"book": self.book.id})
+
+        res = self.clients[0].post(RESERVATION_URL, {"book": self.book.id})
+
+        self.assertEqual(res.status_code, status.HTTP_400_BAD_REQUEST)
+
+    def test_returned_copy_is_held_for_the_head_of_the_queue(self) -> None:
+        first, second, third = self.reserve_all()
+
+        self.return_copy()
+
+        self.assertEqual(self.book.available_copies, 0)
+        held = Reservation.objects.get(pk=first)
+        self.assertEqual(held.status, Reservation.Status.READY)
+        self.assertGreater(held.hold_expires_at, timezone.now())
+        notification = Notification.objects.get(user=self.waiters[0])
+        self.assertEqual(notification.dedup_key, f"reservation-ready:{first}")
+        self.assertEqual(
+            [
+                self.clients[index]
+                .get(reservation_url(reservation_id))
+                .data["position"]
+                for index, reservation_id in ((1, second), (2, third))
+            ],
+            [1, 2],
+        )
+
+    def test_only_the_holder_can_borrow_the_held_copy(self) -> None:
+        first, _, _ = self.reserve_all()
+        self.return_copy()
+
+        with fake_integrations():
+            rejected = borrow(self.clients[1], self.book)
+            accepted = borrow(self.clients[0], self.book)
+
+        self.assertEqual(rejected.status_code, status.HTTP_400_BAD_REQUEST)
+        self.assertEqual(accepted.status_code, status.HTTP_201_CREATED)
+        self.assertEqual(
+            Reservation.objects.get(pk=first).status, Reservation.Status.FULFILLED
+        )
+        self.assertEqual(self.book.available_copies, 0)
+
+    def test_expired_hold_passes_to_the_next_user(self) -> None:
+        first, second, _ = self.reserve_all()
+        self.return_copy()
+        Reservation.objects.filter(pk=first).update(
+            hold_expires_at=timezone.now() - timedelta(minutes=1)
+        )
+
+        self.assertEqual(expire_holds(), 1)
+
+        self.assertEqual(
+            Reservation.objects.get(pk=first).status, Reservation.Status.EXPIRED
+        )
+        self.assertEqual(
+            Reservation.objects.get(pk=second).status, Reservation.Status.READY
+        )
+
+    def test_new_copies_are_held_for_the_queue_first(self) -> None:
+        self.reserve_all()
+
+        self.book.copies = 3
+        self.book.save()
+
+        self.assertEqual(
+            list(
+                Reservation.objects.order_by("id").values_list("status", "copy__status")
+            ),
+            [
+                (Reservation.Status.READY, BookCopy.Status.HELD),
+                (Reservation.Status.READY, BookCopy.Status.HELD),
+                (Reservation.Status.WAITING, None),
+            ],
+        )
+        self.assertEqual(self.book.available_copies, 0)
+
+        self.book.copies = 5
+        self.book.save()
+
+        self.assertFalse(
+            Reservation.objects.filter(status=Reservation.Status.WAITING).exists()
+        )
+        self.assertEqual(self.book.available_copies, 1)
+
+    def test_second_return_hands_over_nothing(self) -> None:
+        first, second, _ = self.reserve_all()
+
+        responses = [self.return_copy() for _ in range(2)]
+
+        self.assertEqual(
+            [res.status_code for res in responses],
+            [status.HTTP_200_OK, status.HTTP_400_BAD_REQUEST],
+        )
+        self.assertEqual(self.book.available_copies, 0)
+        self.assertEqual(
+            Reservation.objects.get(pk=first).status, Reservation.Status.READY
+        )
+        self.assertEqual(
+            Reservation.objects.get(pk=second).status, Reservation.Status.WAITING
+        )
+
+    def test_cancelled_hold_goes_back_on_the_shelf_without_waiters(self) -> None:
+        reservation_id = (
+            self.clients[0].post(RESERVATION_URL, {"book": self.book.id}).data["id"]
+        )
+        self.return_copy()
+
+        res = self.clients[0].delete(reservation_url(reservation_id))
+
+        self.assertEqual(res.status_code, status.HTTP_204_NO_CONTENT)
+        self.assertEqual(self.book.available_copies, 1)
+
+    def test_customers_see_only_their_reservations(self) -> None:
+        self.reserve_all()
+
+        res = self.clients[0].get(RESERVATION_URL)
+
+        self.assertEqual(res.data["count"], 1)
+
+
+@skipUnless(
+    connection.vendor == "postgresql", "Concurrent row locks require PostgreSQL"
+)
+@mock.patch(DELIVERY_TASK)
+class ReservationConcurrencyTests(TransactionTestCase):
+    waiters = 30
+    returned_copies = 5
+
+    def run_concurrently(self, function, arguments) -> list:
+        def call(argument):
+            try:
+                return function(argument)
+            finally:
+                connection.close()
+
+        with fake_integrations(), ThreadPoolExecutor(max_workers=10) as executor:
+            return list(executor.map(call, arguments))
+
+    def test_many_waiters_on_one_title(self, deliver_task) -> None:
+        book = sample_book(copies=self.returned_copies)
+        book.availability.update(available=0)
+        borrowings = [
+            sample_borrowing(
+                user=sample_user(email=f"borrower_{index}@mail.com"),
+                book=book,
+                expected_return_date=timezone.localdate() + timedelta(days=3),
+            )
+            for index in range(self.returned_copies)
+        ]
+        waiters = [
+            sample_user(email=f"waiter_{index}@mail.com")
+            for index in range(self.waiters)
+        ]
+
+        reserved = self.run_concurrently(
+            lambda user: client_for(user).post(RESERVATION_URL, {"book": book.id}),
+            waiters,
+        )
+        self.run_concurrently(
+            lambda borrowing: client_for(borrowing.user).post(return_url(borrowing.id)),
+            borrowings,
+        )
+        borrowed = self.run_concurrently(
+            lambda user: borrow(client_for(user), book), waiters
+        )
+
+        self.assertTrue(all(res.status_code == 201 for res in reserved))
+        first_in_queue = set(
+            Reservation.objects.order_by("id").values_list("user_id", flat=True)[
+                : self.returned_copies
+            ]
+        )
+        winners = {
+            user.id
+            for user, res in zip(waiters, borrowed)
+            if res.status_code == status.HTTP_201_CREATED
+        }
+        self.assertEqual(winners, first_in_queue)
+        self.assertEqual(
+            Borrowing.objects.filter(book=book, is_active=True).count(),
+            self.returned_copies,
+        )
+        self.assertEqual(book.available_copies, 0)
+
+    def test_concurrent_returns_of_one_borrowing(self, deliver_task) -> None:
+        book = sample_book(copies=1)
+        book.availability.update(available=0)
+        borrowing = sample_borrowing(
+            user=sample_user(email="borrower@mail.com"),
+            book=book,
+            expected_return_date=timezone.localdate() + timedelta(days=3),
+        )
+        client_for(sample_user(email="waiter@mail.com")).post(
+            RESERVATION_URL, {"book": book.id}
+        )
+
+        returned = self.run_concurrently(
+            lambda _: client_for(borrowing.user).post(return_url(borrowing.id)),
+            range(self.waiters),
+        )
+
+        self.assertEqual(
+            sum(res.status_code == status.HTTP_200_OK for res in returned), 1
+        )
+        self.assertEqual(
+            Reservation.objects.filter(status=Reservation.Status.READY).count(), 1
+        )
+        self.assertEqual(book.available_copies, 0)
@@ -0,0 +1,75 @@
+import json
+import tempfile
+from io import StringIO
+from pathlib import Path
+
+from django.core.management import call_command
+from django.test import TestCase, override_settings
+from django.urls import reverse
+from drf_spectacular.views import SpectacularAPIView
+from rest_framework import status
+from rest_framework.test import APIRequestFactory
+
+from library_service.schema import rendered_schema
+
+SCHEMA_URL = reverse("schema")
+
+
+class SchemaTests(TestCase):
+    def setUp(self) -> None:
+        directory = tempfile.TemporaryDirectory()
+        self.addCleanup(directory.cleanup)
+        self.schema_file = Path(directory.name) / "schema.json"
+
+        settings_override = override_settings(API_SCHEMA_FILE=self.schema_file)
+        settings_override.enable()
+        self.addCleanup(settings_override.disable)
+
+        rendered_schema.cache_clear()
+        self.addCleanup(rendered_schema.cache_clear)
+
+    def test_generate_schema_command_writes_the_file(self) -> None:
+        call_command("generate_schema", stdout=StringIO())
+
+        schema = json.loads(self.schema_file.read_text())
+        self.assertIn("/api/books/", schema["paths"])
+
+    def test_served_schema_matches_introspected_schema(self) -> None:
+        call_command("generate_schema", stdout=StringIO())
+        introspected = SpectacularAPIView.as_view()(APIRequestFactory().get(SCHEMA_URL))
+        introspected.render()
+
+        res = self.client.get(SCHEMA_URL)
+
+        self.assertEqual(res.status_code, status.HTTP_200_OK)
+        self.assertEqual(res.content, introspected.content)
+
+    def test_schema_is_read_from_the_file(self) -> None:
+        self.schema_file.write_text(json.dumps({"openapi": "3.0.3", "paths": {}}))
+
+        res = self.client.get(SCHEMA_URL, {"format": "json"})
+
+        self.assertEqual(json.loads(res.content), {"openapi": "3.0.3", "paths": {}})
+        self.assertEqual(res["Content-Type"], "application/vnd.oai.openapi+json")
+
+    def test_caching_headers_and_revalidation(self) -> None:
+        res = self.client.get(SCHEMA_URL)
+
+        self.assertIn("public", res["Cache-Control"])
+        self.assertIn("max-age", res["Cache-Control"])
+        self.assertEqual(res["Vary"], "Accept, Accept-Encoding")
+
+        revalidated = self.client.get(SCHEMA_URL, HTTP_IF_NONE_MATCH=res["ETag"])
+
+        self.assertEqual(revalidated.status_code, status.HTTP_304_NOT_MODIFIED)
+        self.assertEqual(revalidated.content, b"")
+
+    def test_formats_have_their_own_etag(self) -> None:
+        yaml_etag = self.client.get(SCHEMA_URL)["ETag"]
+
+        res = self.client.get(
+            SCHEMA_URL, HTTP_ACCEPT="application/json", HTTP_IF_NONE_MATCH=yaml_etag
+        )
+
+        self.assertEqual(res.status_code, status.HTTP_200_OK)
+        self.assertNotEqual(res["ETag"], yaml_etag)
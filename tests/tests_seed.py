@@ -0,0 +1,135 @@
+from io import StringIO
+from unittest import skipIf
+
+from django.contrib.auth import get_user_model
+from django.core.management import call_command, CommandError
+from django.db import connection
+from django.db.models import AutoField, NOT_PROVIDED
+from django.test import SimpleTestCase, TestCase
+from django.utils import timezone
+
+from books.models import Book, BookAvailability, BookCopy
+from borrowings.helpers import seeding
+from borrowings.models import Borrowing
+from payments.models import Payment
+
+
+def seed(**options) -> str:
+    out = StringIO()
+    defaults = {"users": 20, "books": 10, "borrowings": 200, "seed": 7}
+    defaults.update(options)
+    call_command("seed", stdout=out, **defaults)
+    return out.getvalue()
+
+
+def borrowing_history():
+    return list(
+        Borrowing.objects.order_by("id").values_list(
+            "borrow_date", "expected_return_date", "actual_return_date", "is_active"
+        )
+    )
+
+
+class SeedCommandTests(TestCase):
+    def test_seed_creates_requested_rows(self) -> None:
+        output = seed(batch_size=64)
+
+        self.assertEqual(get_user_model().objects.count(), 20)
+        self.assertEqual(Book.objects.count(), 10)
+        self.assertEqual(Borrowing.objects.count(), 200)
+        self.assertEqual(
+            Payment.objects.filter(
+                payment_type=Payment.PaymentType.BORROWING_PAYMENT
+            ).count(),
+            200,
+        )
+        self.assertIn("Seeded", output)
+
+    def test_seed_is_deterministic(self) -> None:
+        seed()
+        first_run = borrowing_history()
+
+        Borrowing.objects.all().delete()
+        seed()
+
+        self.assertEqual(borrowing_history()[-200:], first_run)
+
+    def test_seed_generates_realistic_history(self) -> None:
+        seed(borrowings=500)
+        today = timezone.localdate()
+
+        returned = Borrowing.objects.filter(is_active=False)
+        self.assertTrue(returned.exists())
+        self.assertFalse(returned.filter(actual_return_date__isnull=True).exists())
+        self.assertTrue(
+            Borrowing.objects.filter(
+                is_active=True, expected_return_date__lt=today
+            ).exists()
+        )
+        for borrowing in Borrowing.objects.filter(
+            payments__payment_type="overdue_fee_payment"
+        ):
+            self.assertGreater(
+                borrowing.actual_return_date, borrowing.expected_return_date
+            )
+
+    def test_seed_takes_active_loans_off_the_shelf(self) -> None:
+        # Few books, so some run out of copies
+        seed(books=2, borrowings=500)
+
+        for book in Book.objects.all():
+            active = book.borrowings.filter(is_active=True)
+            with self.subTest(book=book.id):
+                self.assertLessEqual(active.count(), book.copies)
+                self.assertEqual(
+                    BookAvailability.objects.counts([book.id]),
+                    [(book.id, book.copies - active.count())],
+                )
+                self.assertEqual(
+                    set(
+                        book.book_copies.filter(
+                            status=BookCopy.Status.BORROWED
+                        ).values_list("id", flat=True)
+                    ),
+                    set(active.values_list("copy_id", flat=True)),
+                )
+
+    def test_seed_continues_after_existing_rows(self) -> None:
+        seed()
+        seed()
+        self.assertEqual(Borrowing.objects.count(), 400)
+        # Sequences are reset, so ordinary inserts keep working
+        Book.objects.create(
+            title="After seed", author="Author", cover="Hard", copies=1, daily_fee=1
+        )
+
+    @skipIf(connection.vendor == "postgresql", "COPY is available on PostgreSQL")
+    def test_seed_copy_requires_postgresql(self) -> None:
+        with self.assertRaises(CommandError):
+            seed(method="copy")
+
+
+class CopyColumnsTests(SimpleTestCase):
+    def test_columns_cover_required_fields(self) -> None:
+        # Rows written with COPY get the database default of every column left
+        # out of the list, or NULL without one, so NOT NULL columns need either
+        column_lists = {
+            get_user_model(): seeding.USER_COLUMNS,
+            Book: seeding.BOOK_COLUMNS,
+            BookAvailability: seeding.AVAILABILITY_COLUMNS,
+            BookCopy: seeding.COPY_COLUMNS,
+            Borrowing: seeding.BORROWING_COLUMNS,
+            Payment: seeding.PAYMENT_COLUMNS,
+        }
+
+        for model, columns in column_lists.items():
+            with self.subTest(model=model.__name__):
+                required = {
+                    field.column
+                    for field in model._meta.concrete_fields
+                    if not field.null
+                    and field.db_default is NOT_PROVIDED
+                    and not isinstance(field, AutoField)
+                }
+
+                self.assertLessEqual(required, set(columns))
@@ -0,0 +1,135 @@
+from decimal import Decimal
+
+from django.contrib.auth import get_user_model
+from django.db import connection
+from django.test import TestCase
+from django.test.utils import CaptureQueriesContext
+from rest_framework import status
+from rest_framework.test import APIClient
+
+from payments.models import Payment
+from tests.tests_books import BOOK_URL, detail_url as book_url, sample_book
+from tests.tests_borrowings import BORROWING_URL, sample_borrowing, sample_user
+from tests.tests_payments import PAYMENT_URL, detail_url as payment_url
+from tests.tests_reservations import client_for
+
+
+def borrowing_url(borrowing_id: int) -> str:
+    return f"{BORROWING_URL}{borrowing_id}/"
+
+
+class SparseFieldsTests(TestCase):
+    def setUp(self) -> None:
+        self.staff = get_user_model().objects.create_user(
+            email="staff@mail.com", password="1qazcde3", is_staff=True
+        )
+        self.client = APIClient()
+        self.client.force_authenticate(self.staff)
+        self.rows = 0
+        self.add_rows(2)
+
+    def add_rows(self, count: int) -> None:
+        for _ in range(count):
+            self.rows += 1
+            borrowing = sample_borrowing(
+                user=sample_user(email=f"user{self.rows}@mail.com"),
+                book=sample_book(title=f"Book {self.rows}"),
+            )
+            Payment.objects.create(
+                borrowing=borrowing,
+                session_url="test_url",
+                session_id=f"session_{self.rows}",
+                amount_to_pay=Decimal("9.99"),
+            )
+
+    def get(self, url: str, **params):
+        with CaptureQueriesContext(connection) as queries:
+            res = self.client.get(url, params)
+        self.assertEqual(res.status_code, status.HTTP_200_OK, res.content)
+        return res, [query["sql"] for query in queries]
+
+    def test_book_list_fields(self) -> None:
+        res, queries = self.get(BOOK_URL, fields="id,title")
+
+        self.assertEqual(list(res.data["results"][0]), ["id", "title"])
+        self.assertNotIn("availability", queries[-1])
+        self.assertNotIn("author", queries[-1])
+
+    def test_book_detail_fields(self) -> None:
+        book = sample_book(title="Detail")
+
+        res, queries = self.get(book_url(book.id), fields="title,available_copies")
+
+        self.assertEqual(res.data, {"title": "Detail", "available_copies": 3})
+        self.assertNotIn("daily_fee", queries[0])
+
+    def test_unknown_fields_are_rejected(self) -> None:
+        for params in ({"fields": "id,password"}, {"expand": "user"}):
+            with self.subTest(params=params):
+                res = self.client.get(BORROWING_URL, params)
+
+                self.assertEqual(res.status_code, status.HTTP_400_BAD_REQUEST)
+
+    def test_borrowing_detail_collapsed(self) -> None:
+        borrowing = sample_borrowing(book=sample_book(title="Collapsed"))
+
+        res, queries = self.get(
+            borrowing_url(borrowing.id), fields="id,book", expand=""
+        )
+
+        self.assertEqual(res.data, {"id": borrowing.id, "book": "Collapsed"})
+        self.assertEqual(len(queries), 1)
+        self.assertNotIn("daily_fee", queries[0])
+        self.assertNotIn("expected_return_date", queries[0])
+
+    def test_borrowing_list_expanded(self) -> None:
+        res, queries = self.get(BORROWING_URL, fields="id,book", expand="book")
+
+        self.assertEqual(
+            set(res.data["results"][0]["book"]),
+            {
+                "id",
+                "title",
+                "author",
+                "cover",
+                "copies",
+                "available_copies",
+                "daily_fee",
+            },
+        )
+        self.assertEqual(res.data["results"][0]["book"]["available_copies"], 3)
+
+        self.add_rows(3)
+        self.assertEqual(
+            len(self.get(BORROWING_URL, fields="id,book", expand="book")[1]),
+            len(queries),
+        )
+
+    def test_payment_list_expanded(self) -> None:
+        res, queries = self.get(PAYMENT_URL, fields="id,borrowing", expand="borrowing")
+
+        borrowing = res.data["results"][0]["borrowing"]
+        self.assertEqual(borrowing["book"], "Book 1")
+        self.assertNotIn("session_url", queries[-1])
+
+        self.add_rows(3)
+        self.assertEqual(
+            len(self.get(PAYMENT_URL, fields="id,borrowing", expand="borrowing")[1]),
+            len(queries),
+        )
+
+    def test_payment_detail_collapsed(self) -> None:
+        payment = Payment.objects.first()
+
+        res, queries = self.get(payment_url(payment.id), expand="")
+
+        self.assertEqual(res.data["borrowing"], payment.borrowing_id)
+        self.assertEqual(len(queries), 1)
+
+    def test_customer_fields(self) -> None:
+        user = sample_user(email="customer@mail.com")
+        sample_borrowing(user=user, book=sample_book(title="Own"))
+
+        res = client_for(user).get(BORROWING_URL, {"fields": "book"})
+
+        self.assertEqual(res.data["results"], [{"book": "Own"}])
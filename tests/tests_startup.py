@@ -0,0 +1,63 @@
+import os
+import subprocess
+import sys
+
+from django.conf import settings
+from django.test import SimpleTestCase
+
+# Imported on first use, never while a process starts
+LAZY_MODULES = ("stripe", "drf_spectacular.views", "debug_toolbar")
+
+WEB_WORKER = """
+from django.core.wsgi import get_wsgi_application
+from django.urls import get_resolver
+
+get_wsgi_application()
+get_resolver().url_patterns
+"""
+
+CELERY_WORKER = """
+import django
+
+django.setup()
+
+from library_service.celery import app
+
+app.loader.import_default_modules()
+"""
+
+
+def imported_modules(code: str) -> set[str]:
+    """
+    Runs `code` in a fresh production-like interpreter and returns the
+    modules it imported, as listed by `python -X importtime`.
+    """
+    result = subprocess.run(
+        [sys.executable, "-X", "importtime", "-c", code],
+        cwd=settings.BASE_DIR,
+        env={**os.environ, "DEBUG": "False"},
+        capture_output=True,
+        text=True,
+        check=True,
+    )
+    # Lines look like "import time: self [us] | cumulative | <indent>package"
+    return {
+        line.split("|")[-1].strip()
+        for line in result.stderr.splitlines()
+        if line.startswith("import time:") and "|" in line
+    }
+
+
+class StartupTests(SimpleTestCase):
+    def assert_lazy_modules_not_imported(self, code: str) -> None:
+        imported = imported_modules(code)
+
+        for module in LAZY_MODULES:
+            with self.subTest(module=module):
+                self.assertNotIn(module, imported)
+
+    def test_web_worker_startup(self) -> None:
+        self.assert_lazy_modules_not_imported(WEB_WORKER)
+
+    def test_celery_worker_startup(self) -> None:
+        self.assert_lazy_modules_not_imported(CELERY_WORKER)
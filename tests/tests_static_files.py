@@ -0,0 +1,14 @@
+from django.conf import settings
+from django.test import Client, SimpleTestCase, override_settings
+
+
+class StaticFilesTests(SimpleTestCase):
+    # Finds the files in the apps, as `collectstatic` does not run in tests
+    @override_settings(WHITENOISE_USE_FINDERS=True)
+    def test_admin_assets_are_served_without_debug(self) -> None:
+        self.assertFalse(settings.DEBUG)
+
+        res = Client().get("/static/admin/css/base.css")
+
+        self.assertEqual(res.status_code, 200)
+        self.assertTrue(res["Content-Type"].startswith("text/css"))
@@ -0,0 +1,176 @@
+import os
+import uuid
+from concurrent.futures import ThreadPoolExecutor
+from unittest import mock, skipUnless
+
+from django.conf import settings
+from django.test import SimpleTestCase, TestCase, override_settings
+from django.urls import reverse
+from rest_framework import status
+from rest_framework.test import APIClient
+
+from library_service.throttling import (
+    LocMemRateLimitBackend,
+    RedisRateLimitBackend,
+    get_backend,
+    parse_rate,
+)
+from tests.tests_borrowings import BORROWING_URL, sample_user
+from tests.tests_payments import sample_payment
+
+TOKEN_URL = reverse("user:token_obtain_pair")
+
+# For tests of other features that send many writes as one user
+NO_THROTTLING = {**settings.REST_FRAMEWORK, "DEFAULT_THROTTLE_RATES": {}}
+
+RATES = {
+    **settings.REST_FRAMEWORK,
+    "DEFAULT_THROTTLE_RATES": {
+        "borrowing_create": "2/min",
+        "payment_renew": "2/min",
+        "login": "2/min",
+    },
+}
+
+
+def concurrent_hits(backend, key: str, requests: int, limit: int) -> int:
+    with ThreadPoolExecutor(max_workers=16) as executor:
+        waits = executor.map(lambda _: backend.hit(key, limit, 60), range(requests))
+    return sum(1 for wait in waits if wait == 0)
+
+
+@override_settings(REST_FRAMEWORK=RATES)
+class ThrottlingTests(TestCase):
+    def setUp(self) -> None:
+        get_backend().clear()
+        self.addCleanup(get_backend().clear)
+        self.user = sample_user()
+        self.client = APIClient()
+        self.client.force_authenticate(self.user)
+
+    def test_borrowing_create_is_limited_per_user(self) -> None:
+        codes = [self.client.post(BORROWING_URL).status_code for _ in range(3)]
+
+        self.assertEqual(
+            codes,
+            [
+                status.HTTP_400_BAD_REQUEST,
+                status.HTTP_400_BAD_REQUEST,
+                status.HTTP_429_TOO_MANY_REQUESTS,
+            ],
+        )
+        other = APIClient()
+        other.force_authenticate(sample_user(email="other@mail.com"))
+        self.assertEqual(
+            other.post(BORROWING_URL).status_code, status.HTTP_400_BAD_REQUEST
+        )
+
+    def test_throttled_response_has_retry_after(self) -> None:
+        for _ in range(2):
+            self.client.post(BORROWING_URL)
+
+        res = self.client.post(BORROWING_URL)
+
+        self.assertEqual(res.status_code, status.HTTP_429_TOO_MANY_REQUESTS)
+        self.assertLessEqual(int(res["Retry-After"]), 60)
+
+    def test_reads_are_not_limited(self) -> None:
+        for _ in range(5):
+            self.assertEqual(
+                self.client.get(BORROWING_URL).status_code, status.HTTP_200_OK
+            )
+
+    def test_login_is_limited_per_client_ip(self) -> None:
+        anonymous = APIClient()
+
+        codes = [
+            anonymous.post(
+                TOKEN_URL,
+                {"email": f"user{index}@mail.com", "password": "wrong"},
+                # Forwarded-for entries sent by the client itself are ignored
+                HTTP_X_FORWARDED_FOR=f"10.0.0.{index}",
+            ).status_code
+            for index in range(3)
+        ]
+
+        self.assertEqual(
+            codes,
+            [
+                status.HTTP_401_UNAUTHORIZED,
+                status.HTTP_401_UNAUTHORIZED,
+                status.HTTP_429_TOO_MANY_REQUESTS,
+            ],
+        )
+
+    def test_login_is_limited_per_email(self) -> None:
+        credentials = {"email": self.user.email.upper(), "password": "wrong"}
+
+        codes = [
+            APIClient()
+            .post(TOKEN_URL, credentials, REMOTE_ADDR=f"10.0.0.{index}")
+            .status_code
+            for index in range(3)
+        ]
+
+        self.assertEqual(codes[-1], status.HTTP_429_TOO_MANY_REQUESTS)
+
+    def test_payment_renew_is_limited(self) -> None:
+        payment = sample_payment(user=self.user)
+        url = reverse("payment:checkout-renew", args=(payment.id,))
+
+        codes = [self.client.post(url).status_code for _ in range(3)]
+
+        # A pending session is not renewed, the limit applies all the same
+        self.assertEqual(
+            codes,
+            [
+                status.HTTP_404_NOT_FOUND,
+                status.HTTP_404_NOT_FOUND,
+                status.HTTP_429_TOO_MANY_REQUESTS,
+            ],
+        )
+
+
+class SlidingWindowTests(SimpleTestCase):
+    def test_parse_rate(self) -> None:
+        self.assertEqual(parse_rate("10/min"), (10, 60))
+        self.assertEqual(parse_rate("100/hour"), (100, 3600))
+
+    def test_window_slides(self) -> None:
+        backend = LocMemRateLimitBackend()
+        with mock.patch("library_service.throttling.time.monotonic") as monotonic:
+            monotonic.return_value = 0
+            backend.hit("key", 2, 60)
+            monotonic.return_value = 30
+            backend.hit("key", 2, 60)
+
+            monotonic.return_value = 45
+            self.assertEqual(backend.hit("key", 2, 60), 15)
+
+            # The first request has left the window, the second is still in it
+            monotonic.return_value = 61
+            self.assertEqual(backend.hit("key", 2, 60), 0)
+            self.assertEqual(backend.hit("key", 2, 60), 29)
+
+    def test_concurrent_hits_respect_the_limit(self) -> None:
+        backend = LocMemRateLimitBackend()
+
+        self.assertEqual(concurrent_hits(backend, "key", requests=200, limit=10), 10)
+
+
+@skipUnless(os.getenv("RATE_LIMIT_REDIS_URL"), "Set RATE_LIMIT_REDIS_URL to test Redis")
+class RedisRateLimitBackendTests(SimpleTestCase):
+    def setUp(self) -> None:
+        self.backend = RedisRateLimitBackend(os.getenv("RATE_LIMIT_REDIS_URL"))
+        self.key = f"throttle:test:{uuid.uuid4().hex}"
+        self.addCleanup(self.backend.client.delete, self.key)
+
+    def test_concurrent_hits_respect_the_limit(self) -> None:
+        self.assertEqual(
+            concurrent_hits(self.backend, self.key, requests=200, limit=10), 10
+        )
+
+    def test_wait_until_the_oldest_request_leaves_the_window(self) -> None:
+        self.backend.hit(self.key, 1, 60)
+
+        self.assertGreater(self.backend.hit(self.key, 1, 60), 59)
@@ -0,0 +1,36 @@
+from django.conf import settings
+from django.contrib.auth.hashers import (
+    Argon2PasswordHasher,
+    ScryptPasswordHasher,
+)
+
+
+class TunedArgon2PasswordHasher(Argon2PasswordHasher):
+    """
+    Argon2id with the costs of the ARGON2_* settings. Django's defaults take
+    100 MiB per hash, too much for many logins at once on a small worker.
+    Hashes made with other costs are upgraded on the user's next login.
+    """
+
+    @property
+    def time_cost(self) -> int:
+        return settings.ARGON2_TIME_COST
+
+    @property
+    def memory_cost(self) -> int:
+        return settings.ARGON2_MEMORY_COST
+
+    @property
+    def parallelism(self) -> int:
+        return settings.ARGON2_PARALLELISM
+
+
+class TunedScryptPasswordHasher(ScryptPasswordHasher):
+    """
+    scrypt with the work factor of SCRYPT_WORK_FACTOR, for deployments
+    without argon2-cffi.
+    """
+
+    @property
+    def work_factor(self) -> int:
+        return settings.SCRYPT_WORK_FACTOR
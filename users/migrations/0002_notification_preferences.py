@@ -0,0 +1,31 @@
+# Generated by Django 5.1.1 on 2026-10-19 15:27
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ("users", "0001_initial"),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name="user",
+            name="notification_channel",
+            field=models.CharField(
+                choices=[
+                    ("email", "Email"),
+                    ("telegram", "Telegram"),
+                    ("none", "None"),
+                ],
+                default="email",
+                max_length=20,
+            ),
+        ),
+        migrations.AddField(
+            model_name="user",
+            name="telegram_chat_id",
+            field=models.CharField(blank=True, max_length=50),
+        ),
+    ]
@@ -0,0 +1,34 @@
+# Generated by Django 5.1.1 on 2026-10-19 17:08
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ("users", "0002_notification_preferences"),
+    ]
+
+    operations = [
+        migrations.AlterField(
+            model_name="user",
+            name="notification_channel",
+            field=models.CharField(
+                choices=[
+                    ("email", "Email"),
+                    ("telegram", "Telegram"),
+                    ("none", "None"),
+                ],
+                db_default="email",
+                default="email",
+                max_length=20,
+            ),
+        ),
+        migrations.AlterField(
+            model_name="user",
+            name="telegram_chat_id",
+            field=models.CharField(
+                blank=True, db_default="", default="", max_length=50
+            ),
+        ),
+    ]
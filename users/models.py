@@ -38,8 +38,23 @@ class UserManager(DjangoUserManager):
 class User(AbstractUser):
     """User model."""
 
+    class NotificationChannel(models.TextChoices):
+        EMAIL = "email"
+        TELEGRAM = "telegram"
+        NONE = "none"
+
     username = None
     email = models.EmailField(_("email address"), unique=True)
+    notification_channel = models.CharField(
+        max_length=20,
+        choices=NotificationChannel.choices,
+        default=NotificationChannel.EMAIL,
+        # Covers users written with COPY by the seeder
+        db_default=NotificationChannel.EMAIL,
+    )
+    telegram_chat_id = models.CharField(
+        max_length=50, blank=True, default="", db_default=""
+    )
 
     USERNAME_FIELD = "email"
     REQUIRED_FIELDS = []
@@ -14,6 +14,8 @@ class UserSerializer(serializers.ModelSerializer):
             "email",
             "password",
             "is_staff",
+            "notification_channel",
+            "telegram_chat_id",
         )
         read_only_fields = (
             "id",
@@ -28,6 +30,20 @@ class UserSerializer(serializers.ModelSerializer):
             },
         }
 
+    def validate(self, attrs):
+        channel = attrs.get(
+            "notification_channel",
+            getattr(self.instance, "notification_channel", None),
+        )
+        chat_id = attrs.get(
+            "telegram_chat_id", getattr(self.instance, "telegram_chat_id", "")
+        )
+        if channel == get_user_model().NotificationChannel.TELEGRAM and not chat_id:
+            raise serializers.ValidationError(
+                {"telegram_chat_id": _("Telegram notifications need a chat id.")}
+            )
+        return attrs
+
     def create(self, validated_data):
         """ "create useer with encrypted password"""
         return get_user_model().objects.create_user(**validated_data)
@@ -1,19 +1,59 @@
-from rest_framework import generics
+import threading
+
+from django.conf import settings
+from rest_framework import generics, status
 from rest_framework.authtoken.views import ObtainAuthToken
 from rest_framework.permissions import IsAuthenticated
+from rest_framework.response import Response
 from rest_framework.settings import api_settings
+from rest_framework_simplejwt.views import TokenObtainPairView
 
+from library_service.throttling import ScopedRateLimitThrottle
 from users.serializers import UserSerializer, AuthTokenSerializer
 
+# Password checks are CPU and memory heavy, at most LOGIN_CONCURRENCY of them
+# run at once in a worker process
+password_check_slots = threading.BoundedSemaphore(settings.LOGIN_CONCURRENCY)
+
+
+class BoundedPasswordCheckMixin:
+    """
+    Queues logins for a free password check slot, so a wave of sign-ins
+    can't occupy every thread of the worker. A login that waits longer than
+    LOGIN_QUEUE_TIMEOUT gets 503 and can retry.
+    """
+
+    def post(self, request, *args, **kwargs):
+        if not password_check_slots.acquire(timeout=settings.LOGIN_QUEUE_TIMEOUT):
+            return Response(
+                {"detail": "Too many logins at the moment, try again shortly."},
+                status=status.HTTP_503_SERVICE_UNAVAILABLE,
+                headers={"Retry-After": "1"},
+            )
+        try:
+            return super().post(request, *args, **kwargs)
+        finally:
+            password_check_slots.release()
+
 
 class CreateUserView(generics.CreateAPIView):
     serializer_class = UserSerializer
     permission_classes = ()
 
 
-class LoginUserView(ObtainAuthToken):
+class LoginUserView(BoundedPasswordCheckMixin, ObtainAuthToken):
     renderer_classes = api_settings.DEFAULT_RENDERER_CLASSES
     serializer_class = AuthTokenSerializer
+    throttle_classes = (ScopedRateLimitThrottle,)
+    throttle_scope = "login"
+    # Rotating client IPs doesn't give more guesses at one account
+    throttle_field = "email"
+
+
+class TokenObtainView(BoundedPasswordCheckMixin, TokenObtainPairView):
+    throttle_classes = (ScopedRateLimitThrottle,)
+    throttle_scope = "login"
+    throttle_field = "email"
 
 
 class ManageUserView(generics.RetrieveUpdateAPIView):